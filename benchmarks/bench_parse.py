@@ -0,0 +1,125 @@
+# benchmarks/bench_parse.py
+"""
+Micro-benchmarks of the table extraction strategies of modules/parse.py.
+
+Every strategy parses synthesized districts, blocks and panchayats pages (the layout of
+benchmarks/fixture_server.py) of 10 to 10,000 rows into the level's DataFrame, as the
+scraper does. pytest-benchmark times each case; the peak Python allocations of one parse
+(tracemalloc) and the deep memory of the resulting frame are stored in its extra_info.
+The file is not named test_*.py, so it only runs when asked for:
+
+    pytest benchmarks/bench_parse.py --benchmark-autosave
+    pytest benchmarks/bench_parse.py --benchmark-compare --benchmark-compare-fail=mean:20% \\
+        --benchmark-json=current.json
+
+--benchmark-compare-fail fails the run when a case got slower than the saved run by more
+than the threshold. Allocations and frame memory are checked against the same saved run with
+
+    python -m benchmarks.bench_parse .benchmarks/<machine>/0001_<commit>.json current.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+import pytest
+from config.settings import TABLE_ID
+from modules.parse import extract_table_rows_lxml, extract_table_rows_stdlib, lxml, parse_level_table
+from benchmarks.fixture_server import TreeSpec, render
+
+try:
+    import pytest_benchmark
+except ImportError:  # the memory check below doesn't need it
+    pytest_benchmark = None
+
+pytestmark = pytest.mark.skipif(pytest_benchmark is None, reason="pytest-benchmark is not installed")
+
+PAGE_URL = "http://localhost/"
+SIZES = [10, 100, 1000, 10000]
+STRATEGIES = {"stdlib": extract_table_rows_stdlib, "lxml": extract_table_rows_lxml}
+MEMORY_KEYS = ("peak_alloc_bytes", "frame_bytes")
+
+# The page rendering each level's table, and the TreeSpec field setting its row count
+_PAGES = {
+    "districts": ("/District.aspx", {"s": ["1"]}, "districts"),
+    "blocks": ("/Block.aspx", {"s": ["1"], "d": ["1"]}, "blocks"),
+    "panchayats": ("/Panchayat.aspx", {"s": ["1"], "d": ["1"], "b": ["1"]}, "panchayats"),
+}
+_PARENTS = {"districts": ("State 1",), "blocks": ("State 1", "District 1-1"), "panchayats": ()}
+
+
+def make_page(level, rows):
+    """HTML of a districts, blocks or panchayats page with the given number of table rows."""
+    path, query, field = _PAGES[level]
+    return render(TreeSpec(**{field: rows}), path, query)
+
+
+def parse(html, level, extractor):
+    return parse_level_table(html, level, TABLE_ID, PAGE_URL, parents=_PARENTS[level], extractor=extractor)
+
+
+def measure_memory(html, level, extractor):
+    """Peak bytes allocated while parsing a page once, and the deep memory of the resulting frame."""
+    tracemalloc.start()
+    try:
+        df = parse(html, level, extractor)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_alloc_bytes": peak, "frame_bytes": int(df.memory_usage(deep=True).sum())}
+
+
+@pytest.mark.parametrize("rows", SIZES)
+@pytest.mark.parametrize("level", list(_PAGES))
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_parse(benchmark, strategy, level, rows):
+    if strategy == "lxml" and lxml is None:
+        pytest.skip("lxml is not installed")
+    extractor = STRATEGIES[strategy]
+    html = make_page(level, rows)
+    benchmark.group = f"{level}-{rows}"
+    benchmark.extra_info.update(measure_memory(html, level, extractor))
+    df = benchmark(parse, html, level, extractor)
+    assert len(df) == rows
+
+
+def _cases(path):
+    return {bench["name"]: bench.get("extra_info", {}) for bench in json.loads(Path(path).read_text())["benchmarks"]}
+
+
+def compare_memory(baseline, current, threshold=0.2):
+    """
+    Memory regressions between two pytest-benchmark JSON files.
+
+    Args:
+        baseline (Path): Saved run to compare with.
+        current (Path): New run.
+        threshold (float): Allowed relative growth, 0.2 for 20%.
+
+    Returns:
+        list[str]: One line per case and measure that grew by more than the threshold.
+    """
+    before, after = _cases(baseline), _cases(current)
+    regressions = []
+    for name in sorted(before.keys() & after.keys()):
+        for key in MEMORY_KEYS:
+            old, new = before[name].get(key), after[name].get(key)
+            if old and new is not None and (new - old) / old > threshold:
+                regressions.append(f"{name} {key}: {old} -> {new} ({(new - old) / old:+.1%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check parser benchmark allocations against a saved run.")
+    parser.add_argument("baseline", help="pytest-benchmark JSON of the saved run.")
+    parser.add_argument("current", help="pytest-benchmark JSON of the new run (--benchmark-json).")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative growth (default 0.2).")
+    args = parser.parse_args(argv)
+    regressions = compare_memory(args.baseline, args.current, args.threshold)
+    print("\n".join(regressions) or "No memory regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# benchmarks/fixture_server.py
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from config.settings import TABLE_ID
+
+PANCHAYAT_HEADERS = [
+    "S.No.", "State", "District", "Block", "Panchayat", "Village", "Well Type", "Owner", "Latitude", "Longitude",
+    "Depth of Well(In Feet)", "Diameter of Well(In Feet)", "Pre Monsoon Water Level(In Feet)",
+    "Date of Measurement", "Image",
+]
+
+
+@dataclass
+class TreeSpec:
+    """Shape and behaviour of the synthesized site."""
+
+    states: int = 3
+    districts: int = 4          # per state
+    blocks: int = 5             # per district
+    panchayats: int = 20        # rows per panchayats page (block)
+    latency: float = 0.0        # seconds added to every response
+    jitter: float = 0.0         # up to this many extra seconds, uniformly random
+    error_rate: float = 0.0     # fraction of responses answered with HTTP 500
+    seed: int = 0
+
+    @property
+    def pages(self):
+        """Pages of a full crawl: the states page and every districts, blocks and panchayats page."""
+        districts = self.states * self.districts
+        return 1 + self.states + districts + districts * self.blocks
+
+    @property
+    def wells(self):
+        return self.states * self.districts * self.blocks * self.panchayats
+
+
+def _table(header_tag, headers, rows):
+    header = "".join(f"<{header_tag}>{escape(h)}</{header_tag}>" for h in headers)
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    # Hidden ASP.NET form state and some page chrome, so pages weigh about what the real ones do
+    return (
+        '<html><head><title>Jaldoot</title><link rel="stylesheet" href="/style.css"></head><body>'
+        '<form method="post"><input type="hidden" name="__VIEWSTATE" value="' + "x" * 2000 + '">'
+        '<input type="hidden" name="__EVENTVALIDATION" value="' + "y" * 200 + '">'
+        f'<table id="{TABLE_ID}" class="grid"><tr class="header">{header}</tr>{body}</table>'
+        "</form></body></html>"
+    )
+
+
+def _counts(spec, *levels):
+    wells = spec.panchayats
+    for per_level in levels:
+        wells *= per_level
+    return [wells, wells]
+
+
+def render(spec, path, query):
+    """
+    Render one page of the synthesized site.
+
+    Returns:
+        str | None: The page HTML, or None for an unknown path.
+    """
+    q = {key: values[0] for key, values in query.items()}
+    count_headers = ["No. of Well Covered", "No. of Panchayat Covered"]
+    if path == "/Home.aspx":
+        rows = [
+            [i, f'<a href="District.aspx?s={i}">State {i}</a>', *_counts(spec, spec.districts, spec.blocks)]
+            for i in range(1, spec.states + 1)
+        ]
+        return _table("td", ["S.No.", "States/UT's", *count_headers], rows)
+    if path == "/District.aspx":
+        s = q["s"]
+        rows = [
+            [i, f'<a href="Block.aspx?s={s}&amp;d={i}">District {s}-{i}</a>', *_counts(spec, spec.blocks)]
+            for i in range(1, spec.districts + 1)
+        ]
+        return _table("td", ["S.No.", "District", *count_headers], rows)
+    if path == "/Block.aspx":
+        s, d = q["s"], q["d"]
+        rows = [
+            [i, f'<a href="Panchayat.aspx?s={s}&amp;d={d}&amp;b={i}">Block {s}-{d}-{i}</a>', *_counts(spec)]
+            for i in range(1, spec.blocks + 1)
+        ]
+        return _table("td", ["S.No.", "Block", *count_headers], rows)
+    if path == "/Panchayat.aspx":
+        s, d, b = q["s"], q["d"], q["b"]
+        rng = random.Random(f"{spec.seed}-{s}-{d}-{b}")
+        rows = [
+            [
+                i, f"State {s}", f"District {s}-{d}", f"Block {s}-{d}-{b}", f"Panchayat {i}", f"Village {i}",
+                rng.choice(["Dug Well", "Bore Well"]), rng.choice(["Government", "Private"]),
+                f"{rng.uniform(8, 35):.6f}", f"{rng.uniform(68, 97):.6f}", f"{rng.uniform(10, 300):.1f}",
+                f"{rng.uniform(0.5, 6):.1f}", f"{rng.uniform(1, 120):.2f}",
+                f"{rng.randint(1, 28):02d}-05-2024", '<a href="#">View</a>',
+            ]
+            for i in range(1, spec.panchayats + 1)
+        ]
+        return _table("th", PANCHAYAT_HEADERS, rows)
+    return None
+
+
+class FixtureServer:
+    """
+    A local stand-in for the NIC site, serving synthesized states, districts, blocks and
+    panchayats pages in the same table layout, with configurable latency and errors.
+
+    Runs a threaded HTTP server on a free localhost port in a daemon thread; use it as a
+    context manager. Served and failed responses are counted.
+    """
+
+    def __init__(self, spec=None, host="127.0.0.1", port=0):
+        self.spec = spec or TreeSpec()
+        self.served = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.spec.seed)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/Home.aspx"
+
+    def _handle(self, request):
+        spec = self.spec
+        with self._lock:
+            delay = spec.latency + (self._rng.uniform(0, spec.jitter) if spec.jitter else 0)
+            fail = spec.error_rate and self._rng.random() < spec.error_rate
+        if delay:
+            time.sleep(delay)
+        url = urlsplit(request.path)
+        html = None if fail else render(spec, url.path, parse_qs(url.query))
+        if html is None:
+            status, body = (500, b"Server Error") if fail else (404, b"Not Found")
+        else:
+            status, body = 200, html.encode()
+        with self._lock:
+            if status == 200:
+                self.served += 1
+            else:
+                self.errors += 1
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
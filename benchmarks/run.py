@@ -0,0 +1,149 @@
+# benchmarks/run.py
+"""
+End-to-end crawl benchmark against the local fixture server.
+
+Runs the full main.py pipeline in a child process, pointed at a FixtureServer and a
+throwaway database (a temporary SQLite file unless --database-url is given), then
+reports pages/sec, rows/sec and the child's peak RSS. Results can be saved and compared
+with a baseline:
+
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+from benchmarks.fixture_server import FixtureServer, TreeSpec
+
+ROOT = Path(__file__).resolve().parent.parent
+TABLES = ["states", "districts", "blocks", "panchayats"]
+
+
+def crawl_env(base_url, database_url, workdir, overrides=None):
+    """Environment of the crawler process: everything it writes goes to workdir."""
+    env = dict(os.environ)
+    env.update({
+        "BASE_URL": base_url,
+        "DATABASE_URL": database_url,
+        "FETCH_BACKEND": "http",
+        "CACHE_ENABLED": "False",
+        "FETCH_RATE": "0",
+        "FETCH_BACKOFF_BASE": "0.1",
+        "FETCH_BACKOFF_MAX": "1",
+        "METRICS_PORT": "0",
+        "STATUS_FILE": str(workdir / "status.json"),
+        "LOG_FILE": str(workdir / "jaldoot.log"),
+        "SCHEMA_SNAPSHOT": str(workdir / "schema_snapshot.json"),
+        "CACHE_DIR": str(workdir / "cache"),
+    })
+    env.update(overrides or {})
+    return env
+
+
+def count_rows(database_url):
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            existing = set(inspect(conn).get_table_names())
+            return {
+                table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar() if table in existing else 0
+                for table in TABLES
+            }
+    finally:
+        engine.dispose()
+
+
+def run(spec, database_url=None, overrides=None, timeout=3600):
+    """
+    Crawl the fixture site once with main.py.
+
+    Args:
+        spec (TreeSpec): Size, latency and error rate of the site.
+        database_url (str, optional): Throwaway database; a temporary SQLite file by default.
+        overrides (dict, optional): Extra settings for the crawler, e.g. {"SCRAPER_WORKERS": "8"}.
+        timeout (float): Seconds before the crawl is aborted.
+
+    Returns:
+        dict: The benchmark result.
+    """
+    with tempfile.TemporaryDirectory(prefix="jaldoot-bench-") as tmp, FixtureServer(spec) as server:
+        workdir = Path(tmp)
+        database_url = database_url or f"sqlite:///{workdir / 'bench.db'}"
+        env = crawl_env(server.base_url, database_url, workdir, overrides)
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, str(ROOT / "main.py")], cwd=ROOT, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout,
+        )
+        elapsed = time.perf_counter() - start
+        # ru_maxrss is in kilobytes on Linux (bytes on macOS), over every child waited for so far
+        peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        peak_rss_mb = peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        rows = count_rows(database_url)
+        if process.returncode != 0:
+            print(process.stderr.decode(errors="replace")[-2000:], file=sys.stderr)
+        return {
+            "spec": vars(spec),
+            "settings": overrides or {},
+            "returncode": process.returncode,
+            "seconds": round(elapsed, 3),
+            "pages": server.served,
+            "errors_injected": server.errors,
+            "expected_pages": spec.pages,
+            "rows": rows,
+            "expected_wells": spec.wells,
+            "pages_per_second": round(server.served / elapsed, 2),
+            "rows_per_second": round(sum(rows.values()) / elapsed, 2),
+            "peak_rss_mb": round(peak_rss_mb, 1),
+        }
+
+
+def compare(result, baseline):
+    """Lines comparing the throughput of a result with a baseline result."""
+    lines = []
+    for key in ("pages_per_second", "rows_per_second", "peak_rss_mb", "seconds"):
+        before, after = baseline.get(key), result.get(key)
+        if before:
+            lines.append(f"{key:>18}: {before:>10} -> {after:>10} ({(after - before) / before:+.1%})")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a full crawl against a local fixture site.")
+    parser.add_argument("--states", type=int, default=TreeSpec.states)
+    parser.add_argument("--districts", type=int, default=TreeSpec.districts, help="Districts per state.")
+    parser.add_argument("--blocks", type=int, default=TreeSpec.blocks, help="Blocks per district.")
+    parser.add_argument("--panchayats", type=int, default=TreeSpec.panchayats, help="Rows per panchayats page.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many random extra seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses failing with HTTP 500.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", help="Throwaway database to crawl into (default: temporary SQLite).")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Crawler setting, e.g. --set SCRAPER_WORKERS=8 --set CRAWL_MODE=async.")
+    parser.add_argument("--output", help="Write the result as JSON to this file.")
+    parser.add_argument("--baseline", help="Compare with a result saved by --output.")
+    args = parser.parse_args(argv)
+
+    spec = TreeSpec(args.states, args.districts, args.blocks, args.panchayats,
+                    args.latency, args.jitter, args.error_rate, args.seed)
+    overrides = dict(setting.split("=", 1) for setting in args.set)
+    result = run(spec, args.database_url, overrides)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    if args.baseline:
+        print("\n".join(compare(result, json.loads(Path(args.baseline).read_text()))))
+    return 0 if result["returncode"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
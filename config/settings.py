@@ -2,19 +2,35 @@
 
 from pathlib import Path
 import os
+import atexit
+import gzip
+import queue
+import shutil
 import logging
+import logging.handlers
 from dotenv import load_dotenv
 
+# Load environment variables from .env file
+BASE_DIR = Path(__file__).resolve().parent.parent  # Root directory
+ENV_FILE = BASE_DIR / '.env'
+load_dotenv(dotenv_path=ENV_FILE)
+
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", 5432)
 DB_NAME = os.getenv("DB_NAME", "postgres")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
+# Full SQLAlchemy URL overriding the DB_* settings, e.g. sqlite:///bench.db for the offline benchmark
+DATABASE_URL = os.getenv("DATABASE_URL", "")
 
-# Load environment variables from .env file
-BASE_DIR = Path(__file__).resolve().parent.parent  # Root directory
-ENV_FILE = BASE_DIR / '.env'
-load_dotenv(dotenv_path=ENV_FILE)
+# Shared connection pool (modules/db.py): persistent connections, extra connections allowed
+# under load, seconds to wait for a free connection, connection max age, and statement timeout
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 300000))  # 0 disables
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "jaldoot-scraper")
 
 # Load configurations from environment variables with defaults
 CHROME_DRIVER_PATH = Path(os.getenv("CHROME_DRIVER_PATH", "chromedriver.exe"))
@@ -25,32 +41,126 @@ EXCEL_FILE = BASE_DIR / os.getenv("EXCEL_FILE_PATH", "data/jaldoot.xlsx")
 LOG_FILE = BASE_DIR / os.getenv("LOG_FILE", "logs/jaldoot.log")
 BASE_URL = os.getenv("BASE_URL", "http://defaulturl.com")
 
+# Fetch backend: "http" (pooled keep-alive requests session) or "selenium" (headless Chrome)
+FETCH_BACKEND = os.getenv("FETCH_BACKEND", "http").lower()
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))
+# Selenium browser profile: "lean" blocks images, fonts, CSS and analytics through the
+# DevTools protocol and uses an eager page load; "full" loads every asset
+BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "lean").lower()
+BROWSER_BLOCKED_URLS = os.getenv(
+    "BROWSER_BLOCKED_URLS",
+    "*.png,*.jpg,*.jpeg,*.gif,*.bmp,*.svg,*.ico,*.webp,*.woff,*.woff2,*.ttf,*.otf,*.eot,*.css,"
+    "*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*"
+).split(',')
+# Browser supervision: restart Chrome after this many pages, above this memory (MB) or after
+# this many consecutive failures. DRIVER_SPARE keeps a pre-warmed spare browser per worker for
+# restarts, which doubles the Chrome processes (and memory), so it is off by default
+DRIVER_MAX_PAGES = int(os.getenv("DRIVER_MAX_PAGES", 2000))
+DRIVER_MAX_RSS_MB = float(os.getenv("DRIVER_MAX_RSS_MB", 1024))
+DRIVER_MAX_FAILURES = int(os.getenv("DRIVER_MAX_FAILURES", 3))
+DRIVER_SPARE = os.getenv("DRIVER_SPARE", "False") == "True"
+# Number of concurrent workers (browser instances / HTTP sessions) for the panchayat level
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", 4))
+# Crawl mode: "sync" (Scraper + DriverPool) or "async" (asyncio engine over aiohttp)
+CRAWL_MODE = os.getenv("CRAWL_MODE", "sync").lower()
+# Maximum number of requests in flight per host in async mode
+ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", 100))
+
+# Fetch policy shared by every worker: rate limit (requests/s, 0 disables) and burst,
+# jittered exponential backoff between retries, timeouts of FACTOR x p95 latency per level,
+# a circuit breaker pausing the crawl when the error rate spikes, and AIMD concurrency bounds.
+# FETCH_RATE caps both crawl modes: at 10 requests/s the async engine keeps about 10 x latency
+# requests in flight, far below ASYNC_CONCURRENCY, so raise it (or set 0) to crawl faster in async mode
+FETCH_RATE = float(os.getenv("FETCH_RATE", 10))
+FETCH_BURST = float(os.getenv("FETCH_BURST", 20))
+FETCH_BACKOFF_BASE = float(os.getenv("FETCH_BACKOFF_BASE", 2))
+FETCH_BACKOFF_MAX = float(os.getenv("FETCH_BACKOFF_MAX", 60))
+FETCH_TIMEOUT_FACTOR = float(os.getenv("FETCH_TIMEOUT_FACTOR", 3))
+FETCH_TIMEOUT_MIN = float(os.getenv("FETCH_TIMEOUT_MIN", 5))
+FETCH_TIMEOUT_MAX = float(os.getenv("FETCH_TIMEOUT_MAX", 60))
+FETCH_BREAKER_WINDOW = int(os.getenv("FETCH_BREAKER_WINDOW", 50))
+FETCH_BREAKER_THRESHOLD = float(os.getenv("FETCH_BREAKER_THRESHOLD", 0.5))
+FETCH_BREAKER_COOLDOWN = int(os.getenv("FETCH_BREAKER_COOLDOWN", 120))
+FETCH_CONCURRENCY_MIN = int(os.getenv("FETCH_CONCURRENCY_MIN", 1))
+FETCH_CONCURRENCY_MAX = int(os.getenv("FETCH_CONCURRENCY_MAX", ASYNC_CONCURRENCY))
+# The adaptive limit starts here and grows while the site is healthy
+FETCH_CONCURRENCY_INITIAL = int(os.getenv("FETCH_CONCURRENCY_INITIAL", max(FETCH_CONCURRENCY_MIN, SCRAPER_WORKERS)))
+
+# On-disk page cache: compressed pages keyed by season (BASE_URL) and URL
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "True") == "True"
+CACHE_DIR = BASE_DIR / os.getenv("CACHE_DIR", "cache/pages")
+CACHE_TTL = int(os.getenv("CACHE_TTL", 7 * 24 * 3600))  # seconds, 0 disables expiry
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_MB", 2048)) * 1024 * 1024  # 0 disables eviction
+
+# Crawl frontier (crawl_tasks table): pages claimed per batch, lease length and retry budget
+FRONTIER_BATCH_SIZE = int(os.getenv("FRONTIER_BATCH_SIZE", 500))
+FRONTIER_LEASE_SECONDS = int(os.getenv("FRONTIER_LEASE_SECONDS", 1800))
+FRONTIER_MAX_ATTEMPTS = int(os.getenv("FRONTIER_MAX_ATTEMPTS", 5))
+
+# Buffered writer: scraped rows are written with COPY once this many rows or seconds accumulate
+WRITER_FLUSH_ROWS = int(os.getenv("WRITER_FLUSH_ROWS", 5000))
+WRITER_FLUSH_SECONDS = float(os.getenv("WRITER_FLUSH_SECONDS", 30))
+USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+# Page fingerprints: pages of these levels whose data table is unchanged since it was last saved
+# (same digest of the table markup, per season and URL) are not parsed or written again
+FINGERPRINT_LEVELS = [level for level in os.getenv("FINGERPRINT_LEVELS", "districts,blocks,panchayats").split(',') if level]
+
+# Season label of the data crawled from BASE_URL: the states table (and every row below it) is
+# keyed by season, and exports and the dashboard counts are partitioned by it
+SEASON = os.getenv("SEASON", "current")
+# Multi-season mode: comma-separated label=url season roots crawled concurrently into the same
+# database, sharing the fetch policy, e.g. "2023-pre=https://.../Home.aspx,2024-pre=https://..."
+# (empty: crawl SEASON from BASE_URL). Pages of SEASON_SHARED_LEVELS listed under the same URL by
+# several seasons are fetched once per run
+SEASONS = os.getenv("SEASONS", "")
+SEASON_SHARED_LEVELS = [level for level in os.getenv("SEASON_SHARED_LEVELS", "districts,blocks").split(',') if level]
+# Parquet export (python -m modules.export): output directory, codec and rows streamed per chunk
+EXPORT_DIR = BASE_DIR / os.getenv("EXPORT_DIR", "export")
+EXPORT_COMPRESSION = os.getenv("EXPORT_COMPRESSION", "zstd")
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 100000))
+
+# Seconds between progress snapshots written to status.json while crawling
+STATUS_INTERVAL = float(os.getenv("STATUS_INTERVAL", 5))
+
+# Metrics endpoint (modules/metrics.py): Prometheus text format on http://<host>:<port>/metrics, 0 disables
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9108))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Dashboard: seconds the per-state counts are served from cache before checking the database for changes
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", 30))
+
+# Column definitions of the scraped tables, so models load without reflecting the database
+SCHEMA_SNAPSHOT = BASE_DIR / os.getenv("SCHEMA_SNAPSHOT", "config/schema_snapshot.json")
+
 # Define sheet names
 SHEET_NAMES = os.getenv("SHEET_NAMES", "states,districts,blocks,panchayats").split(',')
 
-# Ensure the logs directory exists
+# Log rotation: the log file is rolled over above LOG_MAX_MB (or every LOG_ROTATE_WHEN, e.g. "midnight",
+# when set) and the LOG_BACKUP_COUNT most recent archives are kept gzip-compressed as jaldoot.log.<n>.gz.
+# Only the crawler (main.py) writes the file, see setup_file_logging; other processes, like the
+# dashboard, log to the console and only read it
 LOG_DIR = LOG_FILE.parent
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# Configure centralized logging
-logging.basicConfig(
-    filename=LOG_FILE,
-    filemode='a',
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+LOG_MAX_MB = float(os.getenv("LOG_MAX_MB", 50))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 10))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")
+
+
+def _gzip_namer(name):
+    return name + ".gz"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
 
-# Create a custom logger
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)  # Set the desired logging level
 
 # Create handlers
 console_handler = logging.StreamHandler()
-file_handler = logging.FileHandler(LOG_FILE, mode='a')  # 'a' for append mode
 
 # Set levels for handlers (optional, inherits from logger if not set)
 console_handler.setLevel(logging.INFO)
-file_handler.setLevel(logging.INFO)
 
 # Create a formatter and set it for both handlers
 formatter = logging.Formatter(
@@ -58,12 +168,56 @@ formatter = logging.Formatter(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 console_handler.setFormatter(formatter)
-file_handler.setFormatter(formatter)
+
+# Create a custom logger; it doesn't propagate, so its records are written to the file once
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)  # Set the desired logging level
+logger.propagate = False
 
 # Add handlers to the logger
-if not logger.hasHandlers():
+if not logger.handlers:
     logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+
+_log_listener = None
+
+
+def setup_file_logging():
+    """
+    Write the log file from this process, the single writer of LOG_FILE.
+
+    Called once by the crawler's entry point. Records of the custom logger and of library
+    loggers are put on a queue, and a listener thread writes them to the rotating file
+    handler, so rotation and gzip compression never run inside a logging call.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    if LOG_ROTATE_WHEN:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, mode='a', maxBytes=int(LOG_MAX_MB * 1024 * 1024), backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Records are queued with their message merged; the file handler's formatter adds the rest
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    # Configure centralized logging: library loggers write to the same (single) file handler
+    logging.basicConfig(handlers=[queue_handler], level=logging.INFO)
+    logger.addHandler(queue_handler)
+
 
 # Enable console logging only if .env DEBUG is set to True
 DEBUG = os.getenv("DEBUG", "False") == "True"
@@ -4,12 +4,17 @@ import streamlit as st
 import json
 from pathlib import Path
 import time
-from config.settings import STATUS_FILE, EXCEL_FILE, LOG_FILE  # Import LOG_FILE
-from modules.utils import count_records, get_expected_counts
+from config.settings import STATUS_FILE, EXCEL_FILE, LOG_FILE, SEASON  # Import LOG_FILE
+from modules.counts import state_counts
+from modules.logs import LogIndex, log_files, tail
+from functools import partial
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# A running crawl writes a snapshot every STATUS_INTERVAL seconds; this long without one is a stall
+STALL_SECONDS = 600
+
 def load_status():
     """Load the scraper status from status.json."""
     if STATUS_FILE.exists():
@@ -37,24 +42,67 @@ def display_status(status_data):
     else:
         st.warning("⚪ Scraper status is **Unknown**.")
 
-    # Display the last updated time
-    st.write(f"**Last Updated:** {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())}")
+    # Display the time of the snapshot, and warn when a running crawl stopped updating it
+    updated_at = status_data.get("updated_at")
+    if updated_at is None:
+        st.write(f"**Last Updated:** {status_data.get('timestamp', 'unknown')} (UTC)")
+        return
+    age = time.time() - updated_at
+    st.write(f"**Last Updated:** {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(updated_at))} ({age:.0f}s ago)")
+    if status == "Running" and age > STALL_SECONDS:
+        st.warning(f"No progress reported for {age / 60:.0f} minutes: the crawl may be stalled.")
+
+    display_progress(status_data)
+
+def format_duration(seconds):
+    """Format seconds as e.g. '2h 05m'."""
+    if seconds is None:
+        return "unknown"
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m"
+
+def display_progress(status_data):
+    """Display the throughput, ETA and per-level progress of a progress snapshot."""
+    col_pages, col_rows, col_retries, col_eta = st.columns(4)
+    col_pages.metric("Pages / min", status_data.get("pages_per_minute", 0))
+    col_rows.metric("Rows / min", status_data.get("rows_per_minute", 0))
+    col_retries.metric("Retries", status_data.get("retries", 0), help=f"{status_data.get('failures', 0)} failures")
+    col_eta.metric("ETA", format_duration(status_data.get("eta_seconds")), help="For the pages discovered so far")
+
+    current = status_data.get("current") or {}
+    if current:
+        st.write(f"**Current:** {current.get('level')} of {' / '.join(current.get('parents', []))}")
+
+    for level, counts in status_data.get("levels", {}).items():
+        total = counts.get("total", 0)
+        settled = counts.get("done", 0) + counts.get("failed", 0)
+        label = f"{level}: {counts.get('done', 0)} done, {counts.get('failed', 0)} failed of {total}"
+        st.progress(settled / total if total else 0.0, text=label)
+
+def load_counts():
+    """Load expected and actual counts for each state and season from the cached postgres aggregates."""
+    try:
+        merged_counts = state_counts.get()
+    except Exception as e:
+        st.error(f"Unable to load counts data: {e}")
+        return pd.DataFrame()
 
-def load_counts(excel_file: Path):
-    """Load expected and actual counts for each state."""
-    expected_counts = get_expected_counts()
-    actual_counts = count_records()
-    
-    if expected_counts.empty or actual_counts.empty:
+    if merged_counts.empty:
         st.error("Unable to load counts data.")
         return pd.DataFrame()
-    
-    # Merge on "States/UT's"
-    merged_counts = pd.merge(expected_counts, actual_counts, on="States/UT's", how="left")
-    merged_counts['Actual_Records'] = merged_counts['Actual_Records'].fillna(0).astype(int)
-    
+
+    if state_counts.computed_at is not None:
+        st.caption(f"Counts as of {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(state_counts.computed_at))}")
+
     return merged_counts
 
+def select_season(merged_counts: pd.DataFrame):
+    """Let the user pick a season, SEASON by default, and return that season's counts."""
+    seasons = sorted(merged_counts["season"].unique())
+    default = seasons.index(SEASON) if SEASON in seasons else len(seasons) - 1
+    season = st.selectbox("Season", seasons, index=default)
+    return merged_counts[merged_counts["season"] == season].drop(columns="season").reset_index(drop=True)
+
 def plot_counts(merged_counts: pd.DataFrame):
     """Plot expected vs actual records per state."""
     try:
@@ -100,6 +148,30 @@ def plot_counts(merged_counts: pd.DataFrame):
     except Exception as e:
         st.error(f"Error plotting counts: {e}")
 
+@st.cache_resource
+def get_log_index():
+    """One byte-offset index of the log file, shared by every viewer."""
+    return LogIndex(LOG_FILE)
+
+def display_log_tail():
+    """Show the last lines of the log, filtered by level and text, without reading the whole file."""
+    col_lines, col_level, col_text = st.columns([1, 1, 2])
+    lines = col_lines.number_input("Lines", min_value=10, max_value=5000, value=200, step=50)
+    level = col_level.selectbox("Minimum level", ["All", "INFO", "WARNING", "ERROR"])
+    contains = col_text.text_input("State or text contains")
+
+    if not LOG_FILE.exists():
+        st.warning("Log file not found.")
+        return
+    log_lines = tail(
+        LOG_FILE, lines=int(lines), min_level=None if level == "All" else level,
+        contains=contains or None, index=get_log_index()
+    )
+    if log_lines:
+        st.code("\n".join(log_lines), language=None)
+    else:
+        st.info("No matching log lines.")
+
 def main():
     st.title("🛠️ Scraper Status Dashboard")
 
@@ -118,9 +190,11 @@ def main():
     st.header("📊 Records Status Chart")
     
     # Load counts data
-    counts_df = load_counts(EXCEL_FILE)
+    counts_df = load_counts()
     
     if not counts_df.empty:
+        counts_df = select_season(counts_df)
+
         # Display the DataFrame (optional)
         st.dataframe(counts_df)
         
@@ -131,16 +205,21 @@ def main():
     
     st.markdown("---")  # Separator for the log file download section
 
+    st.header("📜 Logs")
+
+    display_log_tail()
+
     st.header("📥 Download Logs")
 
-    if LOG_FILE.exists():
-        with open(LOG_FILE, "rb") as log_file:
-            log_data = log_file.read()
+    log_paths = log_files(LOG_FILE)
+    if log_paths:
+        selected = st.selectbox("Log file", log_paths, format_func=lambda path: path.name)
+        # The file is only read when the button is clicked; rotation keeps each file under LOG_MAX_MB
         st.download_button(
-            label="Download Latest Log File",
-            data=log_data,
-            file_name="jaldoot.log",
-            mime="text/plain"
+            label="Download Log File",
+            data=partial(Path.read_bytes, selected),
+            file_name=selected.name,
+            mime="application/gzip" if selected.suffix == ".gz" else "text/plain"
         )
     else:
         st.warning("Log file not found.")
@@ -1,20 +1,30 @@
 # main.py
 
-from pathlib import Path
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models import Base, State, District , Block, Panchayat
+import argparse
+from functools import partial
+from sqlalchemy import inspect, text
 from modules.scrape import Scraper
+from modules.fetch import create_fetcher
+from modules.pool import DriverPool, run_pooled
+from modules import async_crawl
+from modules import db
+from modules.cache import PageCache, CachedFetcher
+from modules import frontier
+from modules import progress
+from modules import metrics
+from modules.status import StatusReporter
+from modules.writer import BufferedWriter
+from modules.fingerprint import PageFingerprints, UNCHANGED
+from modules.seasons import SharedPages, configured_seasons, parse_seasons, run_seasons
 from config.settings import (
-    EXCEL_FILE, SHEET_NAMES, BASE_URL, logger,
-    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+    EXCEL_FILE, SHEET_NAMES, BASE_URL, SCRAPER_WORKERS, CRAWL_MODE, CACHE_ENABLED, FINGERPRINT_LEVELS, logger,
+    setup_file_logging, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
 )
 
 from modules.utils import (
     update_status, 
     begin_scraping_log, 
     end_scraping_log, 
-    initialize_driver, 
     sheet_empty, 
     create_excel_file, 
     verify_excel_file,
@@ -37,31 +47,223 @@ from sqlalchemy.engine import Engine
 def receive_handle_error(exception_context):
     logger.error(f"PostgreSQL error: {exception_context.original_exception}")
 
-def main():
-    update_status("Running")
-    # Initialize WebDriver
-    driver = initialize_driver()
-    scraper = Scraper(driver, BASE_URL)
+# Scraper method used for each child level; tasks are parent names followed by the page URL
+LEVEL_METHODS = {
+    "districts": "get_districts",
+    "blocks": "get_blocks",
+    "panchayats": "get_panchayats",
+}
 
-    session = get_db_session()
-    engine  = session.get_bind()
+def describe(task):
+    """Readable 'block , district , state' label for a task tuple."""
+    return " , ".join(reversed(task[:-1]))
+
+def fetcher_factory(cache, replay=False):
+    """
+    Build the factory the DriverPool uses to create its fetchers.
+
+    Args:
+        cache (PageCache | None): Page cache wrapped around every fetcher, if enabled.
+        replay (bool): Serve pages only from the cache, without any network backend.
+
+    Returns:
+        callable: Zero-argument callable returning a new Fetcher.
+    """
+    if replay:
+        return lambda: CachedFetcher(None, cache, offline=True)
+    if cache is not None:
+        return lambda: CachedFetcher(create_fetcher(), cache)
+    return create_fetcher
+
+def scrape_states(pool, cache=None, base_url=BASE_URL):
+    """
+    Scrape the states table with the configured crawl mode.
+
+    Args:
+        pool (DriverPool | None): Pool of fetchers, None in async mode.
+        cache (PageCache | None): Page cache used by the async engine.
+        base_url (str): Root URL (states page) of the season.
+
+    Returns:
+        pd.DataFrame: The states table.
+    """
+    if pool is None:
+        return async_crawl.get_states(base_url, cache=cache)
+    with pool.acquire() as fetcher:
+        return Scraper(fetcher, base_url).get_states()
 
+def scrape_level(level, fetcher, task, base_url=BASE_URL, shared=None, fingerprints=None):
+    """
+    Scrape one child page: the districts of a state, blocks of a district or panchayats of a block.
+
+    Args:
+        level (str): "districts", "blocks" or "panchayats".
+        fetcher (Fetcher): Fetch backend to load the page with.
+        task (tuple): Parent names followed by the page URL.
+        base_url (str): Root URL of the season.
+        shared (SharedPages, optional): Hierarchy pages shared with the other seasons.
+        fingerprints (PageFingerprints, optional): Digests of the pages saved by earlier runs.
+
+    Returns:
+        pd.DataFrame | Exception: The scraped table, the error if scraping failed, or UNCHANGED
+            if the table is the same as when it was last saved.
+    """
+    logger.info(f"Scraping {level} for {describe(task)}")
     try:
-        start_time = begin_scraping_log()
+        scraper = Scraper(fetcher, base_url, shared=shared, fingerprints=fingerprints)
+        return getattr(scraper, LEVEL_METHODS[level])(*task)
+    except RetryError as re:
+        logger.error(f"Retry attempts failed for {LEVEL_METHODS[level]} for {describe(task)}: {re}")
+        return re
+    except Exception as e:
+        logger.error(f"Unexpected error during {LEVEL_METHODS[level]} for {describe(task)}: {e}")
+        return e
+
+def save_level(writer, level, task, table, reporter=None):
+    """
+    Prepare one scraped child table and hand it to the buffered writer.
+
+    Args:
+        writer (BufferedWriter): Writer that saves the rows and settles the frontier task.
+        level (str): "districts", "blocks" or "panchayats", also the table name.
+        task (tuple): Parent names followed by the page URL.
+        table (pd.DataFrame | Exception): Result of scrape_level.
+        reporter (StatusReporter, optional): Progress reporter told about every saved page.
+    """
+    if reporter is not None:
+        reporter.page(level, task)
+    if isinstance(table, Exception) or table is UNCHANGED:
+        writer.add(level, task, table)
+        return
+    if table.empty:
+        logger.warning(f"No {level} scraped for {describe(task)}. Skipping saving.")
+        writer.add(level, task, table)
+        return
+    logger.info(f"Scraped {len(table)} {level} for {describe(task)}.")
+    # Column types are converted by the writer (modules/coerce.py)
+    writer.add(level, task, table)
+
+def claimed_batches(engine, level, writer, season):
+    """
+    Claim a season level's outstanding tasks from the crawl frontier, batch by batch.
+
+    The writer is flushed once a batch has been crawled, before the next one is claimed.
 
+    Yields:
+        list: Task tuples of parent names followed by the page URL.
+    """
+    while True:
+        tasks = frontier.claim(engine, level, season=season)
+        if not tasks:
+            return
+        logger.info(f"Claimed {len(tasks)} {level} pages of season {season} from the crawl frontier.")
+        yield tasks
+        writer.flush()
+
+def crawl_level(level, batches, pool, writer, cache=None, reporter=None, base_url=BASE_URL, shared=None,
+                fingerprints=None):
+    """
+    Scrape and save every task of a child level.
+
+    In async mode the tasks are crawled by the asyncio engine, with one event loop and
+    HTTP session for all batches; otherwise panchayat pages are spread over the whole
+    DriverPool and the (far fewer) district and block pages are scraped one at a time.
+    Saving always happens on a single thread.
+
+    Args:
+        level (str): "districts", "blocks" or "panchayats".
+        batches (iterable): Lists of task tuples of parent names followed by the page URL,
+            see claimed_batches().
+        pool (DriverPool | None): Pool of fetchers, None in async mode.
+        writer (BufferedWriter): Writer the scraped tables are buffered in.
+        cache (PageCache | None): Page cache used by the async engine.
+        reporter (StatusReporter, optional): Progress reporter told about every saved page.
+        base_url (str): Root URL of the season.
+        shared (SharedPages, optional): Hierarchy pages shared with the other seasons.
+        fingerprints (PageFingerprints, optional): Digests of the pages saved by earlier runs;
+            pages whose table is unchanged are not parsed or written again.
+    """
+    save = partial(save_level, writer, level, reporter=reporter)
+    work = partial(scrape_level, level, base_url=base_url, shared=shared, fingerprints=fingerprints)
+    if pool is None:
+        async_crawl.run_level(base_url, level, batches, save, cache=cache, shared=shared, fingerprints=fingerprints)
+        return
+    for tasks in batches:
+        if level == "panchayats":
+            run_pooled(pool, tasks, work, save)
+        else:
+            with pool.acquire() as fetcher:
+                for task in tasks:
+                    save(task, work(fetcher, task))
+
+def log_progress(engine):
+    """Log expected versus scraped wells from the crawl_progress rollup (one row per block)."""
+    try:
+        with engine.connect() as conn:
+            totals = progress.state_totals(conn).values()
+    except Exception as e:
+        logger.error(f"Error reading crawl progress: {e}")
+        return
+    expected = sum(total["expected_wells"] for total in totals)
+    scraped = sum(total["scraped_wells"] for total in totals)
+    blocks = sum(total["blocks"] for total in totals)
+    blocks_scraped = sum(total["blocks_scraped"] for total in totals)
+    logger.info(f"Progress: {scraped} of {expected} expected wells saved, {blocks_scraped} of {blocks} blocks have rows.")
+
+def crawl_season(season, base_url, engine, reporter, replay=False, incremental=False, shared=None, refresh=False):
+    """
+    Crawl one season from its root URL into the database.
+
+    The season gets its own page cache, pool of fetchers and writer; every fetch still goes
+    through the process-wide fetch policy, so concurrent seasons share one rate limit,
+    circuit breaker and concurrency budget.
+
+    Args:
+        season (str): Season label the rows and crawl tasks are stored under.
+        base_url (str): Root URL (states page) of the season.
+        engine (sqlalchemy.engine.Engine): Database engine.
+        reporter (StatusReporter): Progress reporter told about every saved page.
+        replay (bool): Rebuild the season's rows from the page cache, with no network access:
+            every page is crawled again and replaces the rows previously saved for it.
+        incremental (bool): Re-crawl only the subtrees whose counts changed.
+        shared (SharedPages, optional): Hierarchy pages shared with the other seasons.
+        refresh (bool): Crawl every page of the season again; pages whose table is unchanged
+            since it was last saved are skipped after the fetch (modules/fingerprint.py).
+    """
+    # Pages must come from the site to detect changes, so incremental and refresh runs don't
+    # read the cache; they still store every fetched page, so a later replay sees the newest ones
+    cache = PageCache(season=base_url, read=replay or not (incremental or refresh)) if (CACHE_ENABLED or replay) else None
+    if replay:
+        logger.info("Replay mode: serving every page of season %s from the page cache at %s", season, cache.cache_dir)
+    # Start the pool of fetch backends (HTTP sessions or WebDrivers); the async
+    # crawl mode manages its own HTTP session instead
+    if CRAWL_MODE == "async" and not replay:
+        pool = None
+    else:
+        pool = DriverPool(SCRAPER_WORKERS, factory=fetcher_factory(cache, replay))
+    # Replayed pages replace their previous rows, like re-crawled pages in incremental mode
+    writer = BufferedWriter(engine, incremental=incremental or replay, season=season)
+    # Replay rebuilds tables from the cached pages, so every page is parsed again
+    fingerprints = PageFingerprints(engine, season) if FINGERPRINT_LEVELS and not replay else None
+
+    try:
         ##### Scrape the STATE table #####
-        # Get count of all states in the State table
+        # Check whether any state of the season is saved (a single-row lookup, not a count)
+        states_saved = False
         try:
-            states = session.query(State)   # <class 'sqlalchemy.orm.query.Query'>
-            logger.info(f"States table queried successfully, count of states: {states.count()}")
+            with engine.connect() as conn:
+                states_saved = inspect(conn).has_table("states") and conn.execute(
+                    text("SELECT 1 FROM states WHERE season = :season LIMIT 1"), {"season": season}
+                ).first() is not None
+            logger.info(f"States table queried successfully, states of season {season} saved: {states_saved}")
         except Exception as e:
             logger.error(f"Error querying states: {e}")
 
         # to-test - delete the states table from the postgres db and check if it gets added back
-        if states.count() == 0:
+        if not states_saved or incremental or refresh or replay:
             try:
-                logger.info("Scraping state table...")
-                state_table = scraper.get_states()
+                logger.info(f"Scraping state table of season {season}...")
+                state_table = scrape_states(pool, cache, base_url)
             except RetryError as re:
                 logger.error(f"Retry attempts failed for get_states: {re}")
                 state_table = pd.DataFrame()  # Assign empty DataFrame
@@ -71,248 +273,102 @@ def main():
             
             # If state_table has data, save it to postgres table
             if not state_table.empty:
-                try:
-                    logger.info("Saving state table (pandas df) to postgres table")
-                    state_table.to_sql("states", engine, if_exists='replace', index=False)
-                    session.commit()
-                    logger.info("State table saved to postgres successfully.")
-                except Exception as e:
-                    logger.error(f"Error saving state table to postgres : {e}")
+                logger.info("Saving state table (pandas df) to postgres table")
+                # The writer updates existing states in place and enqueues the districts pages;
+                # in incremental mode only the districts of changed states are re-crawled
+                writer.add("states", (base_url,), state_table)
+                writer.flush("states")
             else:
-                logger.warning("State table is empty. Skipping saving.")
-        else:
-            logger.info("states postgres table exists and isn't empty. Loading states table from postgres...")
-            logger.info(f"States table queried successfully, count of states: {states.count()}")
-        
-        ##### Scrape the DISTRICT tables #####
-        # Get count of all districts in the District table
-        try:
-            all_districts = session.query(District)   # <class 'sqlalchemy.orm.query.Query'>
-            starting_length_districts = all_districts.count()
-            logger.info(f"Districts table queried successfully, count of districts: {starting_length_districts}")
-        except Exception as e:
-            logger.error(f"Error querying districts: {e}")
-
-        # Get list of available states in the District table
-        try:
-            available_states = session.query(District.__table__.c["States/UT's"]).distinct().all() # <class 'sqlalchemy.orm.query.Query'>
-            logger.info(f"available_states type:{type(available_states)} ")  # <class 'list'>
-            available_states = [state[0] for state in available_states] # Convert to clean list
-            logger.info(f"available distinct states are:{available_states}")
-        except Exception as e:
-            logger.error("Error getting unique states from all_districts: %s", e)
-            available_states = []
-        logger.info(f"Loaded {starting_length_districts} districts from {len(available_states)} states in postgres.")
-        
-        # Find missing states by querying the State table
-        try:
-            missing_states = session.query(State).filter(~State.__table__.c["States/UT's"].in_(available_states)).all() # <class 'sqlalchemy.orm.query.Query'>
-            logger.info(f"no of missing states: {len(missing_states)}")
-            # logger.info(f"missing_states are: {missing_states}")
-            # logger.info(f"missing_states[0] type: {type(missing_states[0])}") # <class 'models.State'>
-            # logger.info(f"missing_states[0] dir: {dir(missing_states[0])}") # ['No. of Panchayat Covered', .., "States/UT's", .., ..]
-        except Exception as e:
-            logger.error("Error finding missing states: %s", e)
-            missing_states = []
-        
-        if len(missing_states)>0:
-            try:
-                logger.info("Scraping district tables for missing states...")
-                state_list = []
-
-                missing_states_names = [getattr(state, "States/UT's") for state in missing_states]
-                missing_states_urls = [getattr(state, "URL") for state in missing_states]        
-                state_list = list(zip(missing_states_names, missing_states_urls))
-                
-                for state, url in state_list:
-                    logger.info(f"Scraping districts for state: {state}")
-                    try:
-                        district_table = scraper.get_districts(state, url)
-                    except RetryError as re:
-                        logger.error(f"Retry attempts failed for get_districts for state {state}: {re}")
-                        district_table = pd.DataFrame()
-                    except Exception as e:
-                        logger.error(f"Unexpected error during get_districts for state {state}: {e}")
-                        district_table = pd.DataFrame()
-                    
-                    # Save all_districts to postgres if not empty
-                    if not district_table.empty:
-                        logger.info(f"Scraped {len(district_table)} districts for state {state}.")
-                        logger.info("Saving new district tables to postgres...")
-                        try:
-                            district_table.to_sql("districts", engine, if_exists='append', index=False)
-                            session.commit()
-                            logger.info("District table saved to postgres successfully.")
-                        except Exception as e:
-                            logger.error(f"Error saving district table to postgres : {e}")                        
-                    else:
-                        logger.warning(f"No districts scraped for state {state}. Skipping saving.")
-            except Exception as e:
-                logger.error(f"Error during district scraping: {e}")
+                logger.warning(f"State table of season {season} is empty. Skipping saving.")
         else:
-            logger.warning("No missing states found. Skipping district scraping.")
+            logger.info(f"States of season {season} are saved. Loading states table from postgres...")
         
-        ##### Scrape the BLOCK tables #####
-        # Get count of all blocks in the Block table
-        try:
-            all_blocks = session.query(Block)
-            starting_length_blocks = all_blocks.count()
-            logger.info(f"Blocks table queried successfully, count of blocks: {starting_length_blocks}")
-        except Exception as e:
-            logger.error(f"Error querying blocks: {e}")
-
-        # Get list of available state-district pairs in the Block table
-        try:
-            available_districts = session.query(Block.__table__.c["States/UT's"], Block.__table__.c["District"]).distinct().all() # <class 'sqlalchemy.orm.query.Query'>
-            available_districts = [(district[0], district[1]) for district in available_districts] # Convert to clean list
-            logger.info(f"available distinct districts are:{available_districts[0:10]} ...")
-        except Exception as e:
-            logger.error(f"Error getting unique districts from all_blocks: {e}")
-            available_districts = []
-        logger.info(f"Loaded {starting_length_blocks} blocks from {len(available_districts)} state-district pairs in postgres.")
-
-        # Find missing state-district pairs by querying the District table
-        try:
-            subquery = session.query(Block.__table__.c["States/UT's"], Block.__table__.c["District"]).distinct().subquery()
-            missing_districts = session.query(District).filter(
-                ~session.query(subquery).filter(
-                    (subquery.c["States/UT's"] == District.__table__.c["States/UT's"]) &
-                    (subquery.c["District"] == District.__table__.c["District"])
-                ).exists()
-            ).all()
-            logger.info(f"no of missing state-district pairs: {len(missing_districts)}")
-        except Exception as e:
-            logger.error(f"Error finding missing state-district pairs: {e}")
-            missing_districts = []
-
-        if len(missing_districts)>0:
+        ##### Scrape the DISTRICT, BLOCK and PANCHAYAT tables #####
+        # Every page below the states table is a task in the crawl_tasks frontier. Tasks are
+        # enqueued when their parent rows are saved and claimed in leased batches, so a restart
+        # (or another process sharing the database) picks up exactly the outstanding pages.
+        for level in ("districts", "blocks", "panchayats"):
             try:
-                logger.info("Scraping block tables for missing state-district combinations...")
-                district_list = []
-
-                missing_states_names = [getattr(district, "States/UT's") for district in missing_districts]
-                missing_districts_names = [getattr(district, "District") for district in missing_districts]
-                missing_districts_urls = [getattr(district, "URL") for district in missing_districts]
-                district_list = list(zip(missing_states_names, missing_districts_names, missing_districts_urls))
-
-                for state, district, url in district_list:
-                    logger.info(f"Scraping blocks for {district} , {state}")
-                    try:
-                        block_table = scraper.get_blocks(state, district, url)
-                    except RetryError as re:
-                        logger.error(f"Retry attempts failed for get_blocks for {district} , {state}: {re}")
-                        block_table = pd.DataFrame()
-                    except Exception as e:
-                        logger.error(f"Unexpected error during get_blocks for {district} , {state}: {e}")
-                        block_table = pd.DataFrame()
-                    
-                    # Save all_blocks to postgres if not empty
-                    if not block_table.empty:
-                        logger.info(f"Scraped {len(block_table)} blocks for {district} , {state}.")
-                        logger.info("Saving new block tables to postgres...")
-                        try:
-                            block_table.to_sql("blocks", engine, if_exists='append', index=False)
-                            session.commit()
-                            logger.info("Block table saved to postgres successfully.")
-                        except Exception as e:
-                            logger.error(f"Error saving block table to postgres : {e}")                        
-                    else:
-                        logger.warning(f"No blocks scraped for {district} , {state}. Skipping saving.")
+                frontier.seed_from_parent(engine, level, season=season)
+                if refresh or replay:
+                    # Every page is crawled again, not only the outstanding ones
+                    requeued = frontier.requeue_level(engine, level, season=season)
+                    logger.info(f"Requeued {requeued} {level} pages of season {season} to {'replay' if replay else 'refresh'}.")
+                logger.info(f"{level} pages outstanding for season {season}: {frontier.outstanding(engine, level, season=season)}")
+                batches = claimed_batches(engine, level, writer, season)
+                crawl_level(level, batches, pool, writer, cache, reporter, base_url, shared, fingerprints)
             except Exception as e:
-                logger.error(f"Error during block scraping: {e}")
-        else:
-            logger.warning("No missing state-district pairs found. Skipping block scraping.")
+                logger.error(f"Error during {level} scraping of season {season}: {e}")
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.close()
+        if fingerprints is not None:
+            logger.info("%d pages of season %s were unchanged since they were last saved.", fingerprints.skipped, season)
 
-        ##### Scrape the PANCHAYAT tables #####
-        # Get count of all panchayats in the Panchayat table
-        try:
-            all_panchayats = session.query(Panchayat)
-            starting_length_panchayats = all_panchayats.count()
-            logger.info(f"Panchayats table queried successfully, count of panchayats: {starting_length_panchayats}")
-        except Exception as e:
-            logger.error(f"Error querying panchayats: {e}")
+def main(replay=False, incremental=False, seasons=None, refresh=False):
+    """
+    Run the full scraping pipeline.
 
-        # Get list of available state-district-block pairs in the Panchayat table
-        try:
-            available_blocks = session.query(Panchayat.__table__.c["States/UT's"], Panchayat.__table__.c["District"], Panchayat.__table__.c["Block"]).distinct().all() # <class 'sqlalchemy.orm.query.Query'>
-            available_blocks = [(block[0], block[1], block[2]) for block in available_blocks] # Convert to clean list
-            logger.info(f"available distinct blocks are:{available_blocks[0:10]} ...")
-        except Exception as e:
-            logger.error(f"Error getting unique blocks from all_panchayats: {e}")
-            available_blocks = []
-        logger.info(f"Loaded {starting_length_panchayats} panchayats from {len(available_blocks)} state-district-block pairs in postgres.")
+    Each season (SEASONS, or SEASON at BASE_URL) is crawled by crawl_season on its own
+    thread, so refreshing several seasons takes about as long as the slowest one within
+    the shared fetch budget. Hierarchy pages listed under the same URL by several seasons
+    are fetched once (see modules/seasons.py).
 
-        # Find missing state-district-block pairs by querying the Block table
-        try:
-            subquery = session.query(Panchayat.__table__.c["States/UT's"], Panchayat.__table__.c["District"], Panchayat.__table__.c["Block"]).distinct().subquery()
-            missing_panchayats = session.query(Block).filter(
-                ~session.query(subquery).filter(
-                    (subquery.c["States/UT's"] == Block.__table__.c["States/UT's"]) &
-                    (subquery.c["District"] == Block.__table__.c["District"]) &
-                    (subquery.c["Block"] == Block.__table__.c["Block"])
-                ).exists()
-            ).all()
-            logger.info(f"no of missing state-district-block pairs: {len(missing_panchayats)}")
-        except Exception as e:
-            logger.error(f"Error finding missing state-district-block pairs: {e}")
-            missing_panchayats = []
+    Args:
+        replay (bool): Rebuild every saved page's rows from the page cache, with no network access.
+        incremental (bool): Re-fetch the states table and re-crawl only the districts,
+            blocks and panchayats below rows whose aggregate counts changed.
+        seasons (list, optional): (label, root URL) pairs overriding the configured seasons.
+        refresh (bool): Re-fetch every page, parsing and saving only the pages whose table
+            changed since it was last saved.
+    """
+    seasons = seasons or configured_seasons()
+    update_status("Running")
+    metrics.start_server()
+    session = get_db_session()
+    engine  = session.get_bind()
+    frontier.ensure_table(engine)
+    reporter = StatusReporter(engine)
+    shared = SharedPages() if len(seasons) > 1 else None
+    errors = {}
 
-        if len(missing_panchayats)>0:
-            try:
-                logger.info("Scraping panchayat tables for missing state-district-block combinations...")
-                block_list = []
-
-                missing_states_names = [getattr(panchayat, "States/UT's") for panchayat in missing_panchayats]
-                missing_districts_names = [getattr(panchayat, "District") for panchayat in missing_panchayats]
-                missing_blocks_names = [getattr(panchayat, "Block") for panchayat in missing_panchayats]
-                missing_blocks_urls = [getattr(panchayat, "URL") for panchayat in missing_panchayats]
-                block_list = list(zip(missing_states_names, missing_districts_names, missing_blocks_names, missing_blocks_urls))
-
-                for state, district, block, url in block_list:
-                    logger.info(f"Scraping panchayats for {block} , {district} , {state}")
-                    try:
-                        panchayat_table = scraper.get_panchayats(state, district, block, url)
-                    except RetryError as re:
-                        logger.error(f"Retry attempts failed for get_panchayats for {block} , {district} , {state}: {re}")
-                        panchayat_table = pd.DataFrame()
-                    except Exception as e:
-                        logger.error(f"Unexpected error during get_panchayats for {block} , {district} , {state}: {e}")
-                        panchayat_table = pd.DataFrame()
-                    
-                    # Save all_panchayats to postgres if not empty
-                    if not panchayat_table.empty:
-                        logger.info(f"Scraped {len(panchayat_table)} panchayats for {block} , {district} , {state}.")
-                        
-                        # Convert empty strings in numeric columns to NaN, then fill NaN with None
-                        logger.info("Converting empty strings to NaN>None in numeric columns...")
-                        numeric_columns = ["Well Diameter(In Feet)", "Pre Monsoon Water Level(In Feet)", "Pre Monsoon Latitude", "Pre Monsoon Longitude"]
-                        for column in numeric_columns:
-                            panchayat_table[column] = pd.to_numeric(panchayat_table[column], errors='coerce')
-                            panchayat_table[column].fillna(None, inplace=True)    # SINCE POSTGRES DOESN'T ALLOW NaN VALUES IN INTEGER COLUMNS
-
-                        logger.info("Saving new panchayat tables to postgres...")
-                        try:
-                            panchayat_table.to_sql("panchayats", engine, if_exists='append', index=False)
-                            session.commit()
-                            logger.info("Panchayat table saved to postgres successfully.")
-                        except Exception as e:
-                            logger.error(f"Error saving panchayat table to postgres : {e}")                        
-                    else:
-                        logger.warning(f"No panchayats scraped for {block} , {district} , {state}. Skipping saving.")
-            except Exception as e:
-                logger.error(f"Error during panchayat scraping: {e}")
-        else:
-            logger.warning("No missing state-district-block pairs found. Skipping panchayat scraping.")
-    
+    try:
+        start_time = begin_scraping_log()
+        log_progress(engine)
+        if len(seasons) > 1:
+            logger.info("Crawling %d seasons concurrently: %s", len(seasons), ", ".join(label for label, _ in seasons))
+        errors = run_seasons(seasons, partial(
+            crawl_season, engine=engine, reporter=reporter, replay=replay, incremental=incremental, shared=shared,
+            refresh=refresh
+        ))
     except Exception as e:
         logger.error("Error during MAIN scraping process: %s", e)
-        update_status("Error", str(e))
+        errors = {"main": e}
     finally:
-        driver.quit()
+        log_progress(engine)
+        metrics.log_summary()
+        if shared is not None:
+            logger.info("%d hierarchy pages were reused across seasons.", shared.hits)
+        failed = [f"{label}: {error}" for label, error in errors.items() if error is not None]
+        if failed:
+            reporter.report("Error", "; ".join(failed), force=True)
+        else:
+            reporter.report("Stopped", "Scraper completed successfully", force=True)
         session.close()
-        logger.info("WebDriver closed.")
+        db.dispose()
         end_scraping_log(start_time)
-        update_status("Stopped","Scraper completed successfully")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape Jaldoot groundwater level data into postgres.")
+    parser.add_argument("--replay", action="store_true",
+                        help="Run the whole pipeline from the page cache only, without network access.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-crawl only the subtrees whose well/panchayat counts changed since the last run.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-fetch every page, re-parsing and saving only the pages whose table changed.")
+    parser.add_argument("--season", action="append", default=[], metavar="LABEL=URL",
+                        help="Season root to crawl, repeatable to crawl several seasons concurrently (default: SEASONS).")
+    args = parser.parse_args()
+    setup_file_logging()
+    main(replay=args.replay, incremental=args.incremental, seasons=parse_seasons(args.season), refresh=args.refresh)
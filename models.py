@@ -1,76 +1,48 @@
 # models.py
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+import threading
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from modules.reflection import reflected_tables  # Import the reflected tables
+from modules.reflection import get_table
 
 Base = declarative_base()
 
-class State(Base):
-    __table__ = reflected_tables['states']
+# Model name -> (table, primary key column, name column shown by repr).
+# The column sets of the scraped tables vary by season, so the models are mapped
+# onto their table definitions on first use instead of at import time.
+_MODELS = {
+    "State": ("states", "id", "state_ut"),
+    "District": ("districts", "id", "name"),
+    "Block": ("blocks", "id", "name"),
+    "Panchayat": ("panchayats", "id", "name"),
+}
+_NAME_COLUMNS = {"states": "States/UT's", "districts": "District", "blocks": "Block", "panchayats": "Panchayat"}
+_lock = threading.Lock()
 
-    # Define primary key explicitly if not auto-detected
-    __mapper_args__ = {
-        'primary_key': [__table__.c["States/UT's"]]
-    }
-    
-    # Relationships
-    # districts = relationship("District", back_populates="state", cascade="all, delete-orphan")
-    
-    def __repr__(self):
-        value = getattr(self, "States/UT's")
-        return f"<State(state_ut='{value}')>"
 
-class District(Base):
-    __table__ = reflected_tables['districts']
+def _define(model):
+    table_name, primary_key, label = _MODELS[model]
+    table = get_table(table_name)
+    name_column = _NAME_COLUMNS[table_name]
 
-    __mapper_args__ = {
-        'primary_key': [__table__.c.id]  # Assuming 'id' is the primary key
-    }
-    
-    # Foreign Key to State
-    # state_ut = Column(String, ForeignKey("states.id"))
-    
-    # Relationships
-    # state = relationship("State", back_populates="districts")
-    # blocks = relationship("Block", back_populates="district", cascade="all, delete-orphan")
-    
     def __repr__(self):
-        value = getattr(self, "District")  # Replace 'name' with actual column name
-        return f"<District(name='{value}')>"
+        value = getattr(self, name_column)
+        return f"<{model}({label}='{value}')>"
 
-class Block(Base):
-    __table__ = reflected_tables['blocks']
+    return type(model, (Base,), {
+        "__table__": table,
+        # Define primary key explicitly if not auto-detected
+        "__mapper_args__": {"primary_key": [table.c[primary_key]]},
+        "__repr__": __repr__,
+    })
 
-    __mapper_args__ = {
-        'primary_key': [__table__.c.id]  # Assuming 'id' is the primary key
-    }
-    
-    # Foreign Key to District
-    # district_id = Column(Integer, ForeignKey("districts.id"))
-    
-    # Relationships
-    # district = relationship("District", back_populates="blocks")
-    # panchayats = relationship("Panchayat", back_populates="block", cascade="all, delete-orphan")
-    
-    def __repr__(self):
-        value = getattr(self, "Block")  # Replace 'name' with actual column name
-        return f"<Block(name='{value}')>"
 
-class Panchayat(Base):
-    __table__ = reflected_tables['panchayats']
+def __getattr__(name):
+    if name not in _MODELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lock:
+        if name not in globals():
+            globals()[name] = _define(name)
+    return globals()[name]
 
-    __mapper_args__ = {
-        'primary_key': [__table__.c.id]  # Assuming 'id' is the primary key
-    }
-    
-    # Foreign Key to Block
-    # block_id = Column(Integer, ForeignKey("blocks.id"))
-    
-    # Relationships
-    # block = relationship("Block", back_populates="panchayats")
-    
-    def __repr__(self):
-        value = getattr(self, "Panchayat")  # Replace 'name' with actual column name
-        return f"<Panchayat(name='{value}')>"
+
+__all__ = ["Base"] + list(_MODELS)
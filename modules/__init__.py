@@ -1 +1,7 @@
-from .scrape import Scraper
\ No newline at end of file
+def __getattr__(name):
+    # Scraper is imported on first use, so importing a single module (e.g. modules.reflection)
+    # doesn't pull in selenium, pandas and the fetch backends
+    if name == "Scraper":
+        from .scrape import Scraper
+        return Scraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
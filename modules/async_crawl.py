@@ -0,0 +1,257 @@
+# modules/async_crawl.py
+
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+from config.settings import TABLE_ID, ASYNC_CONCURRENCY, USER_AGENT, FETCH_BACKOFF_BASE, FETCH_BACKOFF_MAX, logger
+from modules.exceptions import FetchError
+from modules.parse import parse_level_table
+from modules.fingerprint import DIGEST_ATTR, UNCHANGED
+from modules import metrics
+from modules.policy import default_policy
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only needed for the async crawl mode
+    aiohttp = None
+
+CHILD_LEVELS = {"states": "districts", "districts": "blocks", "blocks": "panchayats"}
+RETRY_EXCEPTIONS = (FetchError, asyncio.TimeoutError) + ((aiohttp.ClientError,) if aiohttp else ())
+
+
+class AsyncCrawler:
+    """
+    asyncio crawl engine, an alternative to the synchronous Scraper.
+
+    A single aiohttp session keeps up to `concurrency` requests in flight per host,
+    bounded by a per-host semaphore, so hundreds of pages can be in flight from one
+    process without a thread per request. Every request also goes through the shared
+    fetch policy (rate limit, circuit breaker, adaptive concurrency and timeouts).
+    Pages are parsed with parse_level_table, so every level produces the same
+    columns as the Scraper methods.
+
+    Tasks have the same shape as in main.py: parent names followed by the page URL,
+    e.g. (state, url) for districts or (state, district, block, url) for panchayats.
+    """
+
+    def __init__(self, base_url, concurrency=ASYNC_CONCURRENCY, cache=None, policy=default_policy, shared=None,
+                 fingerprints=None):
+        """
+        Args:
+            base_url (str): The base URL (states page) of the season to crawl.
+            concurrency (int): Maximum number of requests in flight per host.
+            cache (PageCache, optional): Page cache consulted before the network.
+            policy (FetchPolicy): Fetch policy applied to every request attempt.
+            shared (SharedPages, optional): Hierarchy pages shared with the other seasons of a
+                multi-season run (modules/seasons.py).
+            fingerprints (PageFingerprints, optional): Digests of the pages saved by earlier runs;
+                a page whose table is unchanged is returned as UNCHANGED instead of being parsed.
+        """
+        if aiohttp is None:
+            raise ImportError("The async crawl mode requires aiohttp, install it with: pip install aiohttp")
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.cache = cache
+        self.policy = policy
+        self.shared = shared
+        self.fingerprints = fingerprints
+        self.session = None
+        self._host_limits = {}
+        self._table_pattern = re.compile(r"""id\s*=\s*["']?%s["'\s>]""" % re.escape(TABLE_ID))
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT})
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.concurrency)
+        return self._host_limits[host]
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=FETCH_BACKOFF_BASE, max=FETCH_BACKOFF_MAX),
+        retry=retry_if_exception_type(RETRY_EXCEPTIONS),
+        before_sleep=metrics.count_retry,
+        reraise=True
+    )
+    async def fetch(self, url, level):
+        """
+        Fetch a page and return its HTML, retrying asynchronously on failure.
+
+        Args:
+            url (str): URL to load.
+            level (str): Level of the page, which selects the policy's timeout.
+
+        Returns:
+            str: Raw page HTML.
+        """
+        async with self._host_limit(url), self.policy.request_async(level) as timeout:
+            try:
+                with metrics.timer("navigate"):
+                    async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                        if response.status >= 400:
+                            raise FetchError(f"HTTP {response.status} loading {url}")
+                        html = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error("Error loading page %s: %s", url, e)
+                raise
+            with metrics.timer("wait_table"):
+                if not self._table_pattern.search(html):
+                    raise FetchError(f"Table '{TABLE_ID}' not found on {url}")
+        return html
+
+    async def _load(self, level, url):
+        """Load a page from the page cache or the network; cache file I/O runs in a worker thread."""
+        html = await asyncio.to_thread(self.cache.get, url) if self.cache is not None else None
+        if html is not None:
+            metrics.pages_total.inc(source="cache", **metrics.current_labels())
+            return html
+        html = await self.fetch(url, level)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, url, html)
+        metrics.pages_total.inc(source="network", **metrics.current_labels())
+        return html
+
+    async def get_level(self, level, task):
+        """
+        Fetch and parse one page.
+
+        Args:
+            level (str): "states", "districts", "blocks" or "panchayats".
+            task (tuple): Parent names followed by the page URL.
+
+        Returns:
+            pd.DataFrame: The page's table, with the same columns as the Scraper methods, or
+                UNCHANGED if the table is the same as when it was last saved.
+        """
+        *parents, url = task
+        # Each asyncio task has its own context, so concurrent pages keep their own labels
+        metrics.set_labels(level, parents[0] if parents else "")
+        if self.shared is None:
+            html = await self._load(level, url)
+        else:
+            html, reused = await self.shared.load_async(level, url, lambda: self._load(level, url))
+            if reused:
+                metrics.pages_total.inc(source="shared", **metrics.current_labels())
+        digest = None
+        if self.fingerprints is not None:
+            # The first check of a level loads its digests from the database
+            digest, unchanged = await asyncio.to_thread(self.fingerprints.check, level, url, html)
+            if unchanged:
+                return UNCHANGED
+        parents = parents if level != "panchayats" else ()
+        # Parsing a large page takes long enough to stall every request in flight
+        table = await asyncio.to_thread(self._parse, html, level, url, parents)
+        metrics.rows_per_page.observe(len(table), **metrics.current_labels())
+        if digest is not None:
+            table.attrs[DIGEST_ATTR] = digest
+        return table
+
+    @staticmethod
+    def _parse(html, level, url, parents):
+        with metrics.timer("parse"):
+            return parse_level_table(html, level, TABLE_ID, url, parents=parents)
+
+    async def _get_or_error(self, level, task):
+        """Like get_level, but returns the exception instead of raising it once retries are exhausted."""
+        try:
+            return await self.get_level(level, task)
+        except Exception as e:
+            logger.error(f"Retry attempts failed for {level} of {task[:-1]}: {e}")
+            return e
+
+    async def crawl_level(self, level, tasks, write):
+        """
+        Crawl every task of one level concurrently and persist each result as it arrives.
+
+        write(task, df) is called on a single background writer thread, so database
+        writes never block the event loop and never run concurrently. For a task that
+        failed after all retries, df is the exception instead of a DataFrame.
+
+        Returns:
+            int: Number of tasks processed.
+        """
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer") as writer:
+            async def run(task):
+                df = await self._get_or_error(level, task)
+                await loop.run_in_executor(writer, write, task, df)
+
+            await asyncio.gather(*(run(task) for task in tasks))
+        return len(tasks)
+
+    async def crawl(self, write):
+        """
+        Walk states -> districts -> blocks -> panchayats from the base URL.
+
+        Child pages are scheduled as soon as their parent page is parsed, so all
+        levels are fetched concurrently within the concurrency budget.
+
+        Args:
+            write (callable): write(level, task, df), called on a single writer thread;
+                df is the exception for a page that failed after all retries.
+        """
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer") as writer:
+            async def visit(level, task):
+                df = await self._get_or_error(level, task)
+                await loop.run_in_executor(writer, write, level, task, df)
+                child = CHILD_LEVELS.get(level)
+                if child is None or isinstance(df, Exception) or df is UNCHANGED or df.empty or 'URL' not in df.columns:
+                    return
+                name_column = {"states": "States/UT's", "districts": "District", "blocks": "Block"}[level]
+                parents = tuple(task[:-1])
+                await asyncio.gather(*(
+                    visit(child, parents + (name, url))
+                    for name, url in zip(df[name_column], df['URL'])
+                ))
+
+            await visit("states", (self.base_url,))
+
+
+def run_level(base_url, level, batches, write, concurrency=ASYNC_CONCURRENCY, cache=None, shared=None, fingerprints=None):
+    """
+    Synchronous entry point used by main.py: crawl one level's tasks with asyncio.
+
+    Every batch is crawled by the same event loop and aiohttp session. The next batch is
+    taken from `batches` on a worker thread once the previous one is written, so claiming
+    it from the crawl frontier doesn't block the loop either.
+
+    Args:
+        base_url (str): The base URL of the season.
+        level (str): "states", "districts", "blocks" or "panchayats".
+        batches (iterable): Lists of task tuples of parent names followed by the page URL,
+            e.g. the batches claimed from the crawl frontier.
+        write (callable): write(task, df), called once per task on a writer thread.
+        concurrency (int): Maximum number of requests in flight per host.
+        cache (PageCache, optional): Page cache consulted before the network.
+        shared (SharedPages, optional): Hierarchy pages shared with the other seasons.
+        fingerprints (PageFingerprints, optional): Digests of the pages saved by earlier runs.
+
+    Returns:
+        int: Number of tasks processed.
+    """
+    async def _run():
+        processed = 0
+        batch_iterator = iter(batches)
+        async with AsyncCrawler(base_url, concurrency, cache, shared=shared, fingerprints=fingerprints) as crawler:
+            while (tasks := await asyncio.to_thread(next, batch_iterator, None)) is not None:
+                processed += await crawler.crawl_level(level, tasks, write)
+        return processed
+    return asyncio.run(_run())
+
+
+def get_states(base_url, cache=None):
+    """Fetch and parse the states table with the async engine."""
+    async def _run():
+        async with AsyncCrawler(base_url, cache=cache) as crawler:
+            return await crawler.get_level("states", (base_url,))
+    return asyncio.run(_run())
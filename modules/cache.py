@@ -0,0 +1,182 @@
+# modules/cache.py
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from config.settings import CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES, BASE_URL, logger
+from modules.exceptions import CacheMiss
+from modules.fetch import Fetcher
+
+
+class _CacheDirectory:
+    """Lock and total size of one cache directory, shared by every PageCache using it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.size = None  # Total size on disk, computed on first write
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def _directory(cache_dir):
+    with _directories_lock:
+        return _directories.setdefault(cache_dir.resolve(), _CacheDirectory())
+
+
+def _file_size(path):
+    # Another cache instance may have evicted the file in the meantime
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages, gzip-compressed and keyed by season and URL.
+
+    Every entry lives at <cache_dir>/<aa>/<sha256>.html.gz, where the hash covers the
+    season root (BASE_URL) and the page URL, so seasons never share entries. Entries
+    older than `ttl` seconds are ignored unless stale reads are allowed (replay mode),
+    and the least recently written entries are evicted once the cache grows past
+    `max_bytes`. A write-only cache (`read=False`) never serves entries but still stores
+    every fetched page, keeping the cache current for later replays. Safe to share
+    between the threads of a DriverPool; the caches of concurrent seasons on the same
+    directory share one size count and evict under one lock, so together they stay
+    below `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, season=BASE_URL, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES, read=True):
+        """
+        Args:
+            cache_dir (Path): Directory holding the cache entries.
+            season (str): Season root the cached pages belong to.
+            ttl (int): Seconds an entry stays fresh; 0 or less disables expiry.
+            max_bytes (int): Size above which old entries are evicted; 0 or less disables eviction.
+            read (bool): Serve cached entries; False only stores fetched pages.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.season = season
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.read = read
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._directory = _directory(self.cache_dir)
+
+    def path(self, url):
+        """Path of the cache entry for a URL."""
+        digest = hashlib.sha256(f"{self.season}\n{url}".encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.html.gz"
+
+    def get(self, url, allow_stale=False):
+        """
+        Return the cached HTML for a URL, or None on a miss or an expired entry.
+
+        Args:
+            url (str): Page URL.
+            allow_stale (bool): Return expired entries as well.
+        """
+        if not self.read:
+            return None
+        path = self.path(url)
+        try:
+            if not allow_stale and self.ttl > 0 and time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError) as e:
+            logger.warning(f"Discarding unreadable cache entry for {url}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, url, html):
+        """Store the HTML of a URL, replacing any previous entry atomically."""
+        path = self.path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(html)
+        directory = self._directory
+        with directory.lock:
+            old_size = _file_size(path)
+            os.replace(tmp_path, path)
+            if directory.size is None:
+                directory.size = self._scan_size()
+            else:
+                directory.size += _file_size(path) - old_size
+            if 0 < self.max_bytes < directory.size:
+                self._evict()
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.html.gz")
+
+    def _scan_size(self):
+        return sum(_file_size(entry) for entry in self._entries())
+
+    def _evict(self):
+        """Delete the oldest entries until the cache is below 90% of max_bytes."""
+        directory = self._directory
+        target = self.max_bytes * 0.9
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        removed = 0
+        for _, entry in entries:
+            if directory.size <= target:
+                break
+            size = _file_size(entry)
+            entry.unlink(missing_ok=True)
+            directory.size -= size
+            removed += 1
+        logger.info("Evicted %d pages from the page cache (%d bytes remaining).", removed, directory.size)
+
+
+class CachedFetcher(Fetcher):
+    """
+    Fetch backend that serves pages from a PageCache before falling back to another backend.
+
+    In offline mode no network backend is used: every page must come from the cache,
+    expired or not, and a miss raises CacheMiss.
+    """
+
+    def __init__(self, fetcher, cache, offline=False):
+        """
+        Args:
+            fetcher (Fetcher | None): Backend used on cache misses; may be None when offline.
+            cache (PageCache): The page cache.
+            offline (bool): Serve only from the cache, never from the network.
+        """
+        self.fetcher = fetcher
+        self.cache = cache
+        self.offline = offline
+        self.name = f"cached-{fetcher.name}" if fetcher is not None else "replay"
+
+    def cached(self, url):
+        html = self.cache.get(url, allow_stale=self.offline)
+        if html is None and self.offline:
+            raise CacheMiss(f"Page not in cache: {url}")
+        return html
+
+    def fetch(self, url, timeout):
+        html = self.cached(url)
+        if html is not None:
+            logger.debug("Page cache hit: %s", url)
+            return html
+        html = self.fetcher.fetch(url, timeout)
+        self.cache.put(url, html)
+        return html
+
+    def close(self):
+        if self.fetcher is not None:
+            self.fetcher.close()
@@ -0,0 +1,86 @@
+# modules/coerce.py
+
+import re
+import pandas as pd
+
+# Column types of each level's table, as (header pattern, kind) pairs; the first pattern
+# matching a header decides its kind and unmatched columns stay as text. Headers vary a
+# little between seasons ("Pre/Post Monsoon ..."), hence patterns instead of exact names.
+#   category   - names repeated across rows, stored as pandas categoricals
+#   int        - counts, as nullable 32-bit integers
+#   float      - measurements, as float32
+#   coordinate - latitudes and longitudes, kept as float64 for sub-metre precision
+#   date       - day-first dates
+_NAMES = (r"^(States/UT's|District|Block|Panchayat|Village)$", "category")
+_COUNTS = (r"^No\. of", "int")
+COLUMN_TYPES = {
+    "states": [_NAMES, _COUNTS],
+    "districts": [_NAMES, _COUNTS],
+    "blocks": [_NAMES, _COUNTS],
+    "panchayats": [
+        _NAMES,
+        (r"Latitude|Longitude", "coordinate"),
+        (r"Water Level|Diameter|Depth", "float"),
+        (r"Date", "date"),
+        _COUNTS,
+    ],
+}
+_PATTERNS = {level: [(re.compile(pattern), kind) for pattern, kind in types] for level, types in COLUMN_TYPES.items()}
+
+
+def _numeric(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    # Empty cells and stray text become NaN; thousands separators are dropped
+    return pd.to_numeric(series.astype("string").str.replace(",", "", regex=False).str.strip(), errors="coerce")
+
+
+_CONVERTERS = {
+    "category": lambda series: series.astype("category"),
+    "int": lambda series: _numeric(series).round().astype("Int32"),
+    "float": lambda series: _numeric(series).astype("float32"),
+    "coordinate": lambda series: _numeric(series).astype("float64"),
+    "date": lambda series: pd.to_datetime(series, errors="coerce", dayfirst=True),
+}
+
+
+def column_kinds(level, columns):
+    """
+    Look up the registered kind of each column.
+
+    Args:
+        level (str): "states", "districts", "blocks" or "panchayats".
+        columns (iterable): Column names.
+
+    Returns:
+        dict: Column name -> kind, for the columns with a registered type.
+    """
+    kinds = {}
+    for column in columns:
+        for pattern, kind in _PATTERNS.get(level, []):
+            if pattern.search(str(column)):
+                kinds[column] = kind
+                break
+    return kinds
+
+
+def coerce_types(level, frame):
+    """
+    Convert a scraped table's text columns to the compact dtypes of COLUMN_TYPES.
+
+    Each column is converted in one vectorized operation; values that don't parse
+    become missing (NULL in postgres). Already converted columns are left as they are,
+    so a batch can be coerced again after concatenation.
+
+    Args:
+        level (str): "states", "districts", "blocks" or "panchayats".
+        frame (pd.DataFrame): Scraped rows.
+
+    Returns:
+        pd.DataFrame: A new frame with converted columns.
+    """
+    converted = {
+        column: _CONVERTERS[kind](frame[column])
+        for column, kind in column_kinds(level, frame.columns).items()
+    }
+    return frame.assign(**converted) if converted else frame
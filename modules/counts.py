@@ -0,0 +1,160 @@
+# modules/counts.py
+
+import threading
+import time
+import pandas as pd
+from sqlalchemy import inspect, text
+from config.settings import DASHBOARD_CACHE_TTL, SEASON, logger
+from modules.db import get_engine
+from modules import progress
+from modules.schema import SEASON_COLUMN
+
+STATE_COLUMN = "States/UT's"
+EXPECTED_COLUMN = "No. of Well Covered"
+_TABLES = ["states", "districts", "blocks", "panchayats"]
+
+
+def data_version(conn):
+    """
+    A cheap fingerprint of the scraped data: the highest id of each table and the last
+    crawl_tasks and crawl_progress updates. It changes whenever rows are inserted or
+    pages are (re)crawled, and only reads primary key indexes and the small crawl tables.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Database connection.
+
+    Returns:
+        tuple: The fingerprint.
+    """
+    existing = set(inspect(conn).get_table_names())
+    version = []
+    for table in _TABLES + ["crawl_tasks", "crawl_progress"]:
+        if table not in existing:
+            version.append(None)
+            continue
+        column = "updated_at" if table.startswith("crawl_") else "id"
+        version.append(conn.execute(text(f"SELECT MAX({column}) FROM {table}")).scalar())
+    return tuple(version)
+
+
+def query_state_counts(conn, season=SEASON):
+    """
+    Expected (the states table's well count) and actual (saved panchayat rows) records per state of a season.
+
+    Actual records are summed from the per-block crawl_progress rollup (modules/progress.py),
+    so the query reads O(blocks) rows however many panchayat rows are saved.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Database connection.
+        season (str | None): Season to count, or None to count every season.
+
+    Returns:
+        pd.DataFrame: "States/UT's", "Expected_Records" and "Actual_Records", one row per state;
+            with season=None, one row per state and season, after a leading "season" column.
+    """
+    columns = ([SEASON_COLUMN] if season is None else []) + [STATE_COLUMN, "Expected_Records", "Actual_Records"]
+    inspector = inspect(conn)
+    if not inspector.has_table("states"):
+        return pd.DataFrame(columns=columns)
+    quote = conn.dialect.identifier_preparer.quote
+    has_expected = EXPECTED_COLUMN in {column["name"] for column in inspector.get_columns("states")}
+    expected = quote(EXPECTED_COLUMN) if has_expected else "NULL"
+    where = "" if season is None else f"WHERE {quote(SEASON_COLUMN)} = :season "
+    states = pd.read_sql(text(
+        f"SELECT id AS state_id, {quote(SEASON_COLUMN)}, {quote(STATE_COLUMN)}, {expected} AS \"Expected_Records\" "
+        f"FROM states {where}ORDER BY {quote(SEASON_COLUMN)}, id"
+    ), conn, params={} if season is None else {"season": season})
+    totals = progress.state_totals(conn)
+    actual = pd.DataFrame(
+        [(state_id, total["scraped_wells"]) for state_id, total in totals.items()],
+        columns=["state_id", "Actual_Records"],
+    )
+    counts = states.merge(actual, on="state_id", how="left")[columns]
+    counts["Expected_Records"] = pd.to_numeric(counts["Expected_Records"], errors="coerce").fillna(0).astype(int)
+    counts["Actual_Records"] = pd.to_numeric(counts["Actual_Records"], errors="coerce").fillna(0).astype(int)
+    return counts
+
+
+def query_season_counts(conn):
+    """Per-state counts of every season, see query_state_counts(season=None)."""
+    return query_state_counts(conn, season=None)
+
+
+class CountCache:
+    """
+    Cached per-state counts of every season for the dashboard, shared by every viewer of the process.
+
+    A cached result is served as is for ttl seconds. After that, the next request checks
+    data_version(): if nothing changed, the result is kept for another ttl; if the data
+    changed, the stale result is still returned immediately while a single background
+    thread recomputes it, so page loads never wait on the aggregate query (except the
+    very first one).
+    """
+
+    def __init__(self, engine=None, ttl=DASHBOARD_CACHE_TTL, query=query_season_counts):
+        self.engine = engine
+        self.ttl = ttl
+        self.query = query
+        self._lock = threading.Lock()
+        self._result = None
+        self._version = None
+        self._checked_at = 0.0
+        self._computed_at = None
+        self._refreshing = None
+
+    def _compute(self):
+        engine = self.engine or get_engine()
+        with engine.connect() as conn:
+            version = data_version(conn)
+            result = self.query(conn)
+        with self._lock:
+            self._result, self._version = result, version
+            self._checked_at, self._computed_at = time.monotonic(), time.time()
+        return result
+
+    def _refresh(self):
+        try:
+            self._compute()
+        except Exception as e:
+            logger.error(f"Error refreshing the dashboard counts: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = None
+
+    def get(self):
+        """
+        Return the cached counts, computing them on the first call.
+
+        Returns:
+            pd.DataFrame: See query_season_counts().
+        """
+        with self._lock:
+            result, fresh = self._result, time.monotonic() - self._checked_at < self.ttl
+        if result is None:
+            return self._compute()
+        if fresh:
+            return result
+        engine = self.engine or get_engine()
+        with engine.connect() as conn:
+            version = data_version(conn)
+        with self._lock:
+            if version == self._version:
+                self._checked_at = time.monotonic()
+            elif self._refreshing is None:
+                self._refreshing = threading.Thread(target=self._refresh, name="count-refresh", daemon=True)
+                self._refreshing.start()
+            return self._result
+
+    @property
+    def computed_at(self):
+        """Wall-clock time of the last computation, or None."""
+        return self._computed_at
+
+    def invalidate(self):
+        """Drop the cached result, e.g. after clearing tables by hand."""
+        with self._lock:
+            self._result, self._version = None, None
+
+
+# The dashboard's cache; Streamlit imports this module once per server process
+state_counts = CountCache()
@@ -0,0 +1,74 @@
+# modules/db.py
+
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, scoped_session
+from config.settings import (
+    DATABASE_URL as DATABASE_URL_OVERRIDE, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_STATEMENT_TIMEOUT_MS,
+    DB_APPLICATION_NAME, logger
+)
+
+DATABASE_URL = DATABASE_URL_OVERRIDE or f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+_engine = None
+_lock = threading.Lock()
+
+# One session per thread: each scraper worker, the writer thread and the dashboard
+# get their own session, all drawing connections from the shared pool
+Session = scoped_session(sessionmaker())
+
+
+def get_engine():
+    """
+    Return the process-wide engine, creating it on first use.
+
+    Every module shares this engine and its connection pool (DB_POOL_SIZE connections
+    plus up to DB_MAX_OVERFLOW more). Connections are checked with a pre-ping before
+    use, recycled after DB_POOL_RECYCLE seconds, and every statement is limited to
+    DB_STATEMENT_TIMEOUT_MS milliseconds.
+
+    Returns:
+        sqlalchemy.engine.Engine: The shared engine.
+    """
+    global _engine
+    with _lock:
+        if _engine is None:
+            connect_args = {}
+            if DATABASE_URL.startswith("postgresql"):
+                connect_args["application_name"] = DB_APPLICATION_NAME
+                if DB_STATEMENT_TIMEOUT_MS:
+                    connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+            _engine = create_engine(
+                DATABASE_URL,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=True,
+                connect_args=connect_args,
+            )
+            Session.configure(bind=_engine)
+            logger.info("Database engine created (pool size %d, max overflow %d).", DB_POOL_SIZE, DB_MAX_OVERFLOW)
+        return _engine
+
+
+def get_session():
+    """Return the calling thread's session, bound to the shared engine."""
+    get_engine()
+    return Session()
+
+
+def remove_session():
+    """Close the calling thread's session and return its connection to the pool."""
+    Session.remove()
+
+
+def dispose():
+    """Close every pooled connection, e.g. at shutdown or in a forked child process."""
+    global _engine
+    with _lock:
+        if _engine is not None:
+            Session.remove()
+            _engine.dispose()
+            _engine = None
@@ -0,0 +1,13 @@
+# modules/exceptions.py
+
+
+class FetchError(Exception):
+    """Raised when a fetch backend fails to load a page or locate its data table."""
+
+
+class ParseError(Exception):
+    """Raised when a loaded page's data table cannot be extracted."""
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a page is not in the page cache."""
@@ -0,0 +1,181 @@
+# modules/export.py
+
+import hashlib
+import json
+import shutil
+from urllib.parse import quote
+import pandas as pd
+from sqlalchemy import inspect, text
+from config.settings import EXPORT_DIR, EXPORT_COMPRESSION, EXPORT_CHUNK_ROWS, logger
+from modules.coerce import coerce_types
+from modules.schema import SEASON_COLUMN, flat_source
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for the Parquet export
+    pa = None
+
+LEVELS = ["states", "districts", "blocks", "panchayats"]
+STATE_COLUMN = "States/UT's"
+MANIFEST = "_manifest.json"
+# Levels whose saved rows are updated in place by a re-crawl
+UPDATED_IN_PLACE = ["districts", "blocks"]
+
+
+def _partition_dir(out_dir, level, season, state=None):
+    path = out_dir / level / f"season={quote(season, safe='')}"
+    return path / f"state={quote(state, safe='')}" if state is not None else path
+
+
+def _seasons(conn):
+    """Seasons with saved states, in the order they were first crawled."""
+    quote_id = conn.dialect.identifier_preparer.quote
+    rows = conn.execute(text(
+        f"SELECT {quote_id(SEASON_COLUMN)} FROM states GROUP BY {quote_id(SEASON_COLUMN)} ORDER BY MIN(id)"
+    )).all()
+    return [season for season, in rows]
+
+
+def _fingerprints(conn, level, season):
+    """
+    Row count and highest row id per state; a partition is rewritten when its fingerprint changes.
+
+    Districts and blocks rows are updated in place when their page is crawled again
+    (modules/incremental.py), keeping their ids and counts, so their fingerprints also
+    carry a digest of the row values. These levels are small enough to be read whole.
+    """
+    quote_id = conn.dialect.identifier_preparer.quote
+    rows = conn.execute(text(
+        f"SELECT {quote_id(STATE_COLUMN)}, COUNT(*), MAX(id) FROM {quote_id(flat_source(level))} "
+        f"WHERE {quote_id(SEASON_COLUMN)} = :season GROUP BY {quote_id(STATE_COLUMN)}"
+    ), {"season": season}).all()
+    fingerprints = {state: [count, max_id] for state, count, max_id in rows}
+    if level in UPDATED_IN_PLACE:
+        frame = pd.read_sql(text(
+            f"SELECT * FROM {quote_id(flat_source(level))} WHERE {quote_id(SEASON_COLUMN)} = :season ORDER BY id"
+        ), conn, params={"season": season})
+        hashes = pd.util.hash_pandas_object(frame.astype(str), index=False)
+        for state, state_hashes in hashes.groupby(frame[STATE_COLUMN]):
+            fingerprints[state].append(hashlib.blake2b(state_hashes.to_numpy().tobytes(), digest_size=16).hexdigest())
+    return fingerprints
+
+
+def _to_arrow(level, chunk, schema=None):
+    # Categoricals are written as plain strings: Parquet dictionary-encodes them anyway,
+    # and per-chunk dictionaries would not share one Arrow schema
+    frame = coerce_types(level, chunk)
+    frame = frame.astype({column: "object" for column in frame.columns if isinstance(frame[column].dtype, pd.CategoricalDtype)})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if schema is None:
+        # A column that is empty in the first chunk must still accept text in later ones
+        schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema])
+    return table.cast(schema)
+
+
+def _write_partition(conn, level, target, where="", params=None, drop=()):
+    """Stream the rows of one partition from the database into a single Parquet file."""
+    quote_id = conn.dialect.identifier_preparer.quote
+    # Dot-prefixed, so dataset readers ignore a partition left half-written by a crash
+    tmp = target.with_name(f".{target.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    writer, rows = None, 0
+    try:
+        query = text(f"SELECT * FROM {quote_id(flat_source(level))}{where} ORDER BY id")
+        stream = conn.execution_options(stream_results=True)
+        for chunk in pd.read_sql(query, stream, params=params or {}, chunksize=EXPORT_CHUNK_ROWS):
+            chunk = chunk.drop(columns=[column for column in drop if column in chunk.columns])
+            table = _to_arrow(level, chunk, writer.schema if writer is not None else None)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp / "part-0.parquet", table.schema, compression=EXPORT_COMPRESSION)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    shutil.rmtree(target, ignore_errors=True)
+    tmp.rename(target)
+    return rows
+
+
+def export_dataset(engine, out_dir=EXPORT_DIR, season=None, levels=LEVELS, full=False):
+    """
+    Export the scraped tables to Parquet datasets, partitioned by season and state.
+
+    Each level is written under out_dir/<level>/season=<season>/state=<state>/ as
+    compressed Parquet with Arrow-typed columns (see modules/coerce.py), streamed
+    from the database in EXPORT_CHUNK_ROWS-row chunks. The partition columns follow
+    the Hive convention, so readers get them back and can prune partitions, e.g.
+    pd.read_parquet(out_dir / "panchayats", filters=[("state", "=", "Goa")]).
+
+    The export is incremental: a partition is only rewritten when its row count or
+    highest row id changed since the last export (recorded in out_dir/_manifest.json),
+    or, for districts and blocks, any of its values.
+    The states table is small and is rewritten as a single file per season.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine.
+        out_dir (Path): Root directory of the datasets.
+        season (str, optional): Export only this season; every saved season by default.
+        levels (list): Tables to export.
+        full (bool): Rewrite every partition regardless of the manifest.
+
+    Returns:
+        dict: Level -> number of partitions rewritten.
+    """
+    if pa is None:
+        raise ImportError("The Parquet export requires pyarrow, install it with: pip install pyarrow")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    manifest = {} if full or not manifest_path.exists() else json.loads(manifest_path.read_text())
+    rewritten = {}
+    with engine.connect() as conn:
+        existing = set(inspect(conn).get_table_names())
+        quote_id = conn.dialect.identifier_preparer.quote
+        seasons = [season] if season is not None else (_seasons(conn) if "states" in existing else [])
+        for level in levels:
+            if level not in existing:
+                logger.warning(f"Table '{level}' does not exist, skipping its export.")
+                continue
+            rewritten[level] = 0
+            for name in seasons:
+                if level == "states":
+                    rows = _write_partition(
+                        conn, level, _partition_dir(out_dir, level, name),
+                        where=f" WHERE {quote_id(SEASON_COLUMN)} = :season", params={"season": name},
+                        drop=[SEASON_COLUMN],
+                    )
+                    rewritten[level] += 1
+                    logger.info(f"Exported {rows} states for season {name}.")
+                    continue
+                previous = manifest.get(level, {}).get(name, {})
+                current = _fingerprints(conn, level, name)
+                changed = [state for state, fingerprint in current.items() if previous.get(state) != fingerprint]
+                for state in changed:
+                    rows = _write_partition(
+                        conn, level, _partition_dir(out_dir, level, name, state),
+                        where=f" WHERE {quote_id(SEASON_COLUMN)} = :season AND {quote_id(STATE_COLUMN)} = :state",
+                        params={"season": name, "state": state}, drop=[SEASON_COLUMN, STATE_COLUMN],
+                    )
+                    logger.info(f"Exported {rows} {level} rows of {state} for season {name}.")
+                for state in set(previous) - set(current):
+                    shutil.rmtree(_partition_dir(out_dir, level, name, state), ignore_errors=True)
+                manifest.setdefault(level, {})[name] = current
+                rewritten[level] += len(changed)
+                logger.info(f"{level}: {len(changed)} of {len(current)} state partitions of season {name} rewritten.")
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, default=int))
+    tmp.replace(manifest_path)
+    return rewritten
+
+
+if __name__ == "__main__":
+    import argparse
+    from modules.db import get_engine
+
+    parser = argparse.ArgumentParser(description="Export the scraped tables to partitioned Parquet datasets.")
+    parser.add_argument("--full", action="store_true", help="Rewrite every partition, not only the changed ones.")
+    parser.add_argument("--season", help="Export only this season (default: every saved season).")
+    args = parser.parse_args()
+    export_dataset(get_engine(), season=args.season, full=args.full)
@@ -0,0 +1,187 @@
+# modules/fetch.py
+
+import re
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from config.settings import TABLE_ID, FETCH_BACKEND, HTTP_POOL_SIZE, USER_AGENT, logger
+from modules.exceptions import FetchError
+from modules.parse import extract_hidden_fields
+from modules import metrics
+
+
+class Fetcher:
+    """
+    Base class for the page fetch backends used by Scraper.
+
+    A backend loads a URL, waits until the data table identified by TABLE_ID is
+    present and returns the raw page HTML for table extraction.
+    """
+
+    name = "base"
+
+    def fetch(self, url, timeout):
+        """
+        Load a page and return its HTML.
+
+        Args:
+            url (str): URL to load.
+            timeout (float): Seconds to wait for the page and its data table.
+
+        Returns:
+            str: Raw page HTML.
+        """
+        raise NotImplementedError
+
+    def cached(self, url):
+        """Return the page's HTML if it can be served without a network request, else None."""
+        return None
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class SeleniumFetcher(Fetcher):
+    """Fetch backend that renders pages in a Selenium WebDriver."""
+
+    name = "selenium"
+
+    def __init__(self, driver):
+        """
+        Args:
+            driver (webdriver.Chrome): Selenium WebDriver instance.
+        """
+        self.driver = driver
+
+    def fetch(self, url, timeout):
+        with metrics.timer("navigate"):
+            self.driver.get(url)
+        with metrics.timer("wait_table"):
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.ID, TABLE_ID))
+            )
+        return self.driver.page_source
+
+    def close(self):
+        self.driver.quit()
+        logger.info("WebDriver closed.")
+
+
+class HttpFetcher(Fetcher):
+    """
+    Fetch backend that requests pages over a pooled keep-alive HTTP session.
+
+    The NIC pages are server-rendered ASP.NET tables, so no browser is needed.
+    ASP.NET session cookies are kept by the underlying requests.Session, and the
+    hidden form state (__VIEWSTATE, __EVENTVALIDATION, ...) of every page is kept
+    so that postbacks can be replayed with post_back().
+    """
+
+    name = "http"
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, user_agent=USER_AGENT):
+        """
+        Args:
+            pool_size (int): Number of keep-alive connections kept per host.
+            user_agent (str): User-Agent header sent with every request.
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": user_agent})
+        self._last_page = None  # (url, html) of the last response, whose form a postback replays
+        self._table_pattern = re.compile(r"""id\s*=\s*["']?%s["'\s>]""" % re.escape(TABLE_ID))
+
+    def _handle_response(self, url, response):
+        """Validate a response, remember it for a postback and return its HTML."""
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            raise FetchError(f"HTTP error loading {url}: {e}") from e
+        html = response.text
+        self._last_page = (url, html)
+        if not self._table_pattern.search(html):
+            raise FetchError(f"Table '{TABLE_ID}' not found on {url}")
+        return html
+
+    def fetch(self, url, timeout):
+        with metrics.timer("navigate"):
+            try:
+                response = self.session.get(url, timeout=timeout)
+            except requests.RequestException as e:
+                raise FetchError(f"Request failed for {url}: {e}") from e
+        # The table is in the server-rendered HTML: "waiting" for it is checking the response
+        with metrics.timer("wait_table"):
+            return self._handle_response(url, response)
+
+    @property
+    def form_state(self):
+        """
+        Hidden ASP.NET form fields of the last page loaded, parsed on demand.
+
+        Only the last page is kept, and its fields are only extracted when a postback
+        needs them, so crawling costs neither a second parse per page nor the memory
+        of every page's __VIEWSTATE.
+
+        Returns:
+            dict: URL -> {field name: value}, empty before the first page is loaded.
+        """
+        if self._last_page is None:
+            return {}
+        url, html = self._last_page
+        return {url: extract_hidden_fields(html)}
+
+    def post_back(self, url, event_target, event_argument="", timeout=10, extra_fields=None):
+        """
+        Replay an ASP.NET postback against a page, fetching it first unless it is the last page loaded.
+
+        Args:
+            url (str): URL of the page whose form is posted back.
+            event_target (str): Value for __EVENTTARGET, i.e. the control that raised the event.
+            event_argument (str): Value for __EVENTARGUMENT.
+            timeout (float): Seconds to wait for the response.
+            extra_fields (dict, optional): Additional form fields to send.
+
+        Returns:
+            str: Raw HTML of the resulting page.
+        """
+        if self._last_page is None or self._last_page[0] != url:
+            self.fetch(url, timeout)
+        form = self.form_state[url]
+        form["__EVENTTARGET"] = event_target
+        form["__EVENTARGUMENT"] = event_argument
+        form.update(extra_fields or {})
+        try:
+            response = self.session.post(url, data=form, timeout=timeout)
+        except requests.RequestException as e:
+            raise FetchError(f"Postback failed for {url}: {e}") from e
+        return self._handle_response(url, response)
+
+    def close(self):
+        self.session.close()
+        logger.info("HTTP session closed.")
+
+
+def create_fetcher(backend=FETCH_BACKEND):
+    """
+    Create the fetch backend configured in .env.
+
+    Args:
+        backend (str): "http" for the browserless backend, "selenium" for headless Chrome
+            (supervised, so the browser is restarted before it degrades).
+
+    Returns:
+        Fetcher: The initialized fetch backend.
+    """
+    if backend == "http":
+        logger.info("Using HTTP fetch backend.")
+        return HttpFetcher()
+    if backend == "selenium":
+        from modules.utils import initialize_driver
+        from modules.supervisor import SupervisedFetcher
+        logger.info("Using Selenium fetch backend.")
+        return SupervisedFetcher(lambda: SeleniumFetcher(initialize_driver()))
+    raise ValueError(f"Unknown fetch backend: {backend}")
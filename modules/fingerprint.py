@@ -0,0 +1,214 @@
+# modules/fingerprint.py
+
+import hashlib
+import re
+import threading
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, String, Text, DateTime, select, delete, insert, update, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from config.settings import TABLE_ID, SEASON, FINGERPRINT_LEVELS, logger
+from modules import metrics
+
+metadata = MetaData()
+
+# One row per saved page: the digest of its data table when its rows were last written.
+# The writer updates it in the transaction that writes the page's rows.
+page_fingerprints = Table(
+    "page_fingerprints", metadata,
+    Column("season", Text, primary_key=True),
+    Column("level", String(16), primary_key=True),
+    Column("url", Text, primary_key=True),
+    Column("digest", String(32), nullable=False),
+    Column("updated_at", DateTime),
+)
+
+# Key of the digest in the DataFrame.attrs of a parsed page, read by the writer
+DIGEST_ATTR = "content_digest"
+
+_TABLE_TAG = re.compile(r"<(/?)table\b[^>]*>", re.IGNORECASE)
+
+
+class _Unchanged:
+    """Result of scraping a page whose table is the same as when it was last saved."""
+
+    def __repr__(self):
+        return "UNCHANGED"
+
+
+UNCHANGED = _Unchanged()
+
+
+def table_digest(html, table_id=TABLE_ID):
+    """
+    Digest of a page's data table, without parsing the page.
+
+    The digest covers the markup of the table with the given id (rows, cell text and links),
+    with runs of whitespace collapsed, so it changes exactly when the table's rows can change,
+    and not with the rest of the page (ASP.NET view state, timestamps, ...).
+
+    Args:
+        html (str): Page HTML.
+        table_id (str): The id attribute of the data table.
+
+    Returns:
+        str | None: Hex digest, or None if the table isn't found.
+    """
+    start = re.search(r"""<table\b[^>]*\bid\s*=\s*["']?%s["'\s>/]""" % re.escape(table_id), html, re.IGNORECASE)
+    if start is None:
+        return None
+    depth = 0
+    for tag in _TABLE_TAG.finditer(html, start.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            fragment = " ".join(html[start.start():tag.end()].split())
+            return hashlib.blake2b(fragment.encode("utf-8"), digest_size=16).hexdigest()
+    return None
+
+
+def ensure_table(engine):
+    """Create the page_fingerprints table if it doesn't exist."""
+    metadata.create_all(engine, tables=[page_fingerprints])
+
+
+def load(conn, level, season=SEASON):
+    """
+    Load the digests of one level's saved pages.
+
+    Returns:
+        dict: Page URL -> digest.
+    """
+    if not inspect(conn).has_table("page_fingerprints"):
+        return {}
+    c = page_fingerprints.c
+    rows = conn.execute(select(c.url, c.digest).where(c.season == season, c.level == level))
+    return dict(rows.all())
+
+
+def saved_urls(conn, level, urls, season=SEASON):
+    """The URLs among `urls` of pages whose rows were saved before (they have a digest)."""
+    if not urls:
+        return set()
+    c = page_fingerprints.c
+    rows = conn.execute(select(c.url).where(c.season == season, c.level == level, c.url.in_(list(urls))))
+    return {url for url, in rows}
+
+
+def save(conn, level, digests, season=SEASON):
+    """
+    Store the digests of freshly written pages.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection inside the writer's transaction.
+        level (str): "districts", "blocks" or "panchayats".
+        digests (dict): Page URL -> digest.
+        season (str): Season the pages were crawled for.
+    """
+    if not digests:
+        return
+    now = datetime.utcnow()
+    rows = [{"season": season, "level": level, "url": url, "digest": digest, "updated_at": now}
+            for url, digest in digests.items()]
+    if conn.dialect.name in ("postgresql", "sqlite"):
+        dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(page_fingerprints)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["season", "level", "url"],
+            set_={"digest": stmt.excluded.digest, "updated_at": stmt.excluded.updated_at},
+        )
+        conn.execute(stmt, rows)
+        return
+    c = page_fingerprints.c
+    conn.execute(delete(page_fingerprints).where(c.season == season, c.level == level, c.url.in_(list(digests))))
+    conn.execute(insert(page_fingerprints), rows)
+
+
+def invalidate(engine, level=None, season=None):
+    """
+    Invalidate saved digests, e.g. after a parser fix, so the pages are parsed again when
+    next crawled. The pages stay known as saved, so their new rows replace the old ones.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine.
+        level (str, optional): Only invalidate this level's pages.
+        season (str, optional): Only invalidate this season's pages.
+
+    Returns:
+        int: Number of digests invalidated.
+    """
+    if not inspect(engine).has_table("page_fingerprints"):
+        return 0
+    c = page_fingerprints.c
+    stmt = update(page_fingerprints).values(digest="", updated_at=datetime.utcnow())
+    if level is not None:
+        stmt = stmt.where(c.level == level)
+    if season is not None:
+        stmt = stmt.where(c.season == season)
+    with engine.begin() as conn:
+        return conn.execute(stmt).rowcount
+
+
+class PageFingerprints:
+    """
+    The digests of one season's saved pages, checked before a fetched page is parsed.
+
+    Each level's digests are loaded on first use. A page whose table digest matches the
+    saved one is neither parsed, coerced nor written: the scrapers return UNCHANGED and the
+    writer only marks its task done. Safe to use from several worker threads.
+    """
+
+    def __init__(self, engine, season=SEASON, levels=FINGERPRINT_LEVELS):
+        """
+        Args:
+            engine (sqlalchemy.engine.Engine): Database engine.
+            season (str): Season whose pages are checked.
+            levels (iterable): Levels whose pages are checked, e.g. ["blocks", "panchayats"].
+        """
+        self.engine = engine
+        self.season = season
+        self.levels = set(levels)
+        self.skipped = 0
+        self._digests = {}   # level -> {url: digest}
+        self._lock = threading.Lock()
+
+    def _saved(self, level):
+        with self._lock:
+            if level not in self._digests:
+                with self.engine.connect() as conn:
+                    self._digests[level] = load(conn, level, self.season)
+            return self._digests[level]
+
+    def check(self, level, url, html):
+        """
+        Digest a fetched page and compare it with the digest saved for its URL.
+
+        Args:
+            level (str): Level of the page.
+            url (str): URL of the page.
+            html (str): Page HTML.
+
+        Returns:
+            tuple[str | None, bool]: The page's digest (None for levels that aren't checked or
+                pages without the data table), and whether it matches the saved digest.
+        """
+        if level not in self.levels:
+            return None, False
+        with metrics.timer("fingerprint"):
+            digest = table_digest(html)
+        if digest is None or self._saved(level).get(url) != digest:
+            return digest, False
+        with self._lock:
+            self.skipped += 1
+        metrics.pages_unchanged_total.inc(**metrics.current_labels())
+        logger.info("The %s table of %s is unchanged since it was last saved, skipping it", level, url)
+        return digest, True
+
+
+if __name__ == "__main__":
+    import argparse
+    from modules.db import get_engine
+
+    parser = argparse.ArgumentParser(description="Invalidate page fingerprints, so pages are parsed and saved again.")
+    parser.add_argument("--level", help="Only invalidate the pages of this level.")
+    parser.add_argument("--season", help="Only invalidate the pages of this season.")
+    args = parser.parse_args()
+    logger.info("Invalidated %d page fingerprints.", invalidate(get_engine(), level=args.level, season=args.season))
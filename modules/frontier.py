@@ -0,0 +1,304 @@
+# modules/frontier.py
+
+from datetime import datetime, timedelta
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Text, DateTime, UniqueConstraint, Index,
+    select, update, insert, case, func, or_, and_, inspect, text
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from config.settings import FRONTIER_BATCH_SIZE, FRONTIER_LEASE_SECONDS, FRONTIER_MAX_ATTEMPTS, SEASON, logger
+from modules import schema
+
+metadata = MetaData()
+
+# One row per page still to crawl (or already crawled) below the states page.
+# A task of level "districts" is the districts page of one state, "blocks" the
+# blocks page of one district and "panchayats" the panchayats page of one block.
+# Every season has its own tasks, even for a page listed by several seasons.
+crawl_tasks = Table(
+    "crawl_tasks", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("season", Text, nullable=False),
+    Column("level", String(16), nullable=False),
+    Column("state", Text),
+    Column("district", Text),
+    Column("block", Text),
+    Column("url", Text, nullable=False),
+    Column("status", String(16), nullable=False, default="pending"),  # pending, leased, done, failed
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("last_error", Text),
+    Column("lease_expires", DateTime),
+    Column("updated_at", DateTime),
+    UniqueConstraint("season", "level", "url", name="uq_crawl_tasks_season_level_url"),
+    Index("ix_crawl_tasks_claim", "season", "level", "status", "lease_expires"),
+)
+
+# Parent name columns carried by each level's tasks, and the table the level's rows are saved to
+TASK_PARENTS = {
+    "districts": ["States/UT's"],
+    "blocks": ["States/UT's", "District"],
+    "panchayats": ["States/UT's", "District", "Block"],
+}
+PARENT_TABLES = {"districts": "states", "blocks": "districts", "panchayats": "blocks"}
+CHILD_LEVELS = {"states": "districts", "districts": "blocks", "blocks": "panchayats"}
+_TASK_COLUMNS = ["state", "district", "block"]
+
+
+def ensure_table(engine):
+    """Create the crawl_tasks table and its indexes if they don't exist."""
+    metadata.create_all(engine, tables=[crawl_tasks])
+
+
+def _insert(conn):
+    """Dialect-specific INSERT supporting ON CONFLICT DO NOTHING."""
+    if conn.dialect.name == "postgresql":
+        return postgresql.insert(crawl_tasks)
+    if conn.dialect.name == "sqlite":
+        return sqlite.insert(crawl_tasks)
+    return insert(crawl_tasks)
+
+
+def _row_to_task(level, row):
+    """Convert a crawl_tasks row to the (parents..., url) tuple used by the scrapers."""
+    parents = [getattr(row, column) for column in _TASK_COLUMNS[:len(TASK_PARENTS[level])]]
+    return tuple(parents) + (row.url,)
+
+
+def child_tasks(level, table):
+    """
+    Build the tasks of the next level from a freshly scraped table.
+
+    Args:
+        level (str): Level of the scraped table: "states", "districts" or "blocks".
+        table (pd.DataFrame): The scraped table, with its parent and 'URL' columns.
+
+    Returns:
+        tuple[str, list]: The child level and its task tuples (parents..., url).
+    """
+    child = CHILD_LEVELS.get(level)
+    if child is None or table.empty or 'URL' not in table.columns:
+        return child, []
+    columns = TASK_PARENTS[child] + ['URL']
+    return child, list(table[columns].dropna().itertuples(index=False, name=None))
+
+
+def enqueue(conn, level, tasks, season=SEASON):
+    """
+    Add tasks to the frontier, ignoring URLs that are already queued for the level.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection (inside the caller's transaction).
+        level (str): "districts", "blocks" or "panchayats".
+        tasks (list): Task tuples of parent names followed by the page URL.
+        season (str): Season the tasks belong to.
+    """
+    if not tasks:
+        return
+    now = datetime.utcnow()
+    rows = []
+    for task in tasks:
+        *parents, url = task
+        row = dict.fromkeys(_TASK_COLUMNS)
+        row.update(zip(_TASK_COLUMNS, parents))
+        row.update(season=season, level=level, url=url, status="pending", attempts=0, updated_at=now)
+        rows.append(row)
+    stmt = _insert(conn)
+    if hasattr(stmt, "on_conflict_do_nothing"):
+        stmt = stmt.on_conflict_do_nothing(index_elements=["season", "level", "url"])
+    conn.execute(stmt, rows)
+
+
+def requeue(conn, level, urls, season=SEASON):
+    """
+    Put already crawled tasks back in the frontier with a fresh retry budget.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection (inside the caller's transaction).
+        level (str): "districts", "blocks" or "panchayats".
+        urls (list): URLs of the tasks to crawl again.
+        season (str): Season the tasks belong to.
+    """
+    if not urls:
+        return
+    c = crawl_tasks.c
+    conn.execute(
+        update(crawl_tasks)
+        .where(c.season == season, c.level == level, c.url.in_(list(urls)))
+        .values(status="pending", attempts=0, last_error=None, lease_expires=None, updated_at=datetime.utcnow())
+    )
+
+
+def requeue_level(engine, level, season=SEASON):
+    """
+    Put every finished (done or failed) task of a season's level back in the frontier,
+    so a refresh crawls all of its pages again.
+
+    Returns:
+        int: Number of tasks requeued.
+    """
+    c = crawl_tasks.c
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(crawl_tasks)
+            .where(c.season == season, c.level == level, c.status.in_(["done", "failed"]))
+            .values(status="pending", attempts=0, last_error=None, lease_expires=None, updated_at=datetime.utcnow())
+        )
+    return result.rowcount
+
+
+def seed_from_parent(engine, level, season=SEASON):
+    """
+    Seed an empty frontier level from its parent table, e.g. for a database crawled
+    before the frontier existed.
+
+    This runs the parent/child anti-join once; pages whose rows are already saved are
+    marked done, the rest pending. Later runs find the level populated and skip it.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine.
+        level (str): "districts", "blocks" or "panchayats".
+        season (str): Season whose parent rows are seeded from.
+
+    Returns:
+        int: Number of tasks seeded.
+    """
+    parent_table = PARENT_TABLES[level]
+    c = crawl_tasks.c
+    with engine.begin() as conn:
+        if conn.execute(select(c.id).where(c.season == season, c.level == level).limit(1)).first():
+            return 0
+        inspector = inspect(conn)
+        if not inspector.has_table(parent_table):
+            return 0
+        quote = conn.dialect.identifier_preparer.quote
+        parents = TASK_PARENTS[level]
+        select_parents = ", ".join(f"p.{quote(column)}" for column in parents)
+        select_parents += ", NULL" * (len(_TASK_COLUMNS) - len(parents))
+        if level == "panchayats" and inspector.has_table("crawl_progress"):
+            # The rollup answers "does this block have rows" without probing the panchayats table
+            status = "CASE WHEN EXISTS (SELECT 1 FROM crawl_progress r WHERE r.block_id = p.id AND r.scraped_wells > 0) THEN 'done' ELSE 'pending' END"
+        elif inspector.has_table(level):
+            foreign_key = schema.LEVEL_KEYS[level][0]
+            status = f"CASE WHEN EXISTS (SELECT 1 FROM {quote(level)} c WHERE c.{quote(foreign_key)} = p.id) THEN 'done' ELSE 'pending' END"
+        else:
+            status = "'pending'"
+        result = conn.execute(text(
+            f"INSERT INTO crawl_tasks (season, level, state, district, block, url, status, attempts, updated_at) "
+            f"SELECT :season, :level, {select_parents}, p.{quote('URL')}, {status}, 0, :now "
+            f"FROM {quote(schema.flat_source(parent_table))} p "
+            f"WHERE p.{quote(schema.SEASON_COLUMN)} = :season AND p.{quote('URL')} IS NOT NULL "
+            f"ON CONFLICT (season, level, url) DO NOTHING"
+        ), {"season": season, "level": level, "now": datetime.utcnow()})
+    logger.info("Seeded %d %s tasks of season %s from the %s table.", result.rowcount, level, season, parent_table)
+    return result.rowcount
+
+
+def claim(engine, level, batch_size=FRONTIER_BATCH_SIZE, lease_seconds=FRONTIER_LEASE_SECONDS, season=SEASON):
+    """
+    Lease a batch of outstanding tasks of one level to this worker.
+
+    Pending tasks and tasks whose lease has expired are claimable. The rows are
+    locked with FOR UPDATE SKIP LOCKED, so concurrent workers, in this process or
+    any other, never claim the same task. An expired lease of a task that has used
+    FRONTIER_MAX_ATTEMPTS (its worker died on the last attempt) fails the task.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine.
+        level (str): "districts", "blocks" or "panchayats".
+        batch_size (int): Maximum number of tasks to claim.
+        lease_seconds (int): Seconds before an unfinished task may be claimed again.
+        season (str): Season to claim tasks of.
+
+    Returns:
+        list: Task tuples of parent names followed by the page URL.
+    """
+    now = datetime.utcnow()
+    c = crawl_tasks.c
+    with engine.begin() as conn:
+        conn.execute(
+            update(crawl_tasks)
+            .where(c.season == season, c.level == level, c.status == "leased", c.lease_expires < now)
+            .where(c.attempts >= FRONTIER_MAX_ATTEMPTS)
+            .values(status="failed", lease_expires=None, updated_at=now,
+                    last_error=f"Lease expired on the last of {FRONTIER_MAX_ATTEMPTS} attempts")
+        )
+        ids = conn.execute(
+            select(c.id)
+            .where(c.season == season, c.level == level)
+            .where(c.attempts < FRONTIER_MAX_ATTEMPTS)
+            .where(or_(c.status == "pending", and_(c.status == "leased", c.lease_expires < now)))
+            .order_by(c.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            return []
+        rows = conn.execute(
+            update(crawl_tasks)
+            .where(c.id.in_(ids))
+            .values(status="leased", attempts=c.attempts + 1,
+                    lease_expires=now + timedelta(seconds=lease_seconds), updated_at=now)
+            .returning(c.state, c.district, c.block, c.url)
+        ).all()
+    return [_row_to_task(level, row) for row in rows]
+
+
+def complete(conn, level, urls, season=SEASON):
+    """Mark tasks done; call it in the same transaction that saves the tasks' rows."""
+    if not urls:
+        return
+    c = crawl_tasks.c
+    conn.execute(
+        update(crawl_tasks)
+        .where(c.season == season, c.level == level, c.url.in_(list(urls)))
+        .values(status="done", lease_expires=None, last_error=None, updated_at=datetime.utcnow())
+    )
+
+
+def fail(engine, level, url, error, season=SEASON):
+    """
+    Record a failed attempt; the task is retried until it has used FRONTIER_MAX_ATTEMPTS.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine.
+        level (str): Level of the task.
+        url (str): URL of the task.
+        error (str): Description of the failure.
+        season (str): Season of the task.
+    """
+    c = crawl_tasks.c
+    with engine.begin() as conn:
+        conn.execute(
+            update(crawl_tasks)
+            .where(c.season == season, c.level == level, c.url == url)
+            .values(status=case((c.attempts >= FRONTIER_MAX_ATTEMPTS, "failed"), else_="pending"),
+                    last_error=str(error)[:1000], lease_expires=None, updated_at=datetime.utcnow())
+        )
+
+
+def outstanding(engine, level, season=SEASON):
+    """Number of tasks of a season's level that are not done or permanently failed."""
+    c = crawl_tasks.c
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(crawl_tasks)
+            .where(c.season == season, c.level == level, c.status.in_(["pending", "leased"]))
+        ).scalar()
+
+
+def status_counts(engine):
+    """
+    Number of tasks per level and status over every season.
+
+    Returns:
+        dict: level -> {status: count}, e.g. {"blocks": {"done": 120, "pending": 30}}.
+    """
+    c = crawl_tasks.c
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(c.level, c.status, func.count()).group_by(c.level, c.status)
+        ).all()
+    counts = {}
+    for level, status, count in rows:
+        counts.setdefault(level, {})[status] = count
+    return counts
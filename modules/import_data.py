@@ -1,10 +1,8 @@
 import pandas as pd
-from sqlalchemy import create_engine
-from config.settings import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+from modules.db import get_engine
 
-# Database connection
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
+# Database connection (shared pool)
+engine = get_engine()
 
 # Load Excel file
 excel_file = '../data/jaldoot-remote-20241203-000700.xlsx'
@@ -0,0 +1,122 @@
+# modules/incremental.py
+
+import pandas as pd
+from sqlalchemy import inspect, text
+from config.settings import logger
+from modules.schema import LEVEL_KEYS
+
+# Name column of each level's rows
+NAME_COLUMNS = {"states": "States/UT's", "districts": "District", "blocks": "Block"}
+
+
+def count_columns(previous, current):
+    """The aggregate count columns ("No. of Well Covered", ...) present in both tables."""
+    return [column for column in current.columns if column.startswith("No. of") and column in previous.columns]
+
+
+def changed_rows(level, previous, current):
+    """
+    Find the rows of a freshly scraped table whose aggregate counts differ from the previous snapshot.
+
+    Rows are matched on the level's name column; rows that are new since the previous
+    snapshot count as changed. Counts are compared numerically, so '12' and 12.0 match.
+
+    Args:
+        level (str): "states", "districts" or "blocks".
+        previous (pd.DataFrame): Rows saved by the previous crawl of the same page.
+        current (pd.DataFrame): Rows just scraped.
+
+    Returns:
+        pd.DataFrame: The rows of `current` that changed.
+    """
+    name = NAME_COLUMNS[level]
+    if previous.empty or name not in previous.columns:
+        return current
+    counts = count_columns(previous, current)
+    merged = current[[name] + counts].merge(
+        previous[[name] + counts].drop_duplicates(subset=[name]), on=name, how="left", suffixes=("", "_previous"),
+        indicator=True
+    )
+    changed = merged["_merge"] == "left_only"
+    for column in counts:
+        now = pd.to_numeric(merged[column], errors="coerce").fillna(-1)
+        before = pd.to_numeric(merged[f"{column}_previous"], errors="coerce").fillna(-1)
+        changed |= now != before
+    changed.index = current.index
+    removed = set(previous[name]) - set(current[name])
+    if removed:
+        logger.warning("%d %s no longer listed: %s", len(removed), level, sorted(removed)[:10])
+    return current[changed]
+
+
+def load_previous(conn, level, parent_id=None):
+    """
+    Load the rows previously saved for one page.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Database connection.
+        level (str): Table to read: "states", "districts", "blocks" or "panchayats".
+        parent_id (int | str, optional): Id of the page's parent row, or the season of the states
+            page; None reads every row.
+
+    Returns:
+        pd.DataFrame: The saved rows, empty if the table doesn't exist yet.
+    """
+    if not inspect(conn).has_table(level):
+        return pd.DataFrame()
+    where, params = _page_filter(conn, level, parent_id)
+    return pd.read_sql(text(f"SELECT * FROM {conn.dialect.identifier_preparer.quote(level)}{where}"), conn, params=params)
+
+
+def delete_previous(conn, level, parent_id=None):
+    """Delete the rows previously saved for one page, so a re-crawl replaces them instead of duplicating them."""
+    if not inspect(conn).has_table(level):
+        return 0
+    where, params = _page_filter(conn, level, parent_id)
+    result = conn.execute(text(f"DELETE FROM {conn.dialect.identifier_preparer.quote(level)}{where}"), params)
+    return result.rowcount
+
+
+def update_previous(conn, level, previous, rows):
+    """
+    Update the saved rows of one page in place from a re-crawl, keeping their ids so the
+    child rows referencing them stay valid.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection inside the caller's transaction.
+        level (str): "states", "districts" or "blocks".
+        previous (pd.DataFrame): Rows loaded with load_previous().
+        rows (pd.DataFrame): The re-crawled rows, in storage layout.
+
+    Returns:
+        pd.DataFrame: The re-crawled rows that are new and still have to be inserted.
+    """
+    name = NAME_COLUMNS[level]
+    if previous.empty:
+        return rows
+    ids = dict(zip(previous[name], previous["id"]))
+    existing = rows[rows[name].isin(ids)]
+    columns = [column for column in rows.columns if column in previous.columns and column != "id"]
+    if not existing.empty and columns:
+        quote = conn.dialect.identifier_preparer.quote
+        assignments = ", ".join(f"{quote(column)} = :v{i}" for i, column in enumerate(columns))
+        params = [
+            {**{f"v{i}": _db_value(value) for i, value in enumerate(values)}, "row_id": int(ids[values[columns.index(name)]])}
+            for values in existing[columns].itertuples(index=False, name=None)
+        ]
+        conn.execute(text(f"UPDATE {quote(level)} SET {assignments} WHERE id = :row_id"), params)
+    return rows[~rows[name].isin(ids)]
+
+
+def _db_value(value):
+    # NaN becomes NULL, numpy scalars become Python values the DBAPI can bind
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _page_filter(conn, level, parent_id):
+    foreign_key = LEVEL_KEYS[level][0]
+    if foreign_key is None or parent_id is None:
+        return "", {}
+    return f" WHERE {conn.dialect.identifier_preparer.quote(foreign_key)} = :parent_id", {"parent_id": parent_id}
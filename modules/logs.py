@@ -0,0 +1,186 @@
+# modules/logs.py
+
+import json
+import re
+import threading
+from pathlib import Path
+from config.settings import LOG_FILE, logger
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+# Log lines look like "<time> - <module> - <logger> - <LEVEL> - <message>"
+_LEVEL = re.compile(rb" - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ")
+INDEX_CHUNK_BYTES = 256 * 1024
+_READ_BYTES = 64 * 1024
+
+
+def log_files(path=LOG_FILE):
+    """
+    The current log file followed by its gzip-compressed archives, newest first.
+
+    Args:
+        path (Path): The current log file.
+
+    Returns:
+        list[Path]: Existing files.
+    """
+    path = Path(path)
+    # Newest first; numbered archives rotated within the same second keep their number order
+    archives = sorted(
+        path.parent.glob(f"{path.name}.*.gz"),
+        key=lambda archive: (-archive.stat().st_mtime, len(archive.name), archive.name),
+    )
+    return ([path] if path.exists() else []) + archives
+
+
+class LogIndex:
+    """
+    Byte-offset index of the current log file.
+
+    The file is split into chunks of about INDEX_CHUNK_BYTES ending on line boundaries;
+    each chunk records its byte range, line count and the levels logged in it. update()
+    only reads the bytes appended since the last call, and the index is saved next to
+    the log (jaldoot.log.idx) so it survives dashboard restarts. It starts over when
+    the file is rotated.
+    """
+
+    def __init__(self, path=LOG_FILE, chunk_bytes=INDEX_CHUNK_BYTES):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.chunk_bytes = chunk_bytes
+        self.chunks = []  # [offset, end, lines, levels]
+        self._file_id = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            saved = json.loads(self.index_path.read_text())
+            self._file_id, self.chunks = saved["file_id"], saved["chunks"]
+        except (OSError, ValueError, KeyError):
+            self._file_id, self.chunks = None, []
+
+    def _save(self):
+        tmp = self.index_path.with_suffix(".idx.tmp")
+        tmp.write_text(json.dumps({"file_id": self._file_id, "chunks": self.chunks}))
+        tmp.replace(self.index_path)
+
+    @property
+    def indexed_bytes(self):
+        return self.chunks[-1][1] if self.chunks else 0
+
+    def update(self):
+        """
+        Index the lines appended since the last update.
+
+        Returns:
+            int: Size of the log file in bytes (0 if it doesn't exist).
+        """
+        with self._lock:
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                return 0
+            # Rotation replaces the file: a new inode, or a file shorter than what was indexed
+            file_id = [stat.st_dev, stat.st_ino]
+            if file_id != self._file_id or stat.st_size < self.indexed_bytes:
+                self._file_id, self.chunks = file_id, []
+            start = self.indexed_bytes
+            added = False
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                while start < stat.st_size:
+                    block = f.read(min(self.chunk_bytes, stat.st_size - start))
+                    cut = block.rfind(b"\n")
+                    if cut < 0:
+                        if len(block) < self.chunk_bytes:
+                            break  # the last line is still being written
+                        cut = len(block) - 1
+                    block = block[:cut + 1]
+                    levels = sorted({level.decode() for level in _LEVEL.findall(block)}, key=LEVELS.index)
+                    self.chunks.append([start, start + len(block), block.count(b"\n"), levels])
+                    start += len(block)
+                    f.seek(start)
+                    added = True
+            if added:
+                try:
+                    self._save()
+                except OSError as e:
+                    logger.warning(f"Could not save the log index: {e}")
+            return stat.st_size
+
+    def ranges(self, min_level=None):
+        """Byte ranges of the indexed chunks with a line at min_level or above, oldest first."""
+        if min_level is None:
+            return [(offset, end) for offset, end, _, _ in self.chunks]
+        wanted = set(LEVELS[LEVELS.index(min_level):])
+        return [(offset, end) for offset, end, _, levels in self.chunks if wanted.intersection(levels)]
+
+
+def _lines_reversed(f, start, end):
+    """Lines of f between two line-boundary offsets, last line first, read in small blocks."""
+    position, carry = end, b""
+    while position > start:
+        size = min(_READ_BYTES, position - start)
+        position -= size
+        f.seek(position)
+        parts = (f.read(size) + carry).split(b"\n")
+        carry = parts[0]
+        yield from reversed(parts[1:])
+    if carry:
+        yield carry
+
+
+def _merge(ranges):
+    merged = []
+    for offset, end in ranges:
+        if merged and merged[-1][1] == offset:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((offset, end))
+    return merged
+
+
+def tail(path=LOG_FILE, lines=200, min_level=None, contains=None, index=None):
+    """
+    The last lines of the log, optionally filtered, read backwards from the end of the file.
+
+    Only the blocks needed to fill the requested lines are read. With a level filter, the
+    chunks of the index without a matching level are skipped entirely.
+
+    Args:
+        path (Path): Log file.
+        lines (int): Maximum number of lines returned.
+        min_level (str, optional): Keep lines at this level or above, e.g. "WARNING".
+        contains (str, optional): Keep lines containing this text, case-insensitive, e.g. a state name.
+        index (LogIndex, optional): Index of the file, updated before reading.
+
+    Returns:
+        list[str]: Matching lines, oldest first.
+    """
+    path = Path(path)
+    if index is not None:
+        size = index.update()
+        ranges = index.ranges(min_level) + [(index.indexed_bytes, size)]
+    else:
+        size = path.stat().st_size if path.exists() else 0
+        ranges = [(0, size)]
+    wanted = set(LEVELS[LEVELS.index(min_level):]) if min_level else None
+    needle = contains.lower().encode() if contains else None
+    found = []
+    if not size:
+        return found
+    with open(path, "rb") as f:
+        for start, end in reversed(_merge(ranges)):
+            for line in _lines_reversed(f, start, min(end, size)):
+                if not line.strip():
+                    continue
+                if wanted is not None:
+                    level = _LEVEL.search(line)
+                    if level is None or level.group(1).decode() not in wanted:
+                        continue
+                if needle is not None and needle not in line.lower():
+                    continue
+                found.append(line.decode("utf-8", errors="replace"))
+                if len(found) >= lines:
+                    return found[::-1]
+    return found[::-1]
@@ -0,0 +1,250 @@
+# modules/metrics.py
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import METRICS_HOST, METRICS_PORT, logger
+
+# Seconds; page loads on the NIC site range from tens of milliseconds to the fetch timeouts
+TIME_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+ROW_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def total(self):
+        """Sum over every label combination."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, (), value) for key, value in self._values.items()]
+
+    def snapshot(self):
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, key)), "value": value} for key, value in self._values.items()]
+
+
+class Histogram:
+    """Observations counted in cumulative buckets per label combination, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=TIME_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def count(self, **labels):
+        values = self._values.get(self._key(labels))
+        return values[2] if values else 0
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                for bound, bucket_count in zip(self.buckets, counts):
+                    samples.append((f"{self.name}_bucket", key, (("le", repr(float(bound))),), bucket_count))
+                samples.append((f"{self.name}_bucket", key, (("le", "+Inf"),), count))
+                samples.append((f"{self.name}_sum", key, (), total))
+                samples.append((f"{self.name}_count", key, (), count))
+        return samples
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {"labels": dict(zip(self.labelnames, key)), "count": count, "sum": round(total, 6),
+                 "buckets": dict(zip(map(str, self.buckets), counts))}
+                for key, (counts, total, count) in self._values.items()
+            ]
+
+
+class Registry:
+    """The metrics of the process, rendered in the Prometheus text format or as JSON."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, extra, value in metric.samples():
+                lines.append(f"{name}{_format_labels(metric.labelnames, key, extra)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        return {"timestamp": time.time(), "metrics": {metric.name: metric.snapshot() for metric in self.metrics}}
+
+
+registry = Registry()
+
+# Where the time of a page goes: navigate (request or page load), wait_table (until the data
+# table is present), fingerprint (digest of the table), parse (table extraction) and persist
+# (database write of a batch)
+stage_seconds = registry.register(Histogram(
+    "jaldoot_stage_seconds", "Time spent per crawl stage.", ["level", "state", "stage"]
+))
+rows_per_page = registry.register(Histogram(
+    "jaldoot_rows_per_page", "Table rows parsed from one page.", ["level", "state"], buckets=ROW_BUCKETS
+))
+pages_total = registry.register(Counter(
+    "jaldoot_pages_total", "Pages loaded, from the network, the page cache or another season (shared).", ["level", "state", "source"]
+))
+pages_unchanged_total = registry.register(Counter(
+    "jaldoot_pages_unchanged_total", "Pages skipped because their table is unchanged since it was last saved.", ["level", "state"]
+))
+retries_total = registry.register(Counter(
+    "jaldoot_retries_total", "Page loads retried after an error.", ["level", "state"]
+))
+failures_total = registry.register(Counter(
+    "jaldoot_failures_total", "Failed page loads, parses and batch writes.", ["level", "state", "stage"]
+))
+rows_written_total = registry.register(Counter(
+    "jaldoot_rows_written_total", "Rows written to the database.", ["level"]
+))
+
+# Level and state of the page being crawled by the current thread or asyncio task, so the
+# fetch backends can time their stages without knowing what they fetch
+_labels = contextvars.ContextVar("metrics_labels", default={"level": "", "state": ""})
+
+
+def set_labels(level, state=""):
+    """Label the metrics recorded from here on in this thread or task with a level and state."""
+    _labels.set({"level": level, "state": state or ""})
+
+
+def current_labels():
+    return dict(_labels.get())
+
+
+@contextmanager
+def timer(stage, **labels):
+    """
+    Time a block as one stage of the current page; an exception counts as a failure of that stage.
+
+    Args:
+        stage (str): "navigate", "wait_table", "parse" or "persist".
+        **labels: Override the current level and state labels.
+    """
+    labels = {**_labels.get(), **labels}
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        failures_total.inc(stage=stage, **labels)
+        raise
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, stage=stage, **labels)
+
+
+def count_retry(retry_state):
+    """tenacity before_sleep hook counting the retries of the current page."""
+    retries_total.inc(**_labels.get())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body, content_type = registry.render().encode(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body, content_type = json.dumps(registry.snapshot()).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("Metrics request: " + format, *args)
+
+
+def start_server(port=METRICS_PORT, host=METRICS_HOST):
+    """
+    Serve the metrics on http://<host>:<port>/metrics (Prometheus text format) and
+    /metrics.json from a daemon thread.
+
+    Args:
+        port (int): Port to listen on; 0 disables the endpoint.
+        host (str): Interface to bind, localhost by default.
+
+    Returns:
+        ThreadingHTTPServer | None: The server, or None if disabled or the port is taken.
+    """
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info("Serving metrics on http://%s:%d/metrics", host, port)
+    return server
+
+
+def log_summary():
+    """Log the count and mean time of every stage per level, e.g. at the end of a run."""
+    totals = {}
+    for sample in stage_seconds.snapshot():
+        key = (sample["labels"]["level"], sample["labels"]["stage"])
+        count, total = totals.get(key, (0, 0.0))
+        totals[key] = (count + sample["count"], total + sample["sum"])
+    for (level, stage), (count, total) in sorted(totals.items()):
+        logger.info("%s %s: %d in %.1fs (mean %.3fs)", level or "-", stage, count, total, total / count if count else 0)
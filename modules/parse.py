@@ -0,0 +1,257 @@
+# modules/parse.py
+
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+import pandas as pd
+from config.settings import logger
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional, the stdlib parser is used without it
+    lxml = None
+
+# How each level's table is laid out: the tag used by the header cells, the column
+# whose anchor holds the child page URL, and the parent columns prepended to every row.
+LEVELS = {
+    "states": {"header_tag": "td", "link_header": "States/UT's", "parents": []},
+    "districts": {"header_tag": "td", "link_header": "District", "parents": ["States/UT's"]},
+    "blocks": {"header_tag": "td", "link_header": "Block", "parents": ["States/UT's", "District"]},
+    "panchayats": {"header_tag": "th", "link_header": None, "parents": []},
+}
+
+
+def _clean_text(text):
+    """Collapse whitespace the way a browser renders cell text."""
+    return " ".join(text.split())
+
+
+class _TableParser(HTMLParser):
+    """
+    Collect the rows of the table with a given id from raw HTML.
+
+    Each row is stored as a dict with the row's CSS classes and a list of cells,
+    where every cell holds its tag, rendered text and first anchor href.
+    Tables nested inside the target table are ignored.
+    """
+
+    def __init__(self, table_id):
+        super().__init__(convert_charrefs=True)
+        self.table_id = table_id
+        self.depth = 0          # nesting depth of <table> tags inside the target table
+        self.found = False
+        self.rows = []
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "table":
+            if self.depth:
+                self.depth += 1
+            elif attrs.get("id") == self.table_id:
+                self.depth = 1
+                self.found = True
+            return
+        if self.depth != 1:
+            return
+        if tag == "tr":
+            self._row = {"classes": (attrs.get("class") or "").split(), "cells": []}
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = {"tag": tag, "text": [], "href": None}
+        elif tag == "a" and self._cell is not None and self._cell["href"] is None:
+            self._cell["href"] = attrs.get("href")
+        elif tag == "br" and self._cell is not None:
+            self._cell["text"].append(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self.depth:
+            self.depth -= 1
+            return
+        if self.depth != 1:
+            return
+        if tag in ("td", "th") and self._cell is not None:
+            self._cell["text"] = _clean_text("".join(self._cell["text"]))
+            self._row["cells"].append(self._cell)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self.depth == 1 and self._cell is not None:
+            self._cell["text"].append(data)
+
+
+class _HiddenInputParser(HTMLParser):
+    """Collect the name/value pairs of every hidden <input> on a page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "input" and (attrs.get("type") or "").lower() == "hidden" and attrs.get("name"):
+            self.fields[attrs["name"]] = attrs.get("value") or ""
+
+
+def _build_rows(headers, data_rows, page_url, link_header):
+    """
+    Turn (text, href) cell lists into column names and row value lists.
+
+    Rows with fewer cells than headers are padded with None, and the 'URL' column
+    is placed right after the link column, so that the result matches the frames
+    the scraper has always produced.
+    """
+    link_index = headers.index(link_header) if link_header in headers else None
+    columns = list(headers)
+    if link_index is not None:
+        columns.insert(link_index + 1, 'URL')
+    width = len(headers)
+
+    rows = []
+    missing_links = 0
+    for cells in data_rows:
+        if not cells:
+            continue
+        values = [text for text, _ in cells[:width]]
+        if len(values) < width:
+            values.extend([None] * (width - len(values)))
+        if link_index is not None:
+            href = cells[link_index][1] if link_index < len(cells) else None
+            if href:
+                values.insert(link_index + 1, urljoin(page_url, href))
+            else:
+                missing_links += 1
+                values.insert(link_index + 1, None)
+        rows.append(values)
+    if missing_links:
+        logger.warning("No URL found for %d rows under %s", missing_links, link_header)
+    return columns, rows
+
+
+def extract_table_rows_stdlib(html, table_id, page_url, header_tag="td", link_header=None):
+    """
+    Extract the header and data rows of a table using the stdlib HTML parser.
+
+    Slower than extract_table_rows_lxml, but needs no third-party dependency.
+
+    Args:
+        html (str): Page HTML.
+        table_id (str): The id attribute of the table to extract.
+        page_url (str): URL the page was loaded from, used to resolve relative hrefs.
+        header_tag (str): Tag used by the cells of the header row ("td" or "th").
+        link_header (str, optional): Header whose cell anchor is stored under 'URL'.
+
+    Returns:
+        tuple[list, list]: The column names and one list of values per data row.
+
+    Raises:
+        ValueError: If the table or its header row cannot be found.
+    """
+    parser = _TableParser(table_id)
+    parser.feed(html)
+    parser.close()
+    if not parser.found:
+        raise ValueError(f"Table '{table_id}' not found in page")
+
+    header_row = next((row for row in parser.rows if "header" in row["classes"]), None)
+    if header_row is None:
+        raise ValueError(f"Header row not found in table '{table_id}'")
+    headers = [cell["text"] for cell in header_row["cells"] if cell["tag"] == header_tag]
+
+    data_rows = [
+        [(cell["text"], cell["href"]) for cell in row["cells"] if cell["tag"] == "td"]
+        for row in parser.rows if row is not header_row
+    ]
+    return _build_rows(headers, data_rows, page_url, link_header)
+
+
+def extract_table_rows_lxml(html, table_id, page_url, header_tag="td", link_header=None):
+    """
+    Extract the header and data rows of a table in a single lxml pass.
+
+    Takes the same arguments and returns the same result as extract_table_rows_stdlib.
+    """
+    doc = lxml.html.fromstring(html)
+    tables = doc.xpath("//table[@id=$table_id]", table_id=table_id)
+    if not tables:
+        raise ValueError(f"Table '{table_id}' not found in page")
+    table = tables[0]
+
+    header_row = None
+    data_rows = []
+    for row in table.xpath("./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr"):
+        if header_row is None and "header" in (row.get("class") or "").split():
+            header_row = row
+            continue
+        cells = []
+        for cell in row.iterchildren("td"):
+            anchor = next(cell.iter("a"), None)
+            cells.append((_clean_text(cell.text_content()), anchor.get("href") if anchor is not None else None))
+        data_rows.append(cells)
+    if header_row is None:
+        raise ValueError(f"Header row not found in table '{table_id}'")
+    headers = [_clean_text(cell.text_content()) for cell in header_row.iterchildren(header_tag)]
+    return _build_rows(headers, data_rows, page_url, link_header)
+
+
+def extract_table_rows(html, table_id, page_url, header_tag="td", link_header=None):
+    """Extract table rows with lxml when it is installed, falling back to the stdlib parser."""
+    if lxml is not None:
+        return extract_table_rows_lxml(html, table_id, page_url, header_tag, link_header)
+    return extract_table_rows_stdlib(html, table_id, page_url, header_tag, link_header)
+
+
+def parse_level_table(html, level, table_id, page_url, parents=(), extractor=extract_table_rows):
+    """
+    Parse a states, districts, blocks or panchayats page into a DataFrame.
+
+    The page HTML is parsed once; the resulting frame has the same columns the
+    scraper has always produced for that level: the serial number column is
+    dropped, parent names are prepended, and panchayat rows carry the page URL.
+
+    Args:
+        html (str): Page HTML.
+        level (str): One of the keys of LEVELS.
+        table_id (str): The id attribute of the data table.
+        page_url (str): URL the page was loaded from.
+        parents (sequence): Values of the level's parent columns, outermost first.
+        extractor (callable): Row extraction strategy, see extract_table_rows.
+
+    Returns:
+        pd.DataFrame: The level's table.
+    """
+    layout = LEVELS[level]
+    columns, rows = extractor(html, table_id, page_url, layout["header_tag"], layout["link_header"])
+    if level == "panchayats":
+        columns.append('URL')
+        for values in rows:
+            values.append(page_url)
+
+    df = pd.DataFrame(rows, columns=columns)
+    df = df.dropna()
+    if not df.empty and df.columns.size > 1:
+        df = df.drop(df.columns[0], axis=1)
+    for column, value in reversed(list(zip(layout["parents"], parents))):
+        df.insert(0, column, value)
+    if level == "panchayats":
+        df.rename(columns={'State': "States/UT's"}, inplace=True)
+        df.drop(columns=['Image'], inplace=True, errors='ignore')
+    return df
+
+
+def extract_hidden_fields(html):
+    """
+    Extract the hidden form fields (ASP.NET __VIEWSTATE, __EVENTVALIDATION, ...) of a page.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        dict: Mapping of hidden input names to their values.
+    """
+    parser = _HiddenInputParser()
+    parser.feed(html)
+    parser.close()
+    return parser.fields
@@ -0,0 +1,225 @@
+# modules/policy.py
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from config.settings import (
+    FETCH_RATE, FETCH_BURST, FETCH_TIMEOUT_FACTOR, FETCH_TIMEOUT_MIN, FETCH_TIMEOUT_MAX,
+    FETCH_BREAKER_WINDOW, FETCH_BREAKER_THRESHOLD, FETCH_BREAKER_COOLDOWN,
+    FETCH_CONCURRENCY_INITIAL, FETCH_CONCURRENCY_MIN, FETCH_CONCURRENCY_MAX, logger
+)
+
+# Timeouts used for each level until enough latencies have been observed
+DEFAULT_TIMEOUTS = {"states": 10, "districts": 10, "blocks": 10, "panchayats": 20}
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate=FETCH_RATE, burst=FETCH_BURST):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class LatencyTracker:
+    """Recent page latencies per level, used to derive per-level timeouts."""
+
+    def __init__(self, window=200, min_samples=20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, level, seconds):
+        with self._lock:
+            self._samples.setdefault(level, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, level, q):
+        """The q-th percentile (0-100) of recent latencies, or None without enough samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(level, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+    def timeout(self, level):
+        """FETCH_TIMEOUT_FACTOR times the p95 latency, clamped to [FETCH_TIMEOUT_MIN, FETCH_TIMEOUT_MAX]."""
+        p95 = self.percentile(level, 95)
+        if p95 is None:
+            return DEFAULT_TIMEOUTS.get(level, FETCH_TIMEOUT_MAX)
+        return min(FETCH_TIMEOUT_MAX, max(FETCH_TIMEOUT_MIN, p95 * FETCH_TIMEOUT_FACTOR))
+
+
+class CircuitBreaker:
+    """
+    Pauses the whole crawl when the error rate spikes.
+
+    Once at least half of the last `window` fetches failed, the breaker opens and
+    every fetch waits `cooldown` seconds; then the window is cleared and traffic resumes.
+    """
+
+    def __init__(self, window=FETCH_BREAKER_WINDOW, threshold=FETCH_BREAKER_THRESHOLD, cooldown=FETCH_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.min_samples = max(1, window // 2)
+        self._outcomes = deque(maxlen=window)
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ok):
+        with self._lock:
+            self._outcomes.append(ok)
+            if len(self._outcomes) < self.min_samples or time.monotonic() < self.open_until:
+                return
+            error_rate = self._outcomes.count(False) / len(self._outcomes)
+            if error_rate >= self.threshold:
+                self.open_until = time.monotonic() + self.cooldown
+                self._outcomes.clear()
+                logger.error("Circuit breaker open: %.0f%% of recent fetches failed, pausing the crawl for %ds.",
+                             error_rate * 100, self.cooldown)
+
+    def wait_time(self):
+        """Seconds left before fetches may resume, 0 when the breaker is closed."""
+        return max(0.0, self.open_until - time.monotonic())
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit: grows by one slot per `limit` successes while the site
+    is healthy (additive increase) and halves on a timeout (multiplicative decrease).
+    Threads wait in acquire(), coroutines in acquire_async(); both are woken when a slot is released.
+    """
+
+    def __init__(self, initial=FETCH_CONCURRENCY_INITIAL, minimum=FETCH_CONCURRENCY_MIN, maximum=FETCH_CONCURRENCY_MAX):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        self._async_waiters = []   # (loop, future) of coroutines waiting for a slot
+
+    def try_acquire(self):
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    @staticmethod
+    def _wake(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, timed_out=False):
+        with self._condition:
+            self.in_flight -= 1
+            if timed_out:
+                self.limit = max(self.minimum, self.limit / 2)
+                logger.warning("Fetch timed out, concurrency limit lowered to %d.", int(self.limit))
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._wake, waiter)
+
+
+def is_timeout(error):
+    """Whether an exception (or the exception it wraps) is a timeout."""
+    while error is not None:
+        if isinstance(error, TimeoutError) or "Timeout" in type(error).__name__:
+            return True
+        error = error.__cause__
+    return False
+
+
+class FetchPolicy:
+    """
+    The fetch policy shared by every worker: rate limiting, circuit breaking,
+    adaptive concurrency and per-level timeouts learned from recent latencies.
+
+    Wrap every page load in request() (threads) or request_async() (asyncio); the
+    context yields the timeout to use and records the outcome when it exits.
+    """
+
+    def __init__(self, bucket=None, latencies=None, breaker=None, limiter=None):
+        self.bucket = bucket or TokenBucket()
+        self.latencies = latencies or LatencyTracker()
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or AIMDLimiter()
+
+    def timeout(self, level):
+        return self.latencies.timeout(level)
+
+    def _finish(self, level, start, error):
+        timed_out = error is not None and is_timeout(error)
+        self.limiter.release(timed_out=timed_out)
+        self.breaker.record(error is None)
+        if error is None:
+            self.latencies.record(level, time.monotonic() - start)
+
+    @contextmanager
+    def request(self, level):
+        while self.breaker.wait_time() > 0:
+            time.sleep(self.breaker.wait_time())
+        time.sleep(self.bucket.reserve())
+        self.limiter.acquire()
+        start = time.monotonic()
+        try:
+            yield self.timeout(level)
+        except Exception as e:
+            self._finish(level, start, e)
+            raise
+        self._finish(level, start, None)
+
+    @asynccontextmanager
+    async def request_async(self, level):
+        while self.breaker.wait_time() > 0:
+            await asyncio.sleep(self.breaker.wait_time())
+        await asyncio.sleep(self.bucket.reserve())
+        await self.limiter.acquire_async()
+        start = time.monotonic()
+        try:
+            yield self.timeout(level)
+        except Exception as e:
+            self._finish(level, start, e)
+            raise
+        self._finish(level, start, None)
+
+
+# Policy shared by all Scraper instances and the async engine of this process
+default_policy = FetchPolicy()
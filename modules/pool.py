@@ -0,0 +1,138 @@
+# modules/pool.py
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config.settings import SCRAPER_WORKERS, logger
+from modules.fetch import SeleniumFetcher
+
+_DONE = object()  # Sentinel telling the writer thread that all results are in
+
+
+def _selenium_factory():
+    from modules.utils import initialize_driver
+    from modules.supervisor import SupervisedFetcher
+    return SupervisedFetcher(lambda: SeleniumFetcher(initialize_driver()))
+
+
+class DriverPool:
+    """
+    A fixed-size pool of fetch backends shared by worker threads.
+
+    By default every member is a supervised headless Chrome instance built with
+    initialize_driver(); any other fetcher factory (e.g. create_fetcher for the
+    HTTP backend) can be passed instead. Each member is used by one thread at a time.
+    """
+
+    def __init__(self, size=SCRAPER_WORKERS, factory=_selenium_factory):
+        """
+        Args:
+            size (int): Number of fetchers (browser instances) to start.
+            factory (callable): Zero-argument callable returning a new Fetcher.
+        """
+        self.size = max(1, int(size))
+        self._fetchers = []
+        self._idle = queue.Queue()
+        logger.info("Starting driver pool with %d workers...", self.size)
+        # Chrome startup is slow, so the members are started concurrently
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(factory) for _ in range(self.size)]
+            errors = []
+            for future in futures:
+                try:
+                    fetcher = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                self._fetchers.append(fetcher)
+                self._idle.put(fetcher)
+        if errors:
+            self.close()
+            raise errors[0]
+        logger.info("Driver pool started with %d workers.", self.size)
+
+    def get(self):
+        """Block until a fetcher is idle and hand it out."""
+        return self._idle.get()
+
+    def release(self, fetcher):
+        """Return a fetcher obtained with get() to the pool."""
+        self._idle.put(fetcher)
+
+    @contextmanager
+    def acquire(self):
+        """Context manager that lends an idle fetcher for the duration of the block."""
+        fetcher = self.get()
+        try:
+            yield fetcher
+        finally:
+            self.release(fetcher)
+
+    def close(self):
+        """Close every fetcher in the pool."""
+        for fetcher in self._fetchers:
+            try:
+                fetcher.close()
+            except Exception as e:
+                logger.error(f"Error closing pooled fetcher: {e}")
+        self._fetchers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _writer_loop(results, write):
+    """Consume (task, result) pairs from the results queue until the sentinel arrives."""
+    while True:
+        item = results.get()
+        if item is _DONE:
+            break
+        task, result = item
+        try:
+            write(task, result)
+        except Exception as e:
+            logger.error(f"Error writing results for {task}: {e}")
+
+
+def run_pooled(pool, tasks, work, write):
+    """
+    Run tasks on the pool's fetchers and persist results from a single writer thread.
+
+    Every task is scraped by a worker thread holding an idle fetcher, and results are
+    handed to one writer thread, so the database only ever sees a single writer.
+
+    Args:
+        pool (DriverPool): Pool providing the fetchers.
+        tasks (iterable): Task tuples, e.g. (state, district, block, url).
+        work (callable): work(fetcher, task) -> result, run on a worker thread.
+        write (callable): write(task, result), run on the writer thread.
+
+    Returns:
+        int: Number of tasks processed.
+    """
+    results = queue.Queue(maxsize=pool.size * 2)
+    writer = threading.Thread(target=_writer_loop, args=(results, write), name="db-writer", daemon=True)
+    writer.start()
+
+    def run(task):
+        with pool.acquire() as fetcher:
+            try:
+                result = work(fetcher, task)
+            except Exception as e:
+                logger.error(f"Unexpected error in worker for {task}: {e}")
+                return
+        results.put((task, result))
+
+    count = 0
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="scraper") as executor:
+            for _ in executor.map(run, tasks):
+                count += 1
+    finally:
+        results.put(_DONE)
+        writer.join()
+    return count
@@ -0,0 +1,129 @@
+# modules/progress.py
+
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, DateTime, Index, inspect, text
+from config.settings import logger
+
+metadata = MetaData()
+
+# One summary row per block: the wells the site reports for it and the panchayat rows
+# saved under it, so progress is read from O(blocks) rows instead of the panchayats table.
+# The writer keeps it current in the transaction of every blocks and panchayats batch.
+crawl_progress = Table(
+    "crawl_progress", metadata,
+    Column("block_id", Integer, primary_key=True),
+    Column("district_id", Integer, nullable=False),
+    Column("state_id", Integer, nullable=False),
+    Column("expected_wells", Integer),
+    Column("scraped_wells", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime),
+    Index("ix_crawl_progress_state_id", "state_id"),
+)
+
+EXPECTED_COLUMN = "No. of Well Covered"
+
+
+def ensure_table(engine):
+    """Create the crawl_progress table if it doesn't exist, filling it from the saved rows."""
+    if inspect(engine).has_table("crawl_progress"):
+        return
+    metadata.create_all(engine, tables=[crawl_progress])
+    with engine.begin() as conn:
+        update(conn)
+
+
+def update(conn, district_ids=None, block_ids=None):
+    """
+    Recompute the progress rows of some blocks from the blocks and panchayats tables.
+
+    Scraped wells are recounted on the panchayats(block_id) index rather than adjusted by
+    deltas, so the rows stay exact when an incremental re-crawl replaces a block's rows.
+    With neither argument, every block is recomputed.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection inside the caller's transaction.
+        district_ids (iterable, optional): Recompute the blocks of these districts.
+        block_ids (iterable, optional): Recompute these blocks.
+
+    Returns:
+        int: Number of progress rows written.
+    """
+    inspector = inspect(conn)
+    if not (inspector.has_table("blocks") and inspector.has_table("districts")):
+        return 0
+    quote = conn.dialect.identifier_preparer.quote
+    # Tables written before the column types were coerced keep the counts as text; they get NULL
+    column_types = {column["name"]: column["type"] for column in inspector.get_columns("blocks")}
+    has_expected = isinstance(column_types.get(EXPECTED_COLUMN), Integer)
+    expected = f"b.{quote(EXPECTED_COLUMN)}" if has_expected else "NULL"
+    if inspector.has_table("panchayats"):
+        scraped = "(SELECT COUNT(*) FROM panchayats p WHERE p.block_id = b.id)"
+    else:
+        scraped = "0"
+    conditions, params = [], {"now": datetime.utcnow()}
+    for column, prefix, ids in (("b.district_id", "d", district_ids), ("b.id", "b", block_ids)):
+        if ids is None:
+            continue
+        ids = sorted(set(ids))
+        if not ids:
+            return 0
+        placeholders = ", ".join(f":{prefix}{i}" for i in range(len(ids)))
+        conditions.append(f"{column} IN ({placeholders})")
+        params.update({f"{prefix}{i}": value for i, value in enumerate(ids)})
+    # "WHERE" is always present: SQLite needs it to parse INSERT ... SELECT ... ON CONFLICT
+    where = " AND ".join(conditions) or "1 = 1"
+    result = conn.execute(text(
+        "INSERT INTO crawl_progress (block_id, district_id, state_id, expected_wells, scraped_wells, updated_at) "
+        f"SELECT b.id, b.district_id, d.state_id, {expected}, {scraped}, :now "
+        f"FROM blocks b JOIN districts d ON d.id = b.district_id WHERE {where} "
+        "ON CONFLICT (block_id) DO UPDATE SET expected_wells = excluded.expected_wells, "
+        "scraped_wells = excluded.scraped_wells, updated_at = excluded.updated_at"
+    ), params)
+    return result.rowcount
+
+
+def rebuild(engine):
+    """
+    Rebuild the whole rollup from the saved rows, e.g. after editing tables by hand.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine.
+
+    Returns:
+        int: Number of progress rows written.
+    """
+    metadata.create_all(engine, tables=[crawl_progress])
+    with engine.begin() as conn:
+        conn.execute(crawl_progress.delete())
+        rows = update(conn)
+    logger.info("Rebuilt crawl_progress with %d blocks.", rows)
+    return rows
+
+
+def state_totals(conn):
+    """
+    Expected and scraped wells, and blocks with rows, per state, summed from the rollup.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Database connection.
+
+    Returns:
+        dict: state_id -> {"expected_wells", "scraped_wells", "blocks", "blocks_scraped"}.
+    """
+    if not inspect(conn).has_table("crawl_progress"):
+        return {}
+    rows = conn.execute(text(
+        "SELECT state_id, SUM(expected_wells), SUM(scraped_wells), COUNT(*), "
+        "SUM(CASE WHEN scraped_wells > 0 THEN 1 ELSE 0 END) "
+        "FROM crawl_progress GROUP BY state_id"
+    )).all()
+    return {
+        state_id: {"expected_wells": expected or 0, "scraped_wells": scraped or 0, "blocks": blocks, "blocks_scraped": done or 0}
+        for state_id, expected, scraped, blocks, done in rows
+    }
+
+
+if __name__ == "__main__":
+    from modules.db import get_engine
+
+    rebuild(get_engine())
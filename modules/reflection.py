@@ -1,43 +1,141 @@
-from sqlalchemy.ext.automap import automap_base
-from sqlalchemy import create_engine, MetaData, Table
-from config.settings import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+# modules/reflection.py
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
-print("Connected to the database.")
+import json
+import threading
+import sqlalchemy.types as sqltypes
+from sqlalchemy import MetaData, Table, Column, inspect
+from sqlalchemy.exc import NoSuchTableError
+from config.settings import SCHEMA_SNAPSHOT, logger
 
-# Create a metadata object: metadata
-metadata = MetaData() # type: sqlalchemy.sql.schema.MetaData
-metadata.reflect(engine)
-print("Metadata object created successfully.")
-
-# List of tables to reflect
+# Tables mapped by models.py
 tables_to_reflect = ['states', 'districts', 'blocks', 'panchayats']
 
-reflected_tables = {}
+metadata = MetaData()
+_lock = threading.Lock()
+
+
+def _get_engine():
+    # Imported lazily so that importing this module never connects to the database
+    from modules.db import get_engine
+    return get_engine()
+
 
-for table_name in tables_to_reflect:
+def _column_spec(column):
+    return {
+        "name": column.name,
+        "type": type(column.type).__name__,
+        "nullable": bool(column.nullable),
+        "primary_key": bool(column.primary_key),
+    }
+
+
+def _read_snapshot():
     try:
-        table = Table(table_name, metadata, autoload_with=engine)
-        reflected_tables[table_name] = table
-        # print(f"Table '{table_name}' reflected successfully.")
-        # print(f"Available columns in '{table_name}' table: {table.c.keys()}\n")
-    except Exception as e:
-        # print(f"Error reflecting table '{table_name}': {e}\n")
-        pass
+        with open(SCHEMA_SNAPSHOT) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.warning(f"Ignoring unreadable schema snapshot {SCHEMA_SNAPSHOT}: {e}")
+        return {}
 
-# Export reflected tables
-__all__ = ['reflected_tables']
 
+def _write_snapshot(snapshot):
+    SCHEMA_SNAPSHOT.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SCHEMA_SNAPSHOT.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(snapshot, f, indent=2)
+    tmp.replace(SCHEMA_SNAPSHOT)
+
+
+def _table_from_spec(name, columns):
+    return Table(name, metadata, *[
+        Column(spec["name"], getattr(sqltypes, spec["type"], sqltypes.NullType)(),
+               nullable=spec["nullable"], primary_key=spec["primary_key"])
+        for spec in columns
+    ])
+
+
+def _reflect(engine, name):
+    """Reflect a single table (not the whole catalog), raising NoSuchTableError if it doesn't exist."""
+    reflected = Table(name, MetaData(), autoload_with=engine)
+    return [_column_spec(column) for column in reflected.columns]
+
+
+def get_table(name, engine=None):
+    """
+    Return the Table definition of one table, loading it on first use.
+
+    Definitions come from the on-disk schema snapshot (SCHEMA_SNAPSHOT), so no database
+    round trip is needed; a table missing from the snapshot is reflected on its own and
+    added to it.
 
-# # Reflect census table from the engine: census
-# states_table = Table('states',metadata, autoload_with=engine) # type: sqlalchemy.sql.schema.Table
-# print("Table reflected successfully.")
+    Args:
+        name (str): Table name, e.g. "states".
+        engine (sqlalchemy.engine.Engine, optional): Engine used if the table must be reflected.
 
-# # Print all column names
-# print("Available columns in 'states' table:", states_table.c.keys())
+    Returns:
+        sqlalchemy.Table: The table definition.
+
+    Raises:
+        NoSuchTableError: If the table is neither in the snapshot nor in the database.
+    """
+    with _lock:
+        if name in metadata.tables:
+            return metadata.tables[name]
+        snapshot = _read_snapshot()
+        if name not in snapshot:
+            logger.info(f"Table '{name}' not in the schema snapshot, reflecting it from the database.")
+            snapshot[name] = _reflect(engine or _get_engine(), name)
+            _write_snapshot(snapshot)
+        return _table_from_spec(name, snapshot[name])
+
+
+def refresh_snapshot(engine=None, tables=tables_to_reflect):
+    """
+    Re-reflect the given tables and rewrite the schema snapshot, e.g. after a schema change.
+
+    Args:
+        engine (sqlalchemy.engine.Engine, optional): Database engine.
+        tables (list): Names of the tables to snapshot; tables that don't exist are skipped with a warning.
+
+    Returns:
+        dict: The new snapshot, table name -> column specs.
+    """
+    engine = engine or _get_engine()
+    snapshot = {}
+    existing = set(inspect(engine).get_table_names())
+    for name in tables:
+        if name not in existing:
+            logger.warning(f"Table '{name}' does not exist, leaving it out of the schema snapshot.")
+            continue
+        snapshot[name] = _reflect(engine, name)
+    _write_snapshot(snapshot)
+    with _lock:
+        metadata.clear()
+    logger.info("Schema snapshot of %d tables written to %s", len(snapshot), SCHEMA_SNAPSHOT)
+    return snapshot
+
+
+class _LazyTables(dict):
+    """Mapping of table name -> Table that loads each table on first access."""
+
+    def __missing__(self, name):
+        return get_table(name)
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except NoSuchTableError:
+            return False
+        return True
+
+
+reflected_tables = _LazyTables()
+
+# Export reflected tables
+__all__ = ['reflected_tables', 'get_table', 'refresh_snapshot']
 
-# print(repr(states_table))
 
-# # Export states_table
-# __all__ = ['states_table']
+if __name__ == "__main__":
+    refresh_snapshot()
@@ -0,0 +1,171 @@
+# modules/schema.py
+
+import pandas as pd
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, BigInteger, Float, Boolean, DateTime, Text,
+    ForeignKey, UniqueConstraint, Index, inspect, text
+)
+from config.settings import SEASON, logger
+
+# Hierarchy of the scraped tables. Each level below states references its parent row
+# through an integer foreign key instead of repeating the parents' names, and states rows
+# are keyed by the season they were crawled for, so every row belongs to one season:
+# level -> (key column, parent table, the level's own name column)
+SEASON_COLUMN = "season"
+LEVEL_KEYS = {
+    "states": (SEASON_COLUMN, None, "States/UT's"),
+    "districts": ("state_id", "states", "District"),
+    "blocks": ("district_id", "districts", "Block"),
+    "panchayats": ("block_id", "blocks", None),
+}
+# Parent name columns of the scraped tables, replaced by the foreign key when stored
+PARENT_NAME_COLUMNS = ["States/UT's", "District", "Block"]
+_CHAIN = ["states", "districts", "blocks"]
+
+
+def flat_source(level):
+    """Table or view exposing a level's rows with their parents' names, e.g. "blocks_flat"."""
+    return level if level == "states" else f"{level}_flat"
+
+
+def _column_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return Boolean
+    if pd.api.types.is_integer_dtype(dtype):
+        return Integer if dtype.itemsize <= 4 else BigInteger
+    if pd.api.types.is_float_dtype(dtype):
+        return Float(24) if dtype.itemsize <= 4 else Float(53)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return DateTime
+    return Text
+
+
+def ensure_table(conn, level, frame):
+    """
+    Create a level's table from the first rows written to it, if it doesn't exist yet, or
+    add the columns of `frame` it doesn't have yet.
+
+    Besides the scraped columns, the table gets an integer primary key "id", the foreign
+    key to its parent (the season for states), a unique constraint on the natural key
+    (parent id and name) and an index on the foreign key; the level's "<level>_flat" view
+    is created with it. Headers change between seasons (e.g. "Pre Monsoon Water Level(In Feet)"
+    and "Post Monsoon ..."), so a later season's new columns are added as nullable columns.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection inside the caller's transaction.
+        level (str): "states", "districts", "blocks" or "panchayats".
+        frame (pd.DataFrame): Rows in storage layout, see to_storage().
+    """
+    if inspect(conn).has_table(level):
+        _add_columns(conn, level, frame)
+        return
+    foreign_key, parent, name = LEVEL_KEYS[level]
+    metadata = MetaData()
+    if parent is not None:
+        Table(parent, metadata, Column("id", Integer, primary_key=True))
+    columns = [Column("id", Integer, primary_key=True)]
+    if parent is not None:
+        columns.append(Column(foreign_key, Integer, ForeignKey(f"{parent}.id"), nullable=False))
+    else:
+        columns.append(Column(foreign_key, Text, nullable=False))
+    columns += [Column(column, _column_type(frame[column].dtype)) for column in frame.columns if column != foreign_key]
+    natural_key = [column for column in (foreign_key, name) if column is not None]
+    if name is not None:
+        columns.append(UniqueConstraint(*natural_key, name=f"uq_{level}_natural_key"))
+    else:
+        columns.append(Index(f"ix_{level}_{foreign_key}", foreign_key))
+    table = Table(level, metadata, *columns)
+    table.create(conn)
+    ensure_view(conn, level)
+    logger.info(f"Created table '{level}' with {len(frame.columns)} columns.")
+
+
+def _add_columns(conn, level, frame):
+    existing = {column["name"] for column in inspect(conn).get_columns(level)}
+    missing = [column for column in frame.columns if column not in existing]
+    if not missing:
+        return
+    quote = conn.dialect.identifier_preparer.quote
+    for column in missing:
+        column_type = _column_type(frame[column].dtype)
+        column_type = column_type() if isinstance(column_type, type) else column_type
+        conn.execute(text(
+            f"ALTER TABLE {quote(level)} ADD COLUMN {quote(column)} {column_type.compile(dialect=conn.dialect)}"
+        ))
+    # PostgreSQL expands the view's c.* when it is created, so it is replaced to show the new columns
+    if conn.dialect.name != "sqlite":
+        ensure_view(conn, level)
+    logger.info(f"Added {len(missing)} columns to table '{level}': {missing}")
+
+
+def ensure_view(conn, level):
+    """Create the "<level>_flat" view joining a level's rows to their season and parents' names."""
+    if level == "states":
+        return
+    quote = conn.dialect.identifier_preparer.quote
+    names, joins, current, alias = [], [], level, "c"
+    while LEVEL_KEYS[current][1] is not None:
+        foreign_key, parent, _ = LEVEL_KEYS[current]
+        parent_alias = parent[0]
+        joins.append(f"JOIN {quote(parent)} {parent_alias} ON {parent_alias}.id = {alias}.{quote(foreign_key)}")
+        names.insert(0, f"{parent_alias}.{quote(LEVEL_KEYS[parent][2])}")
+        current, alias = parent, parent_alias
+    names.insert(0, f"{alias}.{quote(SEASON_COLUMN)}")
+    create = "CREATE VIEW IF NOT EXISTS" if conn.dialect.name == "sqlite" else "CREATE OR REPLACE VIEW"
+    conn.execute(text(
+        f"{create} {quote(flat_source(level))} AS SELECT {', '.join(names)}, c.* "
+        f"FROM {quote(level)} c {' '.join(joins)}"
+    ))
+
+
+def parent_ids(conn, level, parents, season=SEASON):
+    """
+    Resolve the parent names of scraped pages to the parent rows' ids.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Database connection.
+        level (str): Level of the pages: "districts", "blocks" or "panchayats".
+        parents (iterable): Tuples of parent names, e.g. (state, district) for blocks pages.
+        season (str): Season the pages were crawled for.
+
+    Returns:
+        dict: Parent names tuple -> parent id, for the parents found.
+    """
+    parent = LEVEL_KEYS[level][1]
+    parents = {tuple(names) for names in parents}
+    if parent is None or not parents or not inspect(conn).has_table(parent):
+        return {}
+    quote = conn.dialect.identifier_preparer.quote
+    name_columns = [quote(column) for column in PARENT_NAME_COLUMNS[:_CHAIN.index(parent) + 1]]
+    states = sorted({names[0] for names in parents})
+    placeholders = ", ".join(f":s{i}" for i in range(len(states)))
+    rows = conn.execute(
+        text(f"SELECT id, {', '.join(name_columns)} FROM {quote(flat_source(parent))} "
+             f"WHERE {quote(SEASON_COLUMN)} = :season AND {quote(PARENT_NAME_COLUMNS[0])} IN ({placeholders})"),
+        {"season": season, **{f"s{i}": state for i, state in enumerate(states)}}
+    ).all()
+    return {tuple(row[1:]): row[0] for row in rows if tuple(row[1:]) in parents}
+
+
+def to_storage(level, frame, parent_id=None):
+    """
+    Convert a scraped table to its storage layout: the parent name columns are replaced by
+    the parent's id (the season for states), and rows repeating a natural key are dropped.
+
+    Args:
+        level (str): "states", "districts", "blocks" or "panchayats".
+        frame (pd.DataFrame): Table as returned by the Scraper.
+        parent_id (int | str): Id of the parent row, or the season of a states table.
+
+    Returns:
+        pd.DataFrame: The rows to store.
+    """
+    foreign_key, _, name = LEVEL_KEYS[level]
+    rows = frame.drop(columns=[column for column in PARENT_NAME_COLUMNS if column in frame.columns and column != name])
+    rows.insert(0, foreign_key, parent_id)
+    if name is not None:
+        unique = rows.drop_duplicates(subset=[name])
+        if len(unique) < len(rows):
+            logger.warning(f"Dropped {len(rows) - len(unique)} {level} rows repeating a name on the same page.")
+        rows = unique
+    return rows
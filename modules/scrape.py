@@ -1,27 +1,84 @@
-from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from config.settings import TABLE_ID, logger
-import pandas as pd
+from config.settings import TABLE_ID, FETCH_BACKOFF_BASE, FETCH_BACKOFF_MAX, logger
+from modules.exceptions import FetchError, ParseError
+from modules.fetch import Fetcher, SeleniumFetcher
+from modules.parse import parse_level_table
+from modules.fingerprint import DIGEST_ATTR, UNCHANGED
+from modules.policy import default_policy, DEFAULT_TIMEOUTS
+from modules import metrics
 
 class Scraper:
-    def __init__(self, driver, base_url):
+    def __init__(self, fetcher, base_url, policy=default_policy, shared=None, fingerprints=None):
         """
-        Initialize the Scraper with a WebDriver instance and base URL.
+        Initialize the Scraper with a fetch backend and base URL.
 
         Args:
-            driver (webdriver.Chrome): Selenium WebDriver instance.
+            fetcher (Fetcher | webdriver.Chrome): Fetch backend used to load pages.
+                A bare Selenium WebDriver is wrapped in a SeleniumFetcher.
             base_url (str): The base URL to start scraping from.
+            policy (FetchPolicy | None): Rate limit, circuit breaker and timeouts applied to
+                every network fetch; shared by all workers by default. None disables it.
+            shared (SharedPages, optional): Hierarchy pages shared with the other seasons of a
+                multi-season run (modules/seasons.py).
+            fingerprints (PageFingerprints, optional): Digests of the pages saved by earlier runs;
+                a page whose table is unchanged is returned as UNCHANGED instead of being parsed.
         """
-        self.driver = driver
+        if not isinstance(fetcher, Fetcher):
+            fetcher = SeleniumFetcher(fetcher)
+        self.fetcher = fetcher
         self.base_url = base_url
+        self.policy = policy
+        self.shared = shared
+        self.fingerprints = fingerprints
+
+    def _fetch(self, level, url):
+        """Load a page, or take it from another season of the run that already loaded it."""
+        if self.shared is None:
+            return self._load(level, url)
+        html, reused = self.shared.load(level, url, lambda: self._load(level, url))
+        if reused:
+            metrics.pages_total.inc(source="shared", **metrics.current_labels())
+        return html
+
+    def _load(self, level, url):
+        """Load a page through the fetch policy; pages served from the cache bypass it."""
+        html = self.fetcher.cached(url)
+        if html is not None:
+            metrics.pages_total.inc(source="cache", **metrics.current_labels())
+            return html
+        if self.policy is None:
+            html = self.fetcher.fetch(url, DEFAULT_TIMEOUTS[level])
+        else:
+            with self.policy.request(level) as timeout:
+                html = self.fetcher.fetch(url, timeout)
+        metrics.pages_total.inc(source="network", **metrics.current_labels())
+        return html
+
+    def _parse(self, html, level, url, parents=()):
+        """
+        Extract a page's table, recording the parse time and row count.
+
+        Returns UNCHANGED instead if the table's digest matches the one saved for the page;
+        otherwise the digest is kept in the frame's attrs for the writer.
+        """
+        digest = None
+        if self.fingerprints is not None:
+            digest, unchanged = self.fingerprints.check(level, url, html)
+            if unchanged:
+                return UNCHANGED
+        with metrics.timer("parse"):
+            df = parse_level_table(html, level, TABLE_ID, url, parents=parents)
+        metrics.rows_per_page.observe(len(df), **metrics.current_labels())
+        if digest is not None:
+            df.attrs[DIGEST_ATTR] = digest
+        return df
 
     @retry(
         stop=stop_after_attempt(5),
-        wait=wait_fixed(6),
-        retry=retry_if_exception_type((TimeoutException, WebDriverException)),
+        wait=wait_random_exponential(multiplier=FETCH_BACKOFF_BASE, max=FETCH_BACKOFF_MAX),
+        retry=retry_if_exception_type((TimeoutException, WebDriverException, FetchError)),
+        before_sleep=metrics.count_retry,
         reraise=True
     )
     def get_states(self):
@@ -30,56 +87,32 @@ class Scraper:
 
         Returns:
             pd.DataFrame: DataFrame containing states and their URLs.
+
+        Raises:
+            ParseError: If the loaded page's table cannot be parsed.
         """
         logger.info("Beginning get_states, loading page: %s", self.base_url)
+        metrics.set_labels("states")
         try:
-            self.driver.get(self.base_url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, TABLE_ID))
-            )
+            html = self._fetch("states", self.base_url)
             logger.info("Page loaded and State table located!")
-        except (TimeoutException, WebDriverException) as e:
+        except (TimeoutException, WebDriverException, FetchError) as e:
             logger.error(f"Error loading page OR locating table: {e}")
             raise  # Trigger Tenacity retry
 
-        data = []
         try:
-            state_table = self.driver.find_element(By.ID, TABLE_ID)
-            header_row = state_table.find_element(By.CSS_SELECTOR, "tr.header")
-            headers = [td.text for td in header_row.find_elements(By.TAG_NAME, "td")]
-            logger.info("State Headers extracted: %s", headers)
-
-            all_rows = state_table.find_elements(By.TAG_NAME, "tr")
-            data_rows = [row for row in all_rows if row != header_row]
-
-            for row in data_rows:
-                cols = row.find_elements(By.TAG_NAME, "td")
-                row_data = {}
-                if cols:
-                    for i, header in enumerate(headers):
-                        row_data[header] = cols[i].text
-                        if header == "States/UT's":
-                            try:
-                                url = cols[i].find_element(By.TAG_NAME, "a").get_attribute("href")
-                                row_data['URL'] = url
-                            except Exception:
-                                logger.warning(f"No URL found for {cols[i].text} under {header}")
-                data.append(row_data)
-
-            df = pd.DataFrame(data)
-            df = df.dropna()
-            if not df.empty and df.columns.size > 1:
-                df = df.drop(df.columns[0], axis=1)
+            df = self._parse(html, "states", self.base_url)
             logger.info(f"Extracted {len(df)} State URLs successfully")
             return df
         except Exception as e:
             logger.error(f"Error in get_states: {e}")
-            return pd.DataFrame()
+            raise ParseError(f"Error parsing the states page {self.base_url}: {e}") from e
 
     @retry(
         stop=stop_after_attempt(5),
-        wait=wait_fixed(6),
-        retry=retry_if_exception_type((TimeoutException, WebDriverException)),
+        wait=wait_random_exponential(multiplier=FETCH_BACKOFF_BASE, max=FETCH_BACKOFF_MAX),
+        retry=retry_if_exception_type((TimeoutException, WebDriverException, FetchError)),
+        before_sleep=metrics.count_retry,
         reraise=True
     )
     def get_districts(self, state, url):
@@ -91,58 +124,36 @@ class Scraper:
             url (str): URL to scrape districts from.
 
         Returns:
-            pd.DataFrame: DataFrame containing districts and their URLs.
+            pd.DataFrame: DataFrame containing districts and their URLs, or UNCHANGED if the
+                table is the same as when it was last saved.
+
+        Raises:
+            ParseError: If the loaded page's table cannot be parsed.
         """
         logger.info("Beginning get_districts for state: %s, loading page: %s", state, url)
+        metrics.set_labels("districts", state)
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, TABLE_ID))
-            )
+            html = self._fetch("districts", url)
             logger.info("Page loaded and table located for districts in state: %s", state)
-        except (TimeoutException, WebDriverException) as e:
+        except (TimeoutException, WebDriverException, FetchError) as e:
             logger.error("Error loading page OR locating table for districts: %s", e)
             raise  # Trigger Tenacity retry
 
-        data = []
         try:
-            district_table = self.driver.find_element(By.ID, TABLE_ID)
-            header_row = district_table.find_element(By.CSS_SELECTOR, "tr.header")
-            headers = [td.text for td in header_row.find_elements(By.TAG_NAME, "td")]
-            logger.info("District Headers extracted: %s", headers)
-
-            all_rows = district_table.find_elements(By.TAG_NAME, "tr")
-            data_rows = [row for row in all_rows if row != header_row]
-
-            for row in data_rows:
-                cols = row.find_elements(By.TAG_NAME, "td")
-                row_data = {}
-                if cols:
-                    for i, header in enumerate(headers):
-                        row_data[header] = cols[i].text
-                        if header == "District":
-                            try:
-                                url = cols[i].find_element(By.TAG_NAME, "a").get_attribute("href")
-                                row_data['URL'] = url
-                            except Exception:
-                                logger.warning(f"No URL found for {cols[i].text} under {header}")
-                data.append(row_data)
-
-            df = pd.DataFrame(data)
-            df = df.dropna()
-            if not df.empty and df.columns.size > 1:
-                df = df.drop(df.columns[0], axis=1)
-            df.insert(0, "States/UT\'s", state)
+            df = self._parse(html, "districts", url, parents=(state,))
+            if df is UNCHANGED:
+                return df
             logger.info("Extracted %d district URLs for state: %s successfully", len(df), state)
             return df
         except Exception as e:
             logger.error("Error in get_districts: %s", e)
-            return pd.DataFrame()
+            raise ParseError(f"Error parsing the districts page {url}: {e}") from e
 
     @retry(
         stop=stop_after_attempt(5),
-        wait=wait_fixed(6),
-        retry=retry_if_exception_type((TimeoutException, WebDriverException)),
+        wait=wait_random_exponential(multiplier=FETCH_BACKOFF_BASE, max=FETCH_BACKOFF_MAX),
+        retry=retry_if_exception_type((TimeoutException, WebDriverException, FetchError)),
+        before_sleep=metrics.count_retry,
         reraise=True
     )
     def get_blocks(self, state, district, url):
@@ -155,59 +166,36 @@ class Scraper:
             url (str): URL to scrape blocks from.
 
         Returns:
-            pd.DataFrame: DataFrame containing blocks and their URLs.
+            pd.DataFrame: DataFrame containing blocks and their URLs, or UNCHANGED if the
+                table is the same as when it was last saved.
+
+        Raises:
+            ParseError: If the loaded page's table cannot be parsed.
         """
         logger.info("Beginning get_blocks for state: %s, district: %s, loading page: %s", state, district, url)
+        metrics.set_labels("blocks", state)
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, TABLE_ID))
-            )
+            html = self._fetch("blocks", url)
             logger.info("Page loaded and table located for blocks in district: %s", district)
-        except (TimeoutException, WebDriverException) as e:
+        except (TimeoutException, WebDriverException, FetchError) as e:
             logger.error("Error loading page OR locating table for blocks: %s", e)
             raise  # Trigger Tenacity retry
 
-        data = []
         try:
-            block_table = self.driver.find_element(By.ID, TABLE_ID)
-            header_row = block_table.find_element(By.CSS_SELECTOR, "tr.header")
-            headers = [td.text for td in header_row.find_elements(By.TAG_NAME, "td")]
-            logger.info("Block Headers extracted: %s", headers)
-
-            all_rows = block_table.find_elements(By.TAG_NAME, "tr")
-            data_rows = [row for row in all_rows if row != header_row]
-
-            for row in data_rows:
-                cols = row.find_elements(By.TAG_NAME, "td")
-                row_data = {}
-                if cols:
-                    for i, header in enumerate(headers):
-                        row_data[header] = cols[i].text
-                        if header == "Block":
-                            try:
-                                url = cols[i].find_element(By.TAG_NAME, "a").get_attribute("href")
-                                row_data['URL'] = url
-                            except Exception:
-                                logger.warning(f"No URL found for {cols[i].text} under {header}")
-                data.append(row_data)
-
-            df = pd.DataFrame(data)
-            df = df.dropna()
-            if not df.empty and df.columns.size > 1:
-                df = df.drop(df.columns[0], axis=1)
-            df.insert(0, 'District', district)
-            df.insert(0, "States/UT\'s", state)
+            df = self._parse(html, "blocks", url, parents=(state, district))
+            if df is UNCHANGED:
+                return df
             logger.info("Extracted %d block URLs for district: %s successfully", len(df), district)
             return df
         except Exception as e:
             logger.error("Error in get_blocks: %s", e)
-            return pd.DataFrame()
+            raise ParseError(f"Error parsing the blocks page {url}: {e}") from e
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_fixed(6),
-        retry=retry_if_exception_type((TimeoutException, WebDriverException)),
+        wait=wait_random_exponential(multiplier=FETCH_BACKOFF_BASE, max=FETCH_BACKOFF_MAX),
+        retry=retry_if_exception_type((TimeoutException, WebDriverException, FetchError)),
+        before_sleep=metrics.count_retry,
         reraise=True
     )
     def get_panchayats(self, state, district, block, url):
@@ -221,45 +209,24 @@ class Scraper:
             url (str): URL to scrape panchayats from.
 
         Returns:
-            pd.DataFrame: DataFrame containing panchayats.
+            pd.DataFrame: DataFrame containing panchayats, or UNCHANGED if the
+                table is the same as when it was last saved.
+
+        Raises:
+            ParseError: If the loaded page's table cannot be parsed.
         """
         logger.info("Beginning get_panchayats for state: %s, district: %s, block: %s, loading page: %s", state, district, block, url)
+        metrics.set_labels("panchayats", state)
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, TABLE_ID))
-            )
+            html = self._fetch("panchayats", url)
             logger.info("Page loaded and table located for panchayats in block: %s", block)
-        except (TimeoutException, WebDriverException) as e:
+        except (TimeoutException, WebDriverException, FetchError) as e:
             logger.error("Error loading page OR locating table for panchayats: %s", e)
             raise  # Trigger Tenacity retry
 
-        data = []
         try:
-            panchayat_table = self.driver.find_element(By.ID, TABLE_ID)
-            header_row = panchayat_table.find_element(By.CSS_SELECTOR, "tr.header")
-            headers = [th.text for th in header_row.find_elements(By.TAG_NAME, "th")]
-            # logger.info("Panchayat Headers extracted: %s", headers)
-
-            all_rows = panchayat_table.find_elements(By.TAG_NAME, "tr")
-            data_rows = [row for row in all_rows if row != header_row]
-
-            for row in data_rows:
-                cols = row.find_elements(By.TAG_NAME, "td")
-                row_data = {}
-                if cols:
-                    for i, header in enumerate(headers):
-                        row_data[header] = cols[i].text
-                row_data['URL'] = url
-                data.append(row_data)
-
-            df = pd.DataFrame(data)
-            df = df.dropna()
-            if not df.empty and df.columns.size > 1:
-                df = df.drop(df.columns[0], axis=1)
-            df.rename(columns={'State': "States/UT's"}, inplace=True)
-            df.drop(columns=['Image'], inplace=True, errors='ignore')
+            df = self._parse(html, "panchayats", url)
             return df
         except Exception as e:
             logger.error("Error in get_panchayats: %s", e)
-            return pd.DataFrame()
\ No newline at end of file
+            raise ParseError(f"Error parsing the panchayats page {url}: {e}") from e
\ No newline at end of file
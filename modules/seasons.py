@@ -0,0 +1,207 @@
+# modules/seasons.py
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import BASE_URL, SEASON, SEASONS, SEASON_SHARED_LEVELS, logger
+
+
+def parse_seasons(spec):
+    """
+    Parse a "label=url,label=url" list of season roots.
+
+    Args:
+        spec (str | list): Comma-separated string, or a list of "label=url" items.
+
+    Returns:
+        list[tuple]: (label, url) pairs, in the given order.
+
+    Raises:
+        ValueError: If an item has no label or URL, or a label is repeated.
+    """
+    items = spec.split(",") if isinstance(spec, str) else spec
+    seasons = []
+    for item in (item.strip() for item in items):
+        if not item:
+            continue
+        label, _, url = item.partition("=")
+        if not label.strip() or not url.strip():
+            raise ValueError(f"Season '{item}' is not of the form label=url")
+        seasons.append((label.strip(), url.strip()))
+    labels = [label for label, _ in seasons]
+    if len(set(labels)) < len(labels):
+        raise ValueError(f"Season labels must be unique: {labels}")
+    return seasons
+
+
+def configured_seasons(spec=SEASONS):
+    """The season roots to crawl: SEASONS when set, otherwise SEASON at BASE_URL."""
+    return parse_seasons(spec) or [(SEASON, BASE_URL)]
+
+
+class SharedPages:
+    """
+    Hierarchy pages fetched during a multi-season run, shared by the season crawls.
+
+    Seasons often list the same districts and blocks pages; a page of one of the shared
+    levels is fetched once under its URL and handed to every other season asking for it.
+    When a season asks for a page another season is still fetching, it waits for that
+    fetch instead of starting its own; if the fetch fails, the waiting seasons fetch the
+    page themselves. Panchayats pages are not shared by default, since they are many and
+    hold the season's measurements. Safe to use from any number of threads, and from the
+    event loops of async crawls through load_async.
+    """
+
+    def __init__(self, levels=SEASON_SHARED_LEVELS):
+        """
+        Args:
+            levels (iterable): Levels whose pages are shared, e.g. ["districts", "blocks"].
+        """
+        self.levels = set(levels)
+        self.hits = 0
+        self._pages = {}
+        self._loading = {}  # url -> Event set when the fetching season is done
+        self._waiters = {}  # url -> (loop, future) of coroutines waiting for the fetching season
+        self._lock = threading.Lock()
+
+    def get(self, level, url):
+        """The shared page, or None if it isn't shared or not fetched yet."""
+        if level not in self.levels:
+            return None
+        with self._lock:
+            html = self._pages.get(url)
+            if html is not None:
+                self.hits += 1
+            return html
+
+    def put(self, level, url, html):
+        if level in self.levels:
+            with self._lock:
+                self._pages[url] = html
+
+    def _begin(self, url, loop=None):
+        """
+        Look a page up: (html, None) if it is shared, (None, None) if the caller has to fetch
+        it, or (None, waiter) while another season fetches it; the waiter is an Event, or a
+        future of `loop` for coroutines.
+        """
+        with self._lock:
+            html = self._pages.get(url)
+            if html is not None:
+                self.hits += 1
+                return html, None
+            if url not in self._loading:
+                self._loading[url] = threading.Event()
+                self._waiters[url] = []
+                return None, None
+            if loop is None:
+                return None, self._loading[url]
+            waiter = loop.create_future()
+            self._waiters[url].append((loop, waiter))
+            return None, waiter
+
+    def _fetched(self, url):
+        with self._lock:
+            return url in self._pages
+
+    def _end(self, url, html):
+        """Share the fetched page (None if the fetch failed) and wake the seasons waiting for it."""
+        with self._lock:
+            if html is not None:
+                self._pages[url] = html
+            loading = self._loading.pop(url)
+            waiters = self._waiters.pop(url)
+        loading.set()
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+    def load(self, level, url, fetch):
+        """
+        Return a page, calling fetch() unless another season fetched or is fetching it.
+
+        Args:
+            level (str): Level of the page.
+            url (str): URL of the page.
+            fetch (callable): Zero-argument callable loading the page's HTML.
+
+        Returns:
+            tuple[str, bool]: The HTML, and whether it came from another season.
+        """
+        if level not in self.levels:
+            return fetch(), False
+        while True:
+            html, waiter = self._begin(url)
+            if html is not None:
+                return html, True
+            if waiter is None:
+                break
+            waiter.wait()
+            if not self._fetched(url):
+                return fetch(), False
+        html = None
+        try:
+            html = fetch()
+            return html, False
+        finally:
+            self._end(url, html)
+
+    async def load_async(self, level, url, fetch):
+        """
+        Like load, for the async engine: fetch is a zero-argument coroutine function, and
+        waiting for another season's fetch doesn't block the event loop.
+        """
+        if level not in self.levels:
+            return await fetch(), False
+        while True:
+            html, waiter = self._begin(url, asyncio.get_running_loop())
+            if html is not None:
+                return html, True
+            if waiter is None:
+                break
+            await waiter
+            if not self._fetched(url):
+                return await fetch(), False
+        html = None
+        try:
+            html = await fetch()
+            return html, False
+        finally:
+            self._end(url, html)
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def run_seasons(seasons, crawl):
+    """
+    Crawl several seasons concurrently, one thread per season.
+
+    Args:
+        seasons (list): (label, url) pairs.
+        crawl (callable): crawl(label, url), crawling one season; it may raise.
+
+    Returns:
+        dict: Label -> the exception that stopped the season's crawl, or None.
+    """
+    if len(seasons) == 1:
+        label, url = seasons[0]
+        try:
+            crawl(label, url)
+            return {label: None}
+        except Exception as e:
+            logger.error(f"Crawl of season {label} failed: {e}")
+            return {label: e}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=len(seasons), thread_name_prefix="season") as executor:
+        futures = {label: executor.submit(crawl, label, url) for label, url in seasons}
+        for label, future in futures.items():
+            try:
+                future.result()
+                errors[label] = None
+            except Exception as e:
+                logger.error(f"Crawl of season {label} failed: {e}")
+                errors[label] = e
+    return errors
@@ -0,0 +1,116 @@
+# modules/status.py
+
+import threading
+import time
+from datetime import datetime
+from config.settings import STATUS_FILE, STATUS_INTERVAL, logger
+from modules import frontier
+from modules import metrics
+from modules.utils import write_status
+
+LEVELS = ["districts", "blocks", "panchayats"]
+
+
+class StatusReporter:
+    """
+    Writes live progress snapshots of a crawl to status.json.
+
+    A snapshot is written at most every interval seconds, however often report() is
+    called, and always atomically (see write_status). Besides the status and message
+    read by the dashboard, it holds:
+
+    - levels: done, failed and total pages per level, from the crawl frontier
+    - pages_per_minute, rows_per_minute: throughput since the previous snapshot, smoothed
+      with an exponential moving average
+    - retries, failures: totals of this run, from modules/metrics.py
+    - current: the level and parents of the page saved last
+    - eta_seconds: outstanding pages known so far divided by the smoothed page rate
+
+    Pages still to be discovered (children of pages not crawled yet) are not in the
+    totals, so the ETA grows while the crawl descends a level.
+    """
+
+    def __init__(self, engine, path=STATUS_FILE, interval=STATUS_INTERVAL, smoothing=0.3):
+        """
+        Args:
+            engine (sqlalchemy.engine.Engine): Database engine holding the crawl frontier.
+            path (Path): Snapshot file.
+            interval (float): Minimum seconds between two snapshots.
+            smoothing (float): Weight of the latest interval in the moving averages.
+        """
+        self.engine = engine
+        self.path = path
+        self.interval = interval
+        self.smoothing = smoothing
+        self.started = time.time()
+        self.current = {}
+        self._lock = threading.Lock()
+        self._last_write = None
+        self._last_totals = None  # (time, pages, rows)
+        self._pages_rate = None   # per second
+        self._rows_rate = None
+
+    def page(self, level, task):
+        """Record the page just saved and write a snapshot if one is due."""
+        self.current = {"level": level, "parents": list(task[:-1])}
+        self.report()
+
+    def _rates(self, now):
+        pages, rows = metrics.pages_total.total(), metrics.rows_written_total.total()
+        if self._last_totals is not None:
+            then, last_pages, last_rows = self._last_totals
+            elapsed = max(now - then, 1e-6)
+            for name, delta in (("_pages_rate", pages - last_pages), ("_rows_rate", rows - last_rows)):
+                previous = getattr(self, name)
+                rate = delta / elapsed
+                setattr(self, name, rate if previous is None else self.smoothing * rate + (1 - self.smoothing) * previous)
+        self._last_totals = (now, pages, rows)
+
+    def snapshot(self, status="Running", message=""):
+        """Build a snapshot of the crawl now (this also advances the moving averages)."""
+        now = time.time()
+        self._rates(now)
+        counts = frontier.status_counts(self.engine)
+        levels = {}
+        for level in LEVELS:
+            by_status = counts.get(level, {})
+            levels[level] = {
+                "done": by_status.get("done", 0),
+                "failed": by_status.get("failed", 0),
+                "total": sum(by_status.values()),
+            }
+        remaining = sum(level["total"] - level["done"] - level["failed"] for level in levels.values())
+        eta = remaining / self._pages_rate if self._pages_rate else None
+        return {
+            "status": status,
+            "message": message,
+            "timestamp": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            "updated_at": now,
+            "started_at": self.started,
+            "levels": levels,
+            "pages_per_minute": round((self._pages_rate or 0) * 60, 1),
+            "rows_per_minute": round((self._rows_rate or 0) * 60, 1),
+            "retries": metrics.retries_total.total(),
+            "failures": metrics.failures_total.total(),
+            "current": self.current,
+            "eta_seconds": round(eta) if eta is not None else None,
+        }
+
+    def report(self, status="Running", message="", force=False):
+        """
+        Write a snapshot if interval seconds passed since the last one, or if force is set.
+
+        Returns:
+            bool: Whether a snapshot was written.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_write is not None and now - self._last_write < self.interval:
+                return False
+            self._last_write = now
+            try:
+                write_status(self.snapshot(status, message), self.path)
+            except Exception as e:
+                logger.error(f"Failed to write the progress snapshot: {e}")
+                return False
+            return True
@@ -0,0 +1,138 @@
+# modules/supervisor.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException, InvalidSessionIdException
+from config.settings import DRIVER_MAX_PAGES, DRIVER_MAX_RSS_MB, DRIVER_MAX_FAILURES, DRIVER_SPARE, logger
+from modules.fetch import Fetcher
+
+try:
+    import psutil
+except ImportError:  # Memory checks are skipped without psutil
+    psutil = None
+
+# Messages of WebDriverExceptions raised by a browser that is gone for good
+_DEAD_SESSION_MARKERS = ("invalid session id", "chrome not reachable", "disconnected", "session deleted")
+# The browser's memory is sampled every this many pages
+_RSS_CHECK_INTERVAL = 50
+
+
+def browser_rss_mb(fetcher):
+    """
+    Resident memory of a Selenium fetcher's browser, chromedriver and all their child processes.
+
+    Returns:
+        float | None: Memory in MB, or None when it can't be measured.
+    """
+    driver = getattr(fetcher, "driver", None)
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if psutil is None or process is None:
+        return None
+    try:
+        root = psutil.Process(process.pid)
+        return sum(p.memory_info().rss for p in [root] + root.children(recursive=True)) / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+def _is_dead_session(error):
+    return isinstance(error, InvalidSessionIdException) or any(
+        marker in str(error).lower() for marker in _DEAD_SESSION_MARKERS
+    )
+
+
+class SupervisedFetcher(Fetcher):
+    """
+    Fetcher that keeps a browser healthy over multi-day crawls.
+
+    It tracks the pages served, the browser's resident memory and consecutive failures
+    of the wrapped fetcher, and replaces the browser when it has served `max_pages`
+    pages, grows above `max_rss_mb`, failed `max_failures` times in a row or lost its
+    session. With `spare`, a spare browser is started in the background ahead of time,
+    so a restart only swaps fetchers instead of stalling the worker on Chrome startup,
+    at the cost of a second browser per worker.
+    """
+
+    def __init__(self, factory, max_pages=DRIVER_MAX_PAGES, max_rss_mb=DRIVER_MAX_RSS_MB,
+                 max_failures=DRIVER_MAX_FAILURES, spare=DRIVER_SPARE):
+        """
+        Args:
+            factory (callable): Zero-argument callable returning a new Fetcher.
+            max_pages (int): Pages served before the browser is replaced (0 disables).
+            max_rss_mb (float): Memory above which the browser is replaced (0 disables).
+            max_failures (int): Consecutive failures after which the browser is replaced.
+            spare (bool): Keep a pre-warmed spare browser ready for restarts.
+        """
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_failures = max_failures
+        self.name = "supervised"
+        self.pages = 0
+        self.failures = 0
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-spare")
+        self.current = factory()
+        self._spare = self._background.submit(factory) if spare else None
+
+    def _recycle_reason(self):
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"served {self.pages} pages"
+        if self.max_rss_mb and self.pages and self.pages % _RSS_CHECK_INTERVAL == 0:
+            rss = browser_rss_mb(self.current)
+            if rss is not None and rss > self.max_rss_mb:
+                return f"using {rss:.0f} MB"
+        return None
+
+    def recycle(self, reason):
+        """Replace the current browser with the spare (or a fresh one) and start a new spare."""
+        with self._lock:
+            logger.warning("Restarting browser after it %s.", reason)
+            old = self.current
+            fresh = None
+            if self._spare is not None:
+                try:
+                    fresh = self._spare.result()
+                except Exception as e:
+                    logger.error(f"Spare browser failed to start: {e}")
+                self._spare = self._background.submit(self.factory)
+            self.current = fresh if fresh is not None else self.factory()
+            self.pages = 0
+            self.failures = 0
+            self.restarts += 1
+            self._background.submit(self._close_quietly, old)
+
+    @staticmethod
+    def _close_quietly(fetcher):
+        try:
+            fetcher.close()
+        except Exception as e:
+            logger.debug("Error closing recycled browser: %s", e)
+
+    def cached(self, url):
+        return self.current.cached(url)
+
+    def fetch(self, url, timeout):
+        reason = self._recycle_reason()
+        if reason:
+            self.recycle(reason)
+        try:
+            html = self.current.fetch(url, timeout)
+        except WebDriverException as e:
+            self.failures += 1
+            if _is_dead_session(e):
+                self.recycle("lost its session")
+            elif self.failures >= self.max_failures:
+                self.recycle(f"failed {self.failures} times in a row")
+            raise
+        self.pages += 1
+        self.failures = 0
+        return html
+
+    def close(self):
+        self._close_quietly(self.current)
+        if self._spare is not None and self._spare.exception() is None:
+            self._close_quietly(self._spare.result())
+        self._spare = None
+        self._background.shutdown(wait=True)
@@ -6,29 +6,36 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver import ChromeOptions
 import selenium.webdriver as webdriver
 from selenium.common.exceptions import WebDriverException
-from config.settings import EXCEL_FILE, STATUS_FILE,CHROME_DRIVER_PATH, HEADLESS, logger
+from config.settings import STATUS_FILE,CHROME_DRIVER_PATH, HEADLESS, BROWSER_PROFILE, BROWSER_BLOCKED_URLS, logger
+import os
 import time
 import json
 from datetime import datetime
 import logging
-from sqlalchemy import create_engine
-from config.settings import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from modules.db import get_engine, get_session
+from modules import counts
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
 Base = declarative_base()
 
+def write_status(data, path=STATUS_FILE):
+    """
+    Replace status.json atomically: the JSON is written to a temporary file in the same
+    directory and renamed over the old one, so readers never see a half-written file.
+    """
+    tmp = Path(path).with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
 def update_status(status, message=""):
     """Update the scraper status in status.json located at the root directory."""
     try:
-        with open(STATUS_FILE, "w") as f:
-            json.dump({
-                "status": status,
-                "message": message,
-                "timestamp": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-            }, f)
+        write_status({
+            "status": status,
+            "message": message,
+            "timestamp": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        })
     except Exception as e:
         logger.error(f"Failed to update status.json: {e}")
     
@@ -65,10 +72,57 @@ def end_scraping_log(start_time):
     # Optionally, you can return the total seconds
     return time_taken.total_seconds()
 
+def apply_lean_profile(options):
+    """
+    Configure Chrome options for scraping only: no extensions, images or background
+    services, minimal caches, and an eager page load that returns once the DOM is
+    parsed instead of waiting for every asset.
+
+    Args:
+        options (ChromeOptions): Options to modify in place.
+    """
+    options.page_load_strategy = "eager"
+    for argument in (
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--no-first-run",
+        "--mute-audio",
+        "--blink-settings=imagesEnabled=false",
+        "--disk-cache-size=1",
+        "--media-cache-size=1",
+    ):
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+
+def block_resources(driver, patterns=BROWSER_BLOCKED_URLS):
+    """
+    Block requests matching URL patterns (images, fonts, stylesheets, analytics) through
+    the Chrome DevTools Protocol, so they are never downloaded. The data table is part of
+    the HTML document itself, so what the Scraper extracts is unchanged.
+
+    Args:
+        driver (webdriver.Chrome): Driver to configure.
+        patterns (list): URL patterns with '*' wildcards.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": [p for p in patterns if p]})
+    except WebDriverException as e:
+        logger.warning(f"Could not enable resource blocking, loading pages in full: {e}")
+
 def initialize_driver():
     """
     Initialize the Selenium WebDriver with specified options.
 
+    With BROWSER_PROFILE "lean" (the default) the browser skips images, fonts, CSS and
+    analytics and returns pages as soon as the DOM is ready.
+
     Returns:
         webdriver.Chrome: Configured Selenium WebDriver instance.
     """
@@ -78,11 +132,16 @@ def initialize_driver():
         options.add_argument("--headless")
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
+    lean = BROWSER_PROFILE == "lean"
+    if lean:
+        apply_lean_profile(options)
     try:
         logger.info("Initializing headless Chrome driver at path: %s", str(CHROME_DRIVER_PATH))
         service = Service(str(CHROME_DRIVER_PATH))
         driver = webdriver.Chrome(service=service, options=options)
-        logger.info("Headless Chrome driver initialized successfully.")
+        if lean:
+            block_resources(driver)
+        logger.info("Headless Chrome driver initialized successfully (%s profile).", BROWSER_PROFILE)
         return driver
     except WebDriverException as e:
         logger.error(f"Error initializing WebDriver: {e}")
@@ -151,7 +210,7 @@ def verify_excel_file(file_path: Path, sheets: list):
 
 def count_records() -> pd.DataFrame:
     """
-    Count the actual number of well records records per state.
+    Count the actual number of well records records per state, from the cached database counts.
 
     Args:
 
@@ -159,17 +218,14 @@ def count_records() -> pd.DataFrame:
         pd.DataFrame: DataFrame with 'States/UT's' and 'Actual_Records'.
     """
     try:
-        panchayats_df = pd.read_excel(EXCEL_FILE, sheet_name="panchayats")
-        actual_counts = panchayats_df.groupby("States/UT's").size().reset_index(name='Actual_Records')
-        logger.info("Actual records counted per state.")
-        return actual_counts
+        return counts.state_counts.get()[["States/UT's", "Actual_Records"]]
     except Exception as e:
         logger.error(f"Error counting panchayat records: {e}")
         return pd.DataFrame()
 
 def get_expected_counts() -> pd.DataFrame:
     """
-    Retrieve the expected number of well records per state from the 'States/UT's' sheet.
+    Retrieve the expected number of well records per state from the states table.
 
     Args:
 
@@ -177,25 +233,19 @@ def get_expected_counts() -> pd.DataFrame:
         pd.DataFrame: DataFrame with 'States/UT's' and 'Expected_Records'.
     """
     try:
-        states_df = pd.read_excel(EXCEL_FILE, sheet_name="states")
-        expected_counts = states_df[["States/UT\'s", "No. of Well Covered"]].rename(
-            columns={'No. of Well Covered': 'Expected_Records'}
-        )
-        logger.info("Expected records retrieved from 'States/UT's' sheet.")
-        return expected_counts
+        return counts.state_counts.get()[["States/UT's", "Expected_Records"]]
     except Exception as e:
         logger.error(f"Error retrieving expected counts: {e}")
         return pd.DataFrame()
-    
+
 def get_db_connection():
-    return engine.connect()
+    return get_engine().connect()
 
 def get_db_session():
-    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    engine = create_engine(DATABASE_URL,echo=False)
-    
+    """Return the calling thread's session on the shared engine (see modules/db.py)."""
+    engine = get_engine()
+
     # Create tables if they don't exist
     Base.metadata.create_all(engine)
-    
-    Session = sessionmaker(bind=engine)
-    return Session()
\ No newline at end of file
+
+    return get_session()
\ No newline at end of file
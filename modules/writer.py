@@ -0,0 +1,205 @@
+# modules/writer.py
+
+import csv
+import io
+import threading
+import time
+import pandas as pd
+from sqlalchemy import inspect
+from config.settings import SEASON, WRITER_FLUSH_ROWS, WRITER_FLUSH_SECONDS, logger
+from modules import frontier
+from modules import schema
+from modules import progress
+from modules import metrics
+from modules import fingerprint
+from modules.coerce import coerce_types
+from modules import incremental as incremental_crawl
+
+# Held by writes that may create a table, so the writers of concurrent season crawls of a
+# fresh database don't both try to create it
+_create_lock = threading.Lock()
+
+
+def copy_insert(table, conn, keys, data_iter):
+    """
+    pandas.to_sql insertion method that streams rows through PostgreSQL COPY FROM STDIN.
+
+    Args:
+        table (pandas.io.sql.SQLTable): Table being written.
+        conn (sqlalchemy.engine.Connection): Connection inside the caller's transaction.
+        keys (list): Column names.
+        data_iter (iterable): Row value tuples.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+
+    quote = conn.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(key) for key in keys)
+    table_name = f"{quote(table.schema)}.{quote(table.name)}" if table.schema else quote(table.name)
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+class BufferedWriter:
+    """
+    Buffers scraped tables across pages and writes them in bulk.
+
+    Rows are flushed per level once WRITER_FLUSH_ROWS rows are buffered or the oldest
+    buffered page is WRITER_FLUSH_SECONDS old (checked as pages are added), and when
+    flush() or close() is called. On PostgreSQL a flush is a single COPY FROM STDIN;
+    other databases fall back to multi-row INSERTs.
+
+    Pages are converted to the column types of modules/coerce.py as they are buffered, and
+    rows are stored in the normalized layout of modules/schema.py: parent names are
+    replaced by the parent row's id, states rows are keyed by the writer's season, and
+    re-crawled states, districts and blocks update their existing rows instead of
+    duplicating them. A page the scraper found UNCHANGED since it was last saved
+    (modules/fingerprint.py) is not written; its task is only marked done. A changed page
+    that was saved before replaces its previous rows.
+
+    Each flush also enqueues the child pages of the written rows, marks the buffered
+    pages done in the crawl frontier, updates the crawl_progress rollup of the blocks
+    it touched (modules/progress.py) and stores the digests of the written pages, all
+    in one transaction. Pages still buffered when a run dies stay leased, and are
+    crawled again once the lease expires.
+    Not thread-safe: use it from a single writer thread (one writer per season).
+    """
+
+    def __init__(self, engine, incremental=False, flush_rows=WRITER_FLUSH_ROWS, flush_seconds=WRITER_FLUSH_SECONDS,
+                 season=SEASON):
+        """
+        Args:
+            engine (sqlalchemy.engine.Engine): Database engine.
+            incremental (bool): Replace each page's previous rows and requeue changed children.
+            flush_rows (int): Buffered rows per level that trigger a flush.
+            flush_seconds (float): Age of the oldest buffered page that triggers a flush.
+            season (str): Season the pages were crawled for.
+        """
+        self.engine = engine
+        self.incremental = incremental
+        self.season = season
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffers = {}   # level -> list of (task, table)
+        self._rows = {}      # level -> buffered row count
+        self._since = {}     # level -> time the oldest buffered page was added
+        self._digests = {}   # level -> {url: table digest} of the buffered pages
+        self.method = copy_insert if engine.dialect.name == "postgresql" else "multi"
+        self._tables = set()  # levels whose table is known to exist
+        with _create_lock:
+            progress.ensure_table(engine)
+            fingerprint.ensure_table(engine)
+
+    def add(self, level, task, table):
+        """
+        Buffer one scraped page.
+
+        Args:
+            level (str): "states", "districts", "blocks" or "panchayats", also the table name.
+            task (tuple): Parent names followed by the page URL.
+            table (pd.DataFrame | Exception): The page's table, the error that prevented scraping it,
+                or UNCHANGED.
+        """
+        if isinstance(table, Exception):
+            frontier.fail(self.engine, level, task[-1], table, season=self.season)
+            return
+        if table is not fingerprint.UNCHANGED:
+            digest = table.attrs.get(fingerprint.DIGEST_ATTR)
+            if digest is not None:
+                self._digests.setdefault(level, {})[task[-1]] = digest
+            table = coerce_types(level, table)
+        self._buffers.setdefault(level, []).append((task, table))
+        self._rows[level] = self._rows.get(level, 0) + (0 if table is fingerprint.UNCHANGED else len(table))
+        self._since.setdefault(level, time.monotonic())
+        if self._rows[level] >= self.flush_rows or time.monotonic() - self._since[level] >= self.flush_seconds:
+            self.flush(level)
+
+    def flush(self, level=None):
+        """Write the buffered pages of one level, or of every level when level is None."""
+        for name in ([level] if level is not None else list(self._buffers)):
+            batch = self._buffers.pop(name, [])
+            self._rows.pop(name, None)
+            self._since.pop(name, None)
+            digests = self._digests.pop(name, {})
+            if batch:
+                self._write(name, batch, digests)
+
+    def close(self):
+        """Flush everything still buffered."""
+        self.flush()
+
+    def _write(self, level, batch, digests):
+        if level in self._tables:
+            self._write_batch(level, batch, digests)
+            return
+        with _create_lock:
+            self._write_batch(level, batch, digests)
+            if inspect(self.engine).has_table(level):
+                self._tables.add(level)
+
+    def _write_batch(self, level, batch, digests):
+        start = time.monotonic()
+        unchanged = sum(table is fingerprint.UNCHANGED for _, table in batch)
+        pages = [(task, table) for task, table in batch if table is not fingerprint.UNCHANGED and not table.empty]
+        combined, orphans = pd.DataFrame(), set()
+        try:
+            with self.engine.begin() as conn:
+                ids = schema.parent_ids(conn, level, [task[:-1] for task, _ in pages], season=self.season)
+                # A page whose parent row isn't saved fails on its own; the rest of the batch is written
+                if level != "states":
+                    orphans = {task for task, _ in pages if tuple(task[:-1]) not in ids}
+                    pages = [(task, table) for task, table in pages if task not in orphans]
+                urls = [task[-1] for task, _ in batch if task not in orphans]
+                combined = pd.concat([table for _, table in pages], ignore_index=True) if pages else pd.DataFrame()
+                child_level, child_tasks = frontier.child_tasks(level, combined)
+                # Pages saved by an earlier run are replaced rather than appended to
+                resaved = set() if self.incremental or child_level is not None else fingerprint.saved_urls(
+                    conn, level, [task[-1] for task, _ in pages], season=self.season
+                )
+                rows, previous = [], {}
+                for task, table in pages:
+                    parent_id = self.season if level == "states" else ids[tuple(task[:-1])]
+                    stored = schema.to_storage(level, table, parent_id)
+                    if child_level is not None:
+                        # Rows with children are updated in place, keeping the ids their children reference
+                        previous[task] = incremental_crawl.load_previous(conn, level, parent_id)
+                        stored = incremental_crawl.update_previous(conn, level, previous[task], stored)
+                    elif self.incremental or task[-1] in resaved:
+                        incremental_crawl.delete_previous(conn, level, parent_id)
+                    rows.append(stored)
+                # Concatenating pages turns categoricals with different categories back into objects
+                rows = coerce_types(level, pd.concat(rows, ignore_index=True)) if rows else pd.DataFrame()
+                if not rows.empty:
+                    schema.ensure_table(conn, level, rows)
+                    rows.to_sql(level, conn, if_exists='append', index=False, method=self.method, chunksize=self.flush_rows)
+                if level == "blocks":
+                    progress.update(conn, district_ids=ids.values())
+                elif level == "panchayats":
+                    progress.update(conn, block_ids=ids.values())
+                frontier.enqueue(conn, child_level, child_tasks, season=self.season)
+                if self.incremental and child_level is not None:
+                    for task, table in pages:
+                        changed = incremental_crawl.changed_rows(level, previous[task], table)
+                        logger.info(f"{len(changed)} of {len(table)} {level} changed for {task[:-1]}.")
+                        frontier.requeue(conn, child_level, changed['URL'].dropna().tolist(), season=self.season)
+                written = set(urls)
+                fingerprint.save(conn, level, {url: digest for url, digest in digests.items() if url in written},
+                                 season=self.season)
+                frontier.complete(conn, level, urls, season=self.season)
+        except Exception as e:
+            logger.error(f"Error saving {len(batch)} {level} pages to postgres : {e}")
+            metrics.failures_total.inc(level=level, stage="persist")
+            for task, _ in batch:
+                frontier.fail(self.engine, level, task[-1], e, season=self.season)
+            return
+        for task in orphans:
+            error = LookupError(f"Parent row {task[:-1]} of a {level} page is not saved")
+            logger.error(f"Error saving {level} page {task[-1]} to postgres : {error}")
+            metrics.failures_total.inc(level=level, stage="persist")
+            frontier.fail(self.engine, level, task[-1], error, season=self.season)
+        elapsed = time.monotonic() - start
+        metrics.stage_seconds.observe(elapsed, level=level, stage="persist")
+        metrics.rows_written_total.inc(len(rows), level=level)
+        logger.info("Saved %d %s rows from %d pages (%d unchanged) to postgres in %.2fs.",
+                    len(combined), level, len(batch) - len(orphans), unchanged, elapsed)
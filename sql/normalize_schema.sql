@@ -0,0 +1,93 @@
+-- Migrate the tables written by earlier versions (parents repeated by name in every row)
+-- to the normalized layout of modules/schema.py: integer ids, foreign keys to the parent
+-- row, unique natural keys, indexes, and *_flat views restoring the parent names.
+-- Runs in one transaction; back up the database first, the parent name columns are dropped.
+--   psql -d <db> -f sql/normalize_schema.sql
+
+BEGIN;
+
+-- 1. Surrogate keys (sql/add_primary_keys.sql may already have added them)
+ALTER TABLE states ADD COLUMN IF NOT EXISTS id SERIAL;
+ALTER TABLE districts ADD COLUMN IF NOT EXISTS id SERIAL;
+ALTER TABLE blocks ADD COLUMN IF NOT EXISTS id SERIAL;
+ALTER TABLE panchayats ADD COLUMN IF NOT EXISTS id SERIAL;
+
+DO $$
+DECLARE t text;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['states', 'districts', 'blocks', 'panchayats'] LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = t::regclass AND contype = 'p') THEN
+            EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id)', t);
+        END IF;
+    END LOOP;
+END $$;
+
+-- 2. Parent ids, resolved from the parent names
+ALTER TABLE districts ADD COLUMN IF NOT EXISTS state_id INTEGER;
+UPDATE districts c SET state_id = s.id
+FROM states s
+WHERE s."States/UT's" = c."States/UT's" AND c.state_id IS NULL;
+
+ALTER TABLE blocks ADD COLUMN IF NOT EXISTS district_id INTEGER;
+UPDATE blocks c SET district_id = d.id
+FROM districts d JOIN states s ON s.id = d.state_id
+WHERE s."States/UT's" = c."States/UT's" AND d."District" = c."District" AND c.district_id IS NULL;
+
+-- Panchayat rows carry no district name, but their URL is the URL saved on their block row
+ALTER TABLE panchayats ADD COLUMN IF NOT EXISTS block_id INTEGER;
+UPDATE panchayats c SET block_id = b.id
+FROM blocks b
+WHERE b."URL" = c."URL" AND c.block_id IS NULL;
+
+-- 3. Merge rows repeating a natural key into the first one: the children of every duplicate
+--    (linked above to any of the copies) are repointed to the surviving row before the
+--    duplicates are deleted, so no child rows are lost. Then drop orphans and add the constraints.
+UPDATE districts c SET state_id = k.keep
+FROM (SELECT id, MIN(id) OVER (PARTITION BY "States/UT's") AS keep FROM states) k
+WHERE c.state_id = k.id AND k.id <> k.keep;
+DELETE FROM states a USING states b WHERE a."States/UT's" = b."States/UT's" AND a.id > b.id;
+
+UPDATE blocks c SET district_id = k.keep
+FROM (SELECT id, MIN(id) OVER (PARTITION BY state_id, "District") AS keep FROM districts) k
+WHERE c.district_id = k.id AND k.id <> k.keep;
+DELETE FROM districts a USING districts b WHERE a.state_id = b.state_id AND a."District" = b."District" AND a.id > b.id;
+
+UPDATE panchayats c SET block_id = k.keep
+FROM (SELECT id, MIN(id) OVER (PARTITION BY district_id, "Block") AS keep FROM blocks) k
+WHERE c.block_id = k.id AND k.id <> k.keep;
+DELETE FROM blocks a USING blocks b WHERE a.district_id = b.district_id AND a."Block" = b."Block" AND a.id > b.id;
+
+DELETE FROM districts WHERE state_id IS NULL;
+DELETE FROM blocks WHERE district_id IS NULL OR district_id NOT IN (SELECT id FROM districts);
+DELETE FROM panchayats WHERE block_id IS NULL OR block_id NOT IN (SELECT id FROM blocks);
+
+ALTER TABLE states ADD CONSTRAINT uq_states_natural_key UNIQUE ("States/UT's");
+ALTER TABLE districts ALTER COLUMN state_id SET NOT NULL,
+    ADD CONSTRAINT districts_state_id_fkey FOREIGN KEY (state_id) REFERENCES states (id),
+    ADD CONSTRAINT uq_districts_natural_key UNIQUE (state_id, "District");
+ALTER TABLE blocks ALTER COLUMN district_id SET NOT NULL,
+    ADD CONSTRAINT blocks_district_id_fkey FOREIGN KEY (district_id) REFERENCES districts (id),
+    ADD CONSTRAINT uq_blocks_natural_key UNIQUE (district_id, "Block");
+ALTER TABLE panchayats ALTER COLUMN block_id SET NOT NULL,
+    ADD CONSTRAINT panchayats_block_id_fkey FOREIGN KEY (block_id) REFERENCES blocks (id);
+CREATE INDEX IF NOT EXISTS ix_panchayats_block_id ON panchayats (block_id);
+
+-- 4. The parent names now live only in the parent tables
+ALTER TABLE districts DROP COLUMN IF EXISTS "States/UT's";
+ALTER TABLE blocks DROP COLUMN IF EXISTS "States/UT's", DROP COLUMN IF EXISTS "District";
+ALTER TABLE panchayats DROP COLUMN IF EXISTS "States/UT's", DROP COLUMN IF EXISTS "District", DROP COLUMN IF EXISTS "Block";
+
+-- 5. Views with the previous, denormalized layout, for reading and exports
+CREATE OR REPLACE VIEW districts_flat AS
+SELECT s."States/UT's", c.*
+FROM districts c JOIN states s ON s.id = c.state_id;
+
+CREATE OR REPLACE VIEW blocks_flat AS
+SELECT s."States/UT's", d."District", c.*
+FROM blocks c JOIN districts d ON d.id = c.district_id JOIN states s ON s.id = d.state_id;
+
+CREATE OR REPLACE VIEW panchayats_flat AS
+SELECT s."States/UT's", d."District", b."Block", c.*
+FROM panchayats c JOIN blocks b ON b.id = c.block_id JOIN districts d ON d.id = b.district_id JOIN states s ON s.id = d.state_id;
+
+COMMIT;
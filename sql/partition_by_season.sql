@@ -0,0 +1,41 @@
+-- Key the data of a database written by an earlier version by season, for the multi-season
+-- mode of main.py: states rows get a "season" column (districts, blocks and panchayats belong
+-- to the season of their state), the *_flat views expose it, and crawl tasks are kept per season.
+-- The rows already saved get the season passed as the psql variable "season" (use the SEASON
+-- setting they were crawled with). Runs in one transaction:
+--   psql -d <db> -v season=current -f sql/partition_by_season.sql
+
+BEGIN;
+
+-- 1. States are unique per season
+ALTER TABLE states ADD COLUMN IF NOT EXISTS season TEXT;
+UPDATE states SET season = :'season' WHERE season IS NULL;
+ALTER TABLE states ALTER COLUMN season SET NOT NULL,
+    DROP CONSTRAINT IF EXISTS uq_states_natural_key,
+    ADD CONSTRAINT uq_states_natural_key UNIQUE (season, "States/UT's");
+
+-- 2. Views with the season of every row
+DROP VIEW IF EXISTS panchayats_flat, blocks_flat, districts_flat;
+
+CREATE VIEW districts_flat AS
+SELECT s.season, s."States/UT's", c.*
+FROM districts c JOIN states s ON s.id = c.state_id;
+
+CREATE VIEW blocks_flat AS
+SELECT s.season, s."States/UT's", d."District", c.*
+FROM blocks c JOIN districts d ON d.id = c.district_id JOIN states s ON s.id = d.state_id;
+
+CREATE VIEW panchayats_flat AS
+SELECT s.season, s."States/UT's", d."District", b."Block", c.*
+FROM panchayats c JOIN blocks b ON b.id = c.block_id JOIN districts d ON d.id = b.district_id JOIN states s ON s.id = d.state_id;
+
+-- 3. Crawl tasks per season
+ALTER TABLE crawl_tasks ADD COLUMN IF NOT EXISTS season TEXT;
+UPDATE crawl_tasks SET season = :'season' WHERE season IS NULL;
+ALTER TABLE crawl_tasks ALTER COLUMN season SET NOT NULL,
+    DROP CONSTRAINT IF EXISTS uq_crawl_tasks_level_url,
+    ADD CONSTRAINT uq_crawl_tasks_season_level_url UNIQUE (season, level, url);
+DROP INDEX IF EXISTS ix_crawl_tasks_claim;
+CREATE INDEX ix_crawl_tasks_claim ON crawl_tasks (season, level, status, lease_expires);
+
+COMMIT;
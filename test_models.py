@@ -1,19 +1,10 @@
 # test_models.py
 
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from config.settings import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+from modules.db import get_session
 from models import Base, State, District, Block, Panchayat
 
-# Setup the database engine
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
-
-# Create a configured "Session" class
-Session = sessionmaker(bind=engine)
-
-# Create a session
-session = Session()
+# Create a session on the shared engine
+session = get_session()
 
 try:
     # Count records in each table
@@ -0,0 +1,126 @@
+# tests/test_async_crawl.py
+import threading
+import unittest
+from unittest.mock import patch
+from tenacity import stop_after_attempt
+from benchmarks.fixture_server import FixtureServer, TreeSpec
+from config.settings import TABLE_ID
+
+try:
+    import aiohttp
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from modules import async_crawl
+    from modules.async_crawl import AsyncCrawler
+except ImportError:
+    web = None
+
+
+def _table(header_tag, headers, rows):
+    header = "".join(f"<{header_tag}>{h}</{header_tag}>" for h in headers)
+    body = "".join("<tr>" + "".join(f"<td>{c}</td>" for c in row) + "</tr>" for row in rows)
+    return f'<html><body><table id="{TABLE_ID}"><tr class="header">{header}</tr>{body}</table></body></html>'
+
+
+async def states_page(request):
+    rows = [(i, f'<a href="District.aspx?s={i}">State{i}</a>', 4) for i in (1, 2)]
+    return web.Response(text=_table("td", ["S.No.", "States/UT's", "No. of Well Covered"], rows), content_type="text/html")
+
+
+async def districts_page(request):
+    s = request.query["s"]
+    rows = [(1, f'<a href="Block.aspx?s={s}&d=1">District{s}</a>', 4)]
+    return web.Response(text=_table("td", ["S.No.", "District", "No. of Well Covered"], rows), content_type="text/html")
+
+
+async def blocks_page(request):
+    s, d = request.query["s"], request.query["d"]
+    rows = [(i, f'<a href="Panchayat.aspx?s={s}&d={d}&b={i}">Block{s}{i}</a>', 2) for i in (1, 2)]
+    return web.Response(text=_table("td", ["S.No.", "Block", "No. of Well Covered"], rows), content_type="text/html")
+
+
+async def panchayats_page(request):
+    s, b = request.query["s"], request.query["b"]
+    rows = [(i, f"State{s}", f"Block{s}{b}", f"Panchayat{i}", "12.5") for i in (1, 2)]
+    headers = ["S.No.", "State", "Block", "Panchayat", "Pre Monsoon Water Level(In Feet)"]
+    return web.Response(text=_table("th", headers, rows), content_type="text/html")
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncCrawler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get("/Home.aspx", states_page)
+        app.router.add_get("/District.aspx", districts_page)
+        app.router.add_get("/Block.aspx", blocks_page)
+        app.router.add_get("/Panchayat.aspx", panchayats_page)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.base_url = str(self.server.make_url("/Home.aspx"))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_crawl_walks_every_level_with_scraper_columns(self):
+        """
+        Test that a full async crawl visits every page and yields the Scraper's column layout.
+        """
+        written = {}
+        writer_threads = set()
+
+        def write(level, task, df):
+            writer_threads.add(threading.current_thread().name)
+            written.setdefault(level, []).append(df)
+
+        async with AsyncCrawler(self.base_url, concurrency=5) as crawler:
+            await crawler.crawl(write)
+
+        self.assertEqual([len(written[level]) for level in ("states", "districts", "blocks", "panchayats")], [1, 2, 2, 4])
+        self.assertEqual(list(written["blocks"][0].columns), ["States/UT's", "District", "Block", "URL", "No. of Well Covered"])
+        panchayats = written["panchayats"][0]
+        self.assertEqual(list(panchayats.columns), ["States/UT's", "Block", "Panchayat", "Pre Monsoon Water Level(In Feet)", "URL"])
+        self.assertEqual(len(panchayats), 2)
+        self.assertEqual(len(writer_threads), 1)
+
+    async def test_crawl_level_reports_failed_task(self):
+        """
+        Test that a page without the data table is reported as an error instead of aborting the level.
+        """
+        results = []
+        # Fail fast instead of waiting out the exponential backoff
+        with patch.object(AsyncCrawler.fetch.retry, "stop", stop_after_attempt(1)):
+            async with AsyncCrawler(self.base_url, concurrency=5) as crawler:
+                    await crawler.crawl_level("districts", [("State1", str(self.server.make_url("/District.aspx?s=1"))),
+                                                        ("State9", str(self.server.make_url("/Missing.aspx")))],
+                                          lambda task, df: results.append((task[0], type(df).__name__)))
+        self.assertEqual(sorted(results), [("State1", "DataFrame"), ("State9", "FetchError")])
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestRunLevel(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer(TreeSpec(states=3, districts=2, panchayats=2)).start()
+        self.addCleanup(self.server.stop)
+
+    def test_batches_share_one_session_and_parse_off_the_loop(self):
+        """
+        Test that every claimed batch of a level is crawled by one HTTP session, with pages parsed on worker threads.
+        """
+        base = self.server.base_url.rsplit("/", 1)[0]
+        batches = [[(f"State {s}", f"{base}/District.aspx?s={s}")] for s in (1, 2, 3)]
+        written, parse_threads = [], set()
+        parse = async_crawl.parse_level_table
+
+        def record_thread(*args, **kwargs):
+            parse_threads.add(threading.current_thread())
+            return parse(*args, **kwargs)
+
+        with patch.object(aiohttp, "ClientSession", wraps=aiohttp.ClientSession) as session, \
+                patch.object(async_crawl, "parse_level_table", record_thread):
+            processed = async_crawl.run_level(self.server.base_url, "districts", iter(batches),
+                                              lambda task, df: written.append((task[0], len(df))))
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(sorted(written), [("State 1", 2), ("State 2", 2), ("State 3", 2)])
+        self.assertEqual(session.call_count, 1)
+        self.assertNotIn(threading.main_thread(), parse_threads)
@@ -0,0 +1,46 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from pandas.testing import assert_frame_equal
+from modules.parse import extract_table_rows_lxml, extract_table_rows_stdlib, lxml
+from benchmarks.bench_parse import compare_memory, make_page, measure_memory, parse
+
+
+class TestParserBenchmark(unittest.TestCase):
+
+    def test_make_page_rows(self):
+        for level in ("districts", "blocks", "panchayats"):
+            df = parse(make_page(level, 25), level, extract_table_rows_stdlib)
+            self.assertEqual(len(df), 25)
+
+    @unittest.skipIf(lxml is None, "lxml is not installed")
+    def test_strategies_agree(self):
+        for level in ("districts", "blocks", "panchayats"):
+            html = make_page(level, 50)
+            assert_frame_equal(parse(html, level, extract_table_rows_stdlib), parse(html, level, extract_table_rows_lxml))
+
+    def test_measure_memory(self):
+        measured = measure_memory(make_page("panchayats", 20), "panchayats", extract_table_rows_stdlib)
+        self.assertGreater(measured["peak_alloc_bytes"], 0)
+        self.assertGreater(measured["frame_bytes"], 0)
+
+    def test_compare_memory(self):
+        def run(frame_bytes):
+            return {"benchmarks": [
+                {"name": "test_parse[lxml-blocks-10]", "extra_info": {"peak_alloc_bytes": 1000, "frame_bytes": frame_bytes}},
+            ]}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline, current = Path(tmp) / "baseline.json", Path(tmp) / "current.json"
+            baseline.write_text(json.dumps(run(1000)))
+            current.write_text(json.dumps(run(1100)))
+            self.assertEqual(compare_memory(baseline, current, threshold=0.2), [])
+            current.write_text(json.dumps(run(1300)))
+            regressions = compare_memory(baseline, current, threshold=0.2)
+            self.assertEqual(len(regressions), 1)
+            self.assertIn("frame_bytes", regressions[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
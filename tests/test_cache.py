@@ -0,0 +1,89 @@
+# tests/test_cache.py
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from modules.cache import PageCache, CachedFetcher
+from modules.exceptions import CacheMiss
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_entries_are_keyed_by_season_and_expire(self):
+        """
+        Test that entries round-trip, are separated per season, and expire after the TTL.
+        """
+        cache = PageCache(self.tmp.name, season="post-monsoon-2023", ttl=60, max_bytes=0)
+        cache.put("http://example.com/a", "<table>a</table>")
+        self.assertEqual(cache.get("http://example.com/a"), "<table>a</table>")
+        self.assertIsNone(PageCache(self.tmp.name, season="pre-monsoon-2024").get("http://example.com/a"))
+
+        old = time.time() - 120
+        os.utime(cache.path("http://example.com/a"), (old, old))
+        self.assertIsNone(cache.get("http://example.com/a"))
+        self.assertEqual(cache.get("http://example.com/a", allow_stale=True), "<table>a</table>")
+
+    def test_oldest_entries_are_evicted_above_max_bytes(self):
+        """
+        Test that the cache drops its oldest pages once it grows past max_bytes.
+        """
+        cache = PageCache(self.tmp.name, season="s", ttl=0, max_bytes=2000)
+        for i in range(10):
+            cache.put(f"http://example.com/{i}", os.urandom(300).hex())
+            old = time.time() - 100 + i
+            os.utime(cache.path(f"http://example.com/{i}"), (old, old))
+        self.assertIsNone(cache.get("http://example.com/0"))
+        self.assertIsNotNone(cache.get("http://example.com/9"))
+
+    def test_season_caches_on_one_directory_share_its_size_limit(self):
+        """
+        Test that concurrent seasons' caches together stay below max_bytes, and files evicted by another don't fail a put.
+        """
+        caches = [PageCache(self.tmp.name, season=season, ttl=0, max_bytes=4000) for season in ("2023", "2024")]
+        for i in range(10):
+            for cache in caches:
+                cache.put(f"http://example.com/{i}", os.urandom(300).hex())
+        total = sum(entry.stat().st_size for entry in Path(self.tmp.name).glob("*/*.html.gz"))
+        self.assertLessEqual(total, 4000)
+
+        gone = Path(self.tmp.name) / "00" / "evicted-by-another-season.html.gz"
+        entries = list(caches[0]._entries()) + [gone]
+        with patch.object(PageCache, "_entries", return_value=iter(entries)):
+            caches[0].put("http://example.com/last", os.urandom(2000).hex())
+        self.assertIsNotNone(caches[0].get("http://example.com/last"))
+
+    def test_cached_fetcher_fills_cache_and_replays_offline(self):
+        """
+        Test that CachedFetcher only hits the network on a miss, and that replay mode never does.
+        """
+        cache = PageCache(self.tmp.name, season="s", ttl=0, max_bytes=0)
+        backend = MagicMock()
+        backend.fetch.return_value = "<table>page</table>"
+        fetcher = CachedFetcher(backend, cache)
+        self.assertEqual(fetcher.fetch("http://example.com/p", 10), "<table>page</table>")
+        self.assertEqual(fetcher.fetch("http://example.com/p", 10), "<table>page</table>")
+        backend.fetch.assert_called_once_with("http://example.com/p", 10)
+
+        replay = CachedFetcher(None, cache, offline=True)
+        self.assertEqual(replay.fetch("http://example.com/p", 10), "<table>page</table>")
+        with self.assertRaises(CacheMiss):
+            replay.fetch("http://example.com/other", 10)
+
+    def test_write_only_cache_stores_fetched_pages(self):
+        """
+        Test that a write-only cache always fetches from the network, but keeps the pages for a later replay.
+        """
+        PageCache(self.tmp.name, season="s", ttl=0, max_bytes=0).put("http://example.com/p", "<table>old</table>")
+        backend = MagicMock()
+        backend.fetch.return_value = "<table>new</table>"
+        fetcher = CachedFetcher(backend, PageCache(self.tmp.name, season="s", ttl=0, max_bytes=0, read=False))
+        self.assertEqual(fetcher.fetch("http://example.com/p", 10), "<table>new</table>")
+        backend.fetch.assert_called_once_with("http://example.com/p", 10)
+
+        replay = CachedFetcher(None, PageCache(self.tmp.name, season="s", ttl=0, max_bytes=0), offline=True)
+        self.assertEqual(replay.fetch("http://example.com/p", 10), "<table>new</table>")
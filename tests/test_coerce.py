@@ -0,0 +1,40 @@
+# tests/test_coerce.py
+import unittest
+import pandas as pd
+from modules.coerce import coerce_types, column_kinds
+
+
+class TestCoerceTypes(unittest.TestCase):
+    def test_panchayat_columns_get_compact_dtypes(self):
+        """
+        Test that one pass converts names, measurements, coordinates and dates, with unparseable values missing.
+        """
+        scraped = pd.DataFrame({
+            "States/UT's": ["S1", "S1", "S1"],
+            "Panchayat": ["P1", "P1", "P2"],
+            "Pre Monsoon Water Level(In Feet)": ["12.5", "", "n/a"],
+            "Pre Monsoon Latitude": ["28.6139391", "28.7", " 29.1 "],
+            "Pre Monsoon Date": ["31/05/2024", "01/06/2024", ""],
+            "URL": ["u", "u", "u"],
+        })
+        coerced = coerce_types("panchayats", scraped)
+
+        self.assertEqual(str(coerced["Panchayat"].dtype), "category")
+        self.assertEqual(coerced["Pre Monsoon Water Level(In Feet)"].dtype, "float32")
+        self.assertEqual(coerced["Pre Monsoon Water Level(In Feet)"].isna().tolist(), [False, True, True])
+        self.assertEqual(coerced["Pre Monsoon Latitude"].tolist(), [28.6139391, 28.7, 29.1])
+        self.assertEqual(coerced["Pre Monsoon Date"].dt.month.tolist()[:2], [5, 6])
+        self.assertTrue(pd.isna(coerced["Pre Monsoon Date"].iloc[2]))
+        self.assertEqual(coerced["URL"].dtype, scraped["URL"].dtype)
+        self.assertLess(coerced.memory_usage(deep=True).sum(), scraped.memory_usage(deep=True).sum())
+
+    def test_counts_become_nullable_ints_and_coercion_is_idempotent(self):
+        """
+        Test that count columns become nullable integers and that coercing twice changes nothing.
+        """
+        scraped = pd.DataFrame({"District": ["D1", "D2"], "No. of Well Covered": ["1,204", ""]})
+        self.assertEqual(column_kinds("districts", scraped.columns), {"District": "category", "No. of Well Covered": "int"})
+        coerced = coerce_types("districts", scraped)
+        self.assertEqual(str(coerced["No. of Well Covered"].dtype), "Int32")
+        self.assertEqual(coerced["No. of Well Covered"].iloc[0], 1204)
+        pd.testing.assert_frame_equal(coerce_types("districts", coerced), coerced)
@@ -0,0 +1,78 @@
+# tests/test_counts.py
+import time
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from config.settings import SEASON
+from modules import frontier
+from modules.counts import CountCache, query_state_counts
+from modules.writer import BufferedWriter
+
+
+def _panchayats(names):
+    return pd.DataFrame({"States/UT's": "S1", "Block": "B1", "Panchayat": names, "URL": "b1"})
+
+
+class TestCountCache(unittest.TestCase):
+    def setUp(self):
+        # One shared connection, so the background refresh thread sees the same in-memory database
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        frontier.ensure_table(self.engine)
+        self.writer = BufferedWriter(self.engine)
+        self.writer.add("states", ("base",), pd.DataFrame({
+            "States/UT's": ["S1", "S2"], "No. of Well Covered": ["3", "5"], "URL": ["s1", "s2"],
+        }))
+        self.writer.add("districts", ("S1", "s1"), pd.DataFrame({"States/UT's": "S1", "District": ["D1"], "URL": ["d1"]}))
+        self.writer.add("blocks", ("S1", "D1", "d1"), pd.DataFrame({
+            "States/UT's": "S1", "District": "D1", "Block": ["B1"], "URL": ["b1"],
+        }))
+        self.writer.add("panchayats", ("S1", "D1", "B1", "b1"), _panchayats(["P1", "P2"]))
+        self.writer.close()
+
+    def test_counts_come_from_the_database(self):
+        """
+        Test that expected and actual records are aggregated per state, including states without rows.
+        """
+        with self.engine.connect() as conn:
+            counts = query_state_counts(conn).set_index("States/UT's")
+        self.assertEqual(counts.loc["S1"].tolist(), [3, 2])
+        self.assertEqual(counts.loc["S2"].tolist(), [5, 0])
+
+    def test_every_season_is_counted_by_the_cache(self):
+        """
+        Test that the dashboard's counts cover every season, so one can be picked from them.
+        """
+        writer = BufferedWriter(self.engine, season="2024")
+        writer.add("states", ("base",), pd.DataFrame({"States/UT's": ["S1"], "No. of Well Covered": ["4"], "URL": ["s1"]}))
+        writer.close()
+
+        counts = CountCache(self.engine).get()
+        self.assertEqual(counts.columns.tolist(), ["season", "States/UT's", "Expected_Records", "Actual_Records"])
+        by_season = counts.groupby("season")["Expected_Records"].sum().to_dict()
+        self.assertEqual(by_season, {SEASON: 8, "2024": 4})
+
+    def test_results_are_cached_until_the_data_changes(self):
+        """
+        Test that the query runs once per data change, and that a change is picked up after the TTL.
+        """
+        calls = []
+
+        def query(conn):
+            calls.append(1)
+            return query_state_counts(conn)
+
+        cache = CountCache(self.engine, ttl=0, query=query)
+        cache.get()
+        cache.get()
+        self.assertEqual(len(calls), 1)
+
+        self.writer.add("panchayats", ("S1", "D1", "B1", "b1"), _panchayats(["P3"]))
+        self.writer.close()
+        cache.get()  # serves the stale result and refreshes in the background
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        actual = cache.get().set_index("States/UT's").loc["S1", "Actual_Records"]
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(actual, 3)
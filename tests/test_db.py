@@ -0,0 +1,34 @@
+# tests/test_db.py
+import threading
+import unittest
+from modules import db
+from config.settings import DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+
+class TestSharedEngine(unittest.TestCase):
+    def tearDown(self):
+        db.dispose()
+
+    def test_engine_is_shared_and_pooled(self):
+        """
+        Test that every caller gets the same configured engine, without connecting to the database.
+        """
+        engine = db.get_engine()
+        self.assertIs(db.get_engine(), engine)
+        self.assertEqual(engine.dialect.driver, "psycopg2")
+        self.assertEqual(engine.pool.size(), DB_POOL_SIZE)
+        self.assertEqual(engine.pool._max_overflow, DB_MAX_OVERFLOW)
+        self.assertTrue(engine.pool._pre_ping)
+
+    def test_sessions_are_scoped_per_thread(self):
+        """
+        Test that a thread reuses its own session and other threads get different ones.
+        """
+        main_session = db.get_session()
+        self.assertIs(db.get_session(), main_session)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db.get_session()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], main_session)
+        self.assertIs(main_session.get_bind(), db.get_engine())
@@ -0,0 +1,72 @@
+# tests/test_export.py
+import tempfile
+import unittest
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import create_engine
+from modules import frontier
+from modules.writer import BufferedWriter
+
+try:
+    from modules.export import export_dataset, pa
+except ImportError:
+    pa = None
+
+
+def _panchayats(state, block, names):
+    return pd.DataFrame({
+        "States/UT's": state, "Block": block, "Panchayat": names,
+        "Pre Monsoon Water Level(In Feet)": ["12.5"] * len(names), "URL": f"http://example.com/{block}",
+    })
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestParquetExport(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+        self.writer = BufferedWriter(self.engine, season="2024")
+        self.writer.add("states", ("base",), pd.DataFrame({"States/UT's": ["S1", "S2"], "URL": ["s1", "s2"]}))
+        self.writer.add("districts", ("S1", "s1"), pd.DataFrame({"States/UT's": "S1", "District": ["D1"], "URL": ["d1"]}))
+        self.writer.add("districts", ("S2", "s2"), pd.DataFrame({"States/UT's": "S2", "District": ["D2"], "URL": ["d2"]}))
+        self.writer.add("blocks", ("S1", "D1", "d1"), pd.DataFrame({"States/UT's": "S1", "District": "D1", "Block": ["B1"], "URL": ["b1"]}))
+        self.writer.add("blocks", ("S2", "D2", "d2"), pd.DataFrame({"States/UT's": "S2", "District": "D2", "Block": ["B2"], "URL": ["b2"]}))
+        self.writer.add("panchayats", ("S1", "D1", "B1", "b1"), _panchayats("S1", "B1", ["P1", "P2"]))
+        self.writer.add("panchayats", ("S2", "D2", "B2", "b2"), _panchayats("S2", "B2", ["P3"]))
+        self.writer.close()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.out = Path(self.tmp.name)
+
+    def test_partitions_are_readable_and_only_changed_ones_rewritten(self):
+        """
+        Test that the export writes typed, state-partitioned Parquet and skips unchanged partitions next time.
+        """
+        self.assertEqual(export_dataset(self.engine, self.out, season="2024")["panchayats"], 2)
+
+        s1 = pd.read_parquet(self.out / "panchayats", filters=[("state", "=", "S1")])
+        self.assertEqual(sorted(s1["Panchayat"]), ["P1", "P2"])
+        self.assertEqual(set(s1["District"]), {"D1"})
+        self.assertEqual(str(s1["Pre Monsoon Water Level(In Feet)"].dtype), "float32")
+
+        self.writer.add("panchayats", ("S2", "D2", "B2", "b2"), _panchayats("S2", "B2", ["P4"]))
+        self.writer.close()
+        rewritten = export_dataset(self.engine, self.out, season="2024")
+        self.assertEqual(rewritten["panchayats"], 1)
+        self.assertEqual(rewritten["districts"], 0)
+        s2 = pd.read_parquet(self.out / "panchayats", filters=[("state", "=", "S2")])
+        self.assertEqual(sorted(s2["Panchayat"]), ["P3", "P4"])
+
+    def test_values_updated_in_place_are_exported_again(self):
+        """
+        Test that a districts row re-crawled in place, keeping its id and the row count, is rewritten by the next export.
+        """
+        export_dataset(self.engine, self.out, season="2024")
+        self.writer.add("districts", ("S1", "s1"), pd.DataFrame({"States/UT's": "S1", "District": ["D1"], "URL": ["d1?v=2"]}))
+        self.writer.close()
+
+        rewritten = export_dataset(self.engine, self.out, season="2024")
+        self.assertEqual(rewritten["districts"], 1)
+        self.assertEqual(rewritten["blocks"], 0)
+        s1 = pd.read_parquet(self.out / "districts", filters=[("state", "=", "S1")])
+        self.assertEqual(s1["URL"].tolist(), ["d1?v=2"])
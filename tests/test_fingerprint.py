@@ -0,0 +1,117 @@
+# tests/test_fingerprint.py
+import unittest
+from unittest import mock
+import pandas as pd
+from sqlalchemy import create_engine
+from config.settings import TABLE_ID
+from modules import fingerprint, frontier
+from modules.fetch import Fetcher
+from modules.fingerprint import DIGEST_ATTR, UNCHANGED, PageFingerprints, table_digest
+from modules.scrape import Scraper
+from modules.writer import BufferedWriter
+
+URL = "http://example.com/Panchayat.aspx?b=1"
+
+
+def _page(panchayats, view_state="abc"):
+    rows = "".join(f"<tr>\n  <td>{i}</td><td>S1</td><td>B1</td><td>{name}</td>\n</tr>" for i, name in enumerate(panchayats, 1))
+    return (
+        f'<html><input type="hidden" name="__VIEWSTATE" value="{view_state}">'
+        f'<table id="{TABLE_ID}"><tr class="header"><th>S.No.</th><th>State</th><th>Block</th><th>Panchayat</th></tr>'
+        f"{rows}</table></html>"
+    )
+
+
+class _Pages(Fetcher):
+    def __init__(self, html):
+        self.html = html
+
+    def fetch(self, url, timeout):
+        return self.html
+
+
+class TestTableDigest(unittest.TestCase):
+    def test_digest_covers_only_the_data_table(self):
+        """
+        Test that the digest ignores the rest of the page and whitespace, but not the table's cells.
+        """
+        digest = table_digest(_page(["P1", "P2"]))
+        self.assertEqual(table_digest(_page(["P1", "P2"], view_state="changed")), digest)
+        self.assertEqual(table_digest(_page(["P1", "P2"]).replace("\n", "\n\n    ")), digest)
+        self.assertNotEqual(table_digest(_page(["P1", "P3"])), digest)
+        self.assertIsNone(table_digest("<html><table id='other'></table></html>"))
+
+    def test_nested_tables_are_part_of_the_digest(self):
+        """
+        Test that the digest runs to the data table's own closing tag, past any nested table.
+        """
+        page = f'<table id="{TABLE_ID}"><tr><td><table><tr><td>x</td></tr></table></td><td>{{}}</td></tr></table><p>{{}}</p>'
+        self.assertNotEqual(table_digest(page.format("1", "a")), table_digest(page.format("2", "a")))
+        self.assertEqual(table_digest(page.format("1", "a")), table_digest(page.format("1", "b")))
+
+
+class TestUnchangedPages(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+        writer = BufferedWriter(self.engine)
+        writer.add("states", ("base",), pd.DataFrame({"States/UT's": ["S1"], "URL": ["s1"]}))
+        writer.add("districts", ("S1", "s1"), pd.DataFrame({"States/UT's": "S1", "District": ["D1"], "URL": ["d1"]}))
+        writer.add("blocks", ("S1", "D1", "d1"), pd.DataFrame({
+            "States/UT's": "S1", "District": "D1", "Block": ["B1"], "URL": [URL],
+        }))
+        writer.close()
+
+    def _crawl(self, html):
+        """One run crawling the block's panchayats page again."""
+        with self.engine.begin() as conn:
+            frontier.requeue(conn, "panchayats", [URL])
+        task = frontier.claim(self.engine, "panchayats")[0]
+        scraper = Scraper(_Pages(html), "base", policy=None, fingerprints=PageFingerprints(self.engine))
+        table = scraper.get_panchayats(*task)
+        writer = BufferedWriter(self.engine)
+        writer.add("panchayats", task, table)
+        writer.close()
+        return table
+
+    def _panchayats(self):
+        with self.engine.connect() as conn:
+            return pd.read_sql("SELECT Panchayat FROM panchayats ORDER BY id", conn)["Panchayat"].tolist()
+
+    def test_unchanged_pages_are_not_parsed_or_written(self):
+        """
+        Test that a page whose table was saved before is skipped after the fetch, and its task settled.
+        """
+        table = self._crawl(_page(["P1", "P2"]))
+        self.assertEqual(table.attrs[DIGEST_ATTR], table_digest(_page(["P1", "P2"])))
+
+        with mock.patch("modules.scrape.parse_level_table") as parse:
+            self.assertIs(self._crawl(_page(["P1", "P2"], view_state="new")), UNCHANGED)
+        parse.assert_not_called()
+        self.assertEqual(self._panchayats(), ["P1", "P2"])
+        self.assertEqual(frontier.outstanding(self.engine, "panchayats"), 0)
+
+    def test_changed_pages_replace_their_rows(self):
+        """
+        Test that a changed page is saved again in place of its previous rows, with its new digest.
+        """
+        self._crawl(_page(["P1", "P2"]))
+        self._crawl(_page(["P1", "P2", "P3"]))
+        self.assertEqual(self._panchayats(), ["P1", "P2", "P3"])
+        with self.engine.connect() as conn:
+            self.assertEqual(fingerprint.load(conn, "panchayats"), {URL: table_digest(_page(["P1", "P2", "P3"]))})
+
+    def test_only_configured_levels_are_checked(self):
+        """
+        Test that pages of other levels are neither digested nor skipped, and invalidated pages are parsed and replaced.
+        """
+        self._crawl(_page(["P1", "P2"]))
+        self.assertEqual(PageFingerprints(self.engine, levels=["blocks"]).check("panchayats", URL, _page(["P1", "P2"])),
+                         (None, False))
+        self.assertEqual(fingerprint.invalidate(self.engine, level="panchayats"), 1)
+        self.assertIsInstance(self._crawl(_page(["P1", "P2"])), pd.DataFrame)
+        self.assertEqual(self._panchayats(), ["P1", "P2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# tests/test_fixture_server.py
+import unittest
+from benchmarks.fixture_server import FixtureServer, TreeSpec
+from modules.fetch import HttpFetcher
+from modules.scrape import Scraper
+
+
+class TestFixtureServer(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer(TreeSpec(states=2, districts=2, blocks=2, panchayats=3)).start()
+        self.addCleanup(self.server.stop)
+        self.fetcher = HttpFetcher()
+        self.addCleanup(self.fetcher.close)
+        self.scraper = Scraper(self.fetcher, self.server.base_url, policy=None)
+
+    def test_pages_parse_like_the_live_site(self):
+        """
+        Test that the synthesized pages walk down to panchayat rows with the scraper's column layout.
+        """
+        states = self.scraper.get_states()
+        self.assertEqual(list(states.columns), ["States/UT's", "URL", "No. of Well Covered", "No. of Panchayat Covered"])
+        self.assertEqual(states["No. of Well Covered"].tolist(), ["12", "12"])
+
+        districts = self.scraper.get_districts("State 1", states["URL"][0])
+        blocks = self.scraper.get_blocks("State 1", "District 1-1", districts["URL"][0])
+        panchayats = self.scraper.get_panchayats("State 1", "District 1-1", "Block 1-1-1", blocks["URL"][0])
+
+        self.assertEqual(len(panchayats), 3)
+        self.assertEqual(panchayats["States/UT's"].unique().tolist(), ["State 1"])
+        self.assertNotIn("Image", panchayats.columns)
+        self.assertEqual(self.server.served, 4)
+
+    def test_errors_are_injected(self):
+        """
+        Test that with an error rate of 1 every page fails with an HTTP error.
+        """
+        self.server.spec.error_rate = 1.0
+        with self.assertRaises(Exception):
+            self.fetcher.fetch(self.server.base_url, 5)
+        self.assertEqual(self.server.errors, 1)
@@ -0,0 +1,77 @@
+# tests/test_frontier.py
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine
+from modules import frontier
+
+
+class TestCrawlFrontier(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+
+    def test_claimed_tasks_are_leased_once_and_completed(self):
+        """
+        Test that enqueued tasks are claimed in batches, never twice, and leave the frontier when done.
+        """
+        # Arrange
+        blocks = pd.DataFrame({
+            "States/UT's": ["S1", "S1", "S1"],
+            "District": ["D1", "D1", "D1"],
+            "Block": ["B1", "B2", "B3"],
+            "URL": ["u1", "u2", "u3"],
+        })
+        with self.engine.begin() as conn:
+            frontier.enqueue(conn, *frontier.child_tasks("blocks", blocks))
+            frontier.enqueue(conn, *frontier.child_tasks("blocks", blocks))  # duplicates are ignored
+
+        # Act
+        first = frontier.claim(self.engine, "panchayats", batch_size=2)
+        second = frontier.claim(self.engine, "panchayats", batch_size=2)
+        third = frontier.claim(self.engine, "panchayats", batch_size=2)
+
+        # Assert
+        self.assertEqual(first, [("S1", "D1", "B1", "u1"), ("S1", "D1", "B2", "u2")])
+        self.assertEqual(second, [("S1", "D1", "B3", "u3")])
+        self.assertEqual(third, [])
+        with self.engine.begin() as conn:
+            frontier.complete(conn, "panchayats", ["u1"])
+        self.assertEqual(frontier.outstanding(self.engine, "panchayats"), 2)
+
+    def test_failed_task_is_retried_then_given_up(self):
+        """
+        Test that a failed task returns to the frontier until it runs out of attempts.
+        """
+        with self.engine.begin() as conn:
+            frontier.enqueue(conn, "districts", [("S1", "u1")])
+        for _ in range(frontier.FRONTIER_MAX_ATTEMPTS):
+            self.assertEqual(frontier.claim(self.engine, "districts"), [("S1", "u1")])
+            frontier.fail(self.engine, "districts", "u1", "timeout")
+        self.assertEqual(frontier.claim(self.engine, "districts"), [])
+        self.assertEqual(frontier.outstanding(self.engine, "districts"), 0)
+
+    def test_expired_lease_of_the_last_attempt_fails_the_task(self):
+        """
+        Test that a task whose worker died on its last attempt is failed when the lease expires, instead of staying leased.
+        """
+        with self.engine.begin() as conn:
+            frontier.enqueue(conn, "districts", [("S1", "u1")])
+        for _ in range(frontier.FRONTIER_MAX_ATTEMPTS - 1):
+            frontier.claim(self.engine, "districts", lease_seconds=0)
+        # The last attempt's worker crashes without calling fail()
+        self.assertEqual(frontier.claim(self.engine, "districts", lease_seconds=0), [("S1", "u1")])
+        self.assertEqual(frontier.claim(self.engine, "districts"), [])
+        self.assertEqual(frontier.outstanding(self.engine, "districts"), 0)
+        self.assertEqual(frontier.status_counts(self.engine)["districts"], {"failed": 1})
+
+    def test_seed_marks_pages_with_saved_rows_done(self):
+        """
+        Test that seeding from an existing database only leaves pages without saved children pending.
+        """
+        pd.DataFrame({"id": [1, 2], "season": frontier.SEASON, "States/UT's": ["S1", "S2"], "URL": ["u1", "u2"]}) \
+            .to_sql("states", self.engine, index=False)
+        pd.DataFrame({"id": [1], "state_id": [1], "District": ["D1"], "URL": ["d1"]}).to_sql("districts", self.engine, index=False)
+
+        self.assertEqual(frontier.seed_from_parent(self.engine, "districts"), 2)
+        self.assertEqual(frontier.seed_from_parent(self.engine, "districts"), 0)
+        self.assertEqual(frontier.claim(self.engine, "districts"), [("S2", "u2")])
@@ -0,0 +1,49 @@
+# tests/test_incremental.py
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine
+from modules.incremental import changed_rows, load_previous, delete_previous, update_previous
+
+
+class TestIncrementalCrawl(unittest.TestCase):
+    def test_only_rows_with_changed_counts_are_returned(self):
+        """
+        Test that rows are flagged when a count changed or the row is new, comparing counts numerically.
+        """
+        previous = pd.DataFrame({
+            "States/UT's": ["S1"] * 3, "District": ["D1", "D2", "D3"],
+            "No. of Well Covered": [10, 20, 30], "No. of Panchayat Covered": [1.0, 2.0, 3.0],
+        })
+        current = pd.DataFrame({
+            "States/UT's": ["S1"] * 4, "District": ["D1", "D2", "D3", "D4"], "URL": ["u1", "u2", "u3", "u4"],
+            "No. of Well Covered": ["10", "21", "30", "5"], "No. of Panchayat Covered": ["1", "2", "3", "1"],
+        })
+        changed = changed_rows("districts", previous, current)
+        self.assertEqual(changed["District"].tolist(), ["D2", "D4"])
+
+    def test_previous_rows_of_one_page_are_loaded_and_replaced(self):
+        """
+        Test that only the rows of the re-crawled page are read and deleted.
+        """
+        engine = create_engine("sqlite://")
+        pd.DataFrame({"id": [1, 2, 3], "district_id": [1, 1, 2], "Block": ["B1", "B2", "B3"]}) \
+            .to_sql("blocks", engine, index=False)
+        with engine.begin() as conn:
+            self.assertEqual(load_previous(conn, "blocks", 1)["Block"].tolist(), ["B1", "B2"])
+            self.assertEqual(delete_previous(conn, "blocks", 1), 2)
+            self.assertEqual(load_previous(conn, "blocks")["Block"].tolist(), ["B3"])
+            self.assertTrue(load_previous(conn, "panchayats").empty)
+
+    def test_existing_rows_are_updated_in_place(self):
+        """
+        Test that re-crawled rows keep their ids and only new rows are left to insert.
+        """
+        engine = create_engine("sqlite://")
+        pd.DataFrame({"id": [1, 2], "state_id": [1, 1], "District": ["D1", "D2"], "No. of Well Covered": [10, 20]}) \
+            .to_sql("districts", engine, index=False)
+        current = pd.DataFrame({"state_id": [1, 1], "District": ["D2", "D3"], "No. of Well Covered": [25, 5]})
+        with engine.begin() as conn:
+            new_rows = update_previous(conn, "districts", load_previous(conn, "districts", 1), current)
+            saved = load_previous(conn, "districts", 1)
+        self.assertEqual(new_rows["District"].tolist(), ["D3"])
+        self.assertEqual(saved.set_index("id")["No. of Well Covered"].to_dict(), {1: 10, 2: 25})
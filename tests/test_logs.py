@@ -0,0 +1,96 @@
+# tests/test_logs.py
+import gzip
+import logging
+import logging.handlers
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from config.settings import _gzip_namer, _gzip_rotator
+from modules.logs import LogIndex, log_files, tail
+
+
+def _line(i, level="INFO", state="Goa"):
+    return f"2024-01-01 00:00:00 - scrape - config.settings - {level} - Saved page {i} of {state}\n"
+
+
+class TestLogTail(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "jaldoot.log"
+        lines = [_line(i, "ERROR" if i == 500 else "INFO", "Kerala" if i % 100 == 0 else "Goa") for i in range(1000)]
+        self.path.write_text("".join(lines))
+
+    def test_tail_and_filters(self):
+        """
+        Test the last lines, a level filter and a text filter, with and without the index.
+        """
+        index = LogIndex(self.path, chunk_bytes=4096)
+        for kwargs in ({}, {"index": index}):
+            last = tail(self.path, lines=3, **kwargs)
+            self.assertEqual([line.split("Saved page ")[1] for line in last], ["997 of Goa", "998 of Goa", "999 of Goa"])
+            errors = tail(self.path, lines=10, min_level="WARNING", **kwargs)
+            self.assertEqual(len(errors), 1)
+            self.assertIn("page 500 ", errors[0])
+            kerala = tail(self.path, lines=2, contains="kerala", **kwargs)
+            self.assertEqual([line.split("Saved page ")[1] for line in kerala], ["800 of Kerala", "900 of Kerala"])
+
+    def test_index_is_incremental_and_restarts_after_rotation(self):
+        """
+        Test that appended lines are indexed without rereading the file, and that a rotated file is indexed anew.
+        """
+        index = LogIndex(self.path, chunk_bytes=4096)
+        size = index.update()
+        self.assertEqual(index.indexed_bytes, size)
+        self.assertEqual(sum(chunk[2] for chunk in index.chunks), 1000)
+        self.assertEqual(len(index.ranges("ERROR")), 1)
+
+        with open(self.path, "a") as f:
+            f.write(_line(1000, "WARNING"))
+        chunks = len(index.chunks)
+        index.update()
+        self.assertEqual(len(index.chunks), chunks + 1)
+        # A new index instance picks up the saved one
+        self.assertEqual(LogIndex(self.path, chunk_bytes=4096).chunks, index.chunks)
+
+        self.path.unlink()
+        self.path.write_text(_line(0, "CRITICAL"))
+        index.update()
+        self.assertEqual(len(index.chunks), 1)
+        self.assertEqual(tail(self.path, min_level="ERROR", index=index)[0], _line(0, "CRITICAL").rstrip("\n"))
+
+    def test_rotated_archives_are_compressed(self):
+        """
+        Test that the rotating handler of the settings gzips archives, and that they are listed newest first.
+        """
+        handler = logging.handlers.RotatingFileHandler(self.path, maxBytes=100, backupCount=2)
+        handler.namer, handler.rotator = _gzip_namer, _gzip_rotator
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "x" * 80, None, None)
+        for _ in range(3):
+            handler.emit(record)
+        handler.close()
+
+        files = log_files(self.path)
+        self.assertEqual([path.name for path in files], ["jaldoot.log", "jaldoot.log.1.gz", "jaldoot.log.2.gz"])
+        self.assertEqual(gzip.decompress(files[1].read_bytes()), b"x" * 80 + b"\n")
+
+    def test_only_the_crawler_writes_the_log_file(self):
+        """
+        Test that importing the settings doesn't open the log file, and that setup_file_logging writes it.
+        """
+        self.path.unlink()
+        env = dict(os.environ, LOG_FILE=str(self.path))
+        log = "from config import settings; {}settings.logger.info('written'); logging.getLogger('lib').warning('library')"
+        root = Path(__file__).resolve().parents[1]
+        subprocess.run([sys.executable, "-c", "import logging; " + log.format("")], cwd=root, env=env, check=True,
+                       stderr=subprocess.DEVNULL)
+        self.assertFalse(self.path.exists())
+
+        subprocess.run([sys.executable, "-c", "import logging; " + log.format("settings.setup_file_logging(); ")],
+                       cwd=root, env=env, check=True, stderr=subprocess.DEVNULL)
+        written = self.path.read_text()
+        self.assertIn("INFO - written", written)
+        self.assertIn("WARNING - library", written)
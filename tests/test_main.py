@@ -0,0 +1,50 @@
+# tests/test_main.py
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from benchmarks.fixture_server import FixtureServer, TreeSpec
+from benchmarks.run import ROOT, count_rows, crawl_env
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="jaldoot-test-")
+        self.addCleanup(tmp.cleanup)
+        self.workdir = Path(tmp.name)
+        self.database_url = f"sqlite:///{self.workdir / 'crawl.db'}"
+        self.spec = TreeSpec(states=2, districts=2, blocks=2, panchayats=3)
+
+    def _main(self, base_url, *args):
+        env = crawl_env(base_url, self.database_url, self.workdir, {"CACHE_ENABLED": "True", "SCRAPER_WORKERS": "2"})
+        process = subprocess.run([sys.executable, str(ROOT / "main.py"), *args], cwd=ROOT, env=env,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
+        self.assertEqual(process.returncode, 0, process.stderr.decode(errors="replace")[-2000:])
+
+    def test_replay_rebuilds_cleared_tables_from_the_cache(self):
+        """
+        Test that after clearing a table, a replay crawls every cached page again and restores its rows, offline.
+        """
+        with FixtureServer(self.spec) as server:
+            base_url = server.base_url
+            self._main(base_url)
+        crawled = count_rows(self.database_url)
+        self.assertEqual(crawled["panchayats"], self.spec.wells)
+
+        engine = create_engine(self.database_url)
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM panchayats"))
+        engine.dispose()
+
+        # The site is gone: every page has to come from the page cache
+        self._main(base_url, "--replay")
+        self.assertEqual(count_rows(self.database_url), crawled)
+        # Replaying again replaces the rows instead of adding to them
+        self._main(base_url, "--replay")
+        self.assertEqual(count_rows(self.database_url), crawled)
+
+
+if __name__ == "__main__":
+    unittest.main()
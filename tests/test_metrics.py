@@ -0,0 +1,69 @@
+# tests/test_metrics.py
+import json
+import threading
+import unittest
+import urllib.request
+from unittest.mock import MagicMock, patch
+import pandas as pd
+from modules import metrics
+from modules.fetch import Fetcher
+from modules.scrape import Scraper
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        """
+        Test the Prometheus text format of a labelled histogram and counter.
+        """
+        registry = metrics.Registry()
+        histogram = registry.register(metrics.Histogram("t_seconds", "Test.", ["level"], buckets=(1, 5)))
+        counter = registry.register(metrics.Counter("t_total", "Test.", ["level"]))
+        histogram.observe(0.5, level="blocks")
+        histogram.observe(3, level="blocks")
+        counter.inc(level='say "hi"')
+
+        text = registry.render()
+        self.assertIn('t_seconds_bucket{level="blocks",le="1.0"} 1', text)
+        self.assertIn('t_seconds_bucket{level="blocks",le="5.0"} 2', text)
+        self.assertIn('t_seconds_bucket{level="blocks",le="+Inf"} 2', text)
+        self.assertIn('t_seconds_sum{level="blocks"} 3.5', text)
+        self.assertIn('t_total{level="say \\"hi\\""} 1', text)
+        self.assertIn("# TYPE t_seconds histogram", text)
+
+    def test_scraper_records_stages_per_level_and_state(self):
+        """
+        Test that a scraped page records its fetch, parse time and rows under its level and state.
+        """
+        fetcher = MagicMock(spec=Fetcher)
+        fetcher.cached.return_value = None
+
+        def fetch(url, timeout):
+            with metrics.timer("navigate"):
+                return "<table id='t'></table>"
+        fetcher.fetch.side_effect = fetch
+
+        parsed = pd.DataFrame({"Block": ["B1", "B2"], "URL": ["b1", "b2"]})
+        with patch("modules.scrape.parse_level_table", return_value=parsed):
+            Scraper(fetcher, "http://example.com", policy=None).get_blocks("Metrics State", "D1", "url")
+
+        labels = {"level": "blocks", "state": "Metrics State"}
+        self.assertEqual(metrics.stage_seconds.count(stage="navigate", **labels), 1)
+        self.assertEqual(metrics.stage_seconds.count(stage="parse", **labels), 1)
+        self.assertEqual(metrics.rows_per_page.count(**labels), 1)
+        self.assertEqual(metrics.pages_total.value(source="network", **labels), 1)
+
+    def test_endpoint_serves_text_and_json(self):
+        """
+        Test that the endpoint serves the registry in both formats.
+        """
+        metrics.rows_written_total.inc(3, level="endpoint-test")
+        # An ephemeral port (0 disables start_server(), so the server is started here)
+        server = metrics.ThreadingHTTPServer(("127.0.0.1", 0), metrics._Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        text = urllib.request.urlopen(f"{base}/metrics").read().decode()
+        self.assertIn('jaldoot_rows_written_total{level="endpoint-test"} 3', text)
+        snapshot = json.loads(urllib.request.urlopen(f"{base}/metrics.json").read())
+        self.assertIn({"labels": {"level": "endpoint-test"}, "value": 3}, snapshot["metrics"]["jaldoot_rows_written_total"])
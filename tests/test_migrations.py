@@ -0,0 +1,63 @@
+# tests/test_migrations.py
+import os
+import unittest
+from pathlib import Path
+from sqlalchemy import create_engine
+
+# A throwaway PostgreSQL database, e.g. postgresql+psycopg2://postgres@localhost/scratch; the
+# migrations are run in a temporary schema that is dropped afterwards
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SQL_DIR = Path(__file__).resolve().parents[1] / "sql"
+
+
+@unittest.skipIf(not TEST_DATABASE_URL, "TEST_DATABASE_URL (a throwaway PostgreSQL database) is not set")
+class TestNormalizeSchema(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(TEST_DATABASE_URL)
+        self.conn = self.engine.raw_connection()
+        self.conn.autocommit = True
+        self._execute("DROP SCHEMA IF EXISTS migration_test CASCADE; CREATE SCHEMA migration_test; "
+                      "SET search_path TO migration_test")
+
+    def tearDown(self):
+        # A failed migration leaves its transaction open
+        self._execute("ROLLBACK; DROP SCHEMA IF EXISTS migration_test CASCADE")
+        self.conn.close()
+        self.engine.dispose()
+
+    def _execute(self, sql, params=None):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else None
+
+    def test_duplicate_parents_keep_their_children(self):
+        """
+        Test that rows appended twice by the old writer are merged without losing the panchayats below either copy.
+        """
+        # Ids as added by sql/add_primary_keys.sql, and every parent level saved twice, as an interrupted
+        # run followed by a restart did; the later copy is stored first, so name joins are likely to find it
+        self._execute("""
+            CREATE TABLE states (id SERIAL PRIMARY KEY, "States/UT's" TEXT, "URL" TEXT);
+            CREATE TABLE districts (id SERIAL PRIMARY KEY, "States/UT's" TEXT, "District" TEXT, "URL" TEXT);
+            CREATE TABLE blocks (id SERIAL PRIMARY KEY, "States/UT's" TEXT, "District" TEXT, "Block" TEXT, "URL" TEXT);
+            CREATE TABLE panchayats (id SERIAL PRIMARY KEY, "States/UT's" TEXT, "Block" TEXT, "Panchayat" TEXT, "URL" TEXT);
+            INSERT INTO states VALUES (3, 'S1', 's1'), (4, 'S2', 's2'), (1, 'S1', 's1'), (2, 'S2', 's2');
+            INSERT INTO districts VALUES (3, 'S1', 'D1', 'd1'), (4, 'S2', 'D1', 'd2'), (1, 'S1', 'D1', 'd1'), (2, 'S2', 'D1', 'd2');
+            INSERT INTO blocks VALUES (4, 'S1', 'D1', 'B1', 'b1'), (5, 'S1', 'D1', 'B2', 'b2'), (6, 'S2', 'D1', 'B1', 'b3'),
+                                      (1, 'S1', 'D1', 'B1', 'b1'), (2, 'S1', 'D1', 'B2', 'b2'), (3, 'S2', 'D1', 'B1', 'b3');
+            INSERT INTO panchayats VALUES (1, 'S1', 'B1', 'P1', 'b1'), (2, 'S1', 'B1', 'P2', 'b1'),
+                                          (3, 'S1', 'B2', 'P3', 'b2'), (4, 'S2', 'B1', 'P4', 'b3');
+        """)
+
+        self._execute((SQL_DIR / "normalize_schema.sql").read_text())
+
+        counts = self._execute("SELECT (SELECT COUNT(*) FROM states), (SELECT COUNT(*) FROM districts), "
+                               "(SELECT COUNT(*) FROM blocks), (SELECT COUNT(*) FROM panchayats)")
+        self.assertEqual(counts, [(2, 2, 3, 4)])
+        rows = self._execute("""SELECT "States/UT's", "District", "Block", "Panchayat" FROM panchayats_flat ORDER BY "Panchayat" """)
+        self.assertEqual(rows, [("S1", "D1", "B1", "P1"), ("S1", "D1", "B1", "P2"), ("S1", "D1", "B2", "P3"),
+                                ("S2", "D1", "B1", "P4")])
+
+
+if __name__ == "__main__":
+    unittest.main()
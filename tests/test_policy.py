@@ -0,0 +1,88 @@
+# tests/test_policy.py
+import asyncio
+import unittest
+from modules.policy import TokenBucket, LatencyTracker, CircuitBreaker, AIMDLimiter, FetchPolicy, DEFAULT_TIMEOUTS
+
+
+class TestFetchPolicy(unittest.TestCase):
+    def test_token_bucket_allows_burst_then_spaces_requests(self):
+        """
+        Test that requests beyond the burst have to wait 1/rate seconds each.
+        """
+        bucket = TokenBucket(rate=10, burst=2)
+        self.assertEqual([bucket.reserve(), bucket.reserve()], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertEqual(TokenBucket(rate=0).reserve(), 0.0)
+
+    def test_timeout_follows_latency_percentile(self):
+        """
+        Test that a level keeps its default timeout until enough latencies are observed.
+        """
+        latencies = LatencyTracker(min_samples=5)
+        self.assertEqual(latencies.timeout("panchayats"), DEFAULT_TIMEOUTS["panchayats"])
+        for seconds in (2, 3, 4, 4, 4):
+            latencies.record("panchayats", seconds)
+        self.assertEqual(latencies.timeout("panchayats"), 12)
+        self.assertEqual(latencies.timeout("blocks"), DEFAULT_TIMEOUTS["blocks"])
+
+    def test_circuit_breaker_opens_on_error_spike(self):
+        """
+        Test that the breaker pauses fetches once half of the recent fetches failed.
+        """
+        breaker = CircuitBreaker(window=4, threshold=0.5, cooldown=60)
+        breaker.record(True)
+        self.assertEqual(breaker.wait_time(), 0)
+        breaker.record(False)
+        self.assertGreater(breaker.wait_time(), 59)
+
+    def test_aimd_halves_on_timeout_and_grows_on_success(self):
+        """
+        Test that the concurrency limit halves after a timeout and then creeps back up.
+        """
+        limiter = AIMDLimiter(initial=8, minimum=1, maximum=8)
+        limiter.acquire()
+        limiter.release(timed_out=True)
+        self.assertEqual(limiter.limit, 4)
+        for _ in range(4):
+            self.assertTrue(limiter.try_acquire())
+            limiter.release()
+        self.assertGreater(limiter.limit, 4.5)
+
+    def test_aimd_starts_at_the_initial_limit(self):
+        """
+        Test that the limit starts at the initial value, clamped to the bounds, instead of the maximum.
+        """
+        self.assertEqual(AIMDLimiter(initial=2, minimum=1, maximum=100).limit, 2)
+        self.assertEqual(AIMDLimiter(initial=0, minimum=3, maximum=100).limit, 3)
+
+    def test_async_waiter_is_woken_by_release(self):
+        """
+        Test that a coroutine waiting for a slot gets it as soon as another one is released.
+        """
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+
+        async def crawl():
+            await limiter.acquire_async()
+            waiting = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.05)
+            self.assertFalse(waiting.done())
+            limiter.release()
+            # Woken within a few turns of the loop, without sleeping
+            for _ in range(3):
+                await asyncio.sleep(0)
+            return waiting.done()
+
+        self.assertTrue(asyncio.run(crawl()))
+        self.assertEqual(limiter.in_flight, 1)
+
+    def test_request_records_outcome(self):
+        """
+        Test that a failed request releases its slot and counts against the breaker.
+        """
+        policy = FetchPolicy(bucket=TokenBucket(rate=0), breaker=CircuitBreaker(window=2, cooldown=60))
+        with self.assertRaises(TimeoutError):
+            with policy.request("districts") as timeout:
+                self.assertEqual(timeout, DEFAULT_TIMEOUTS["districts"])
+                raise TimeoutError("slow")
+        self.assertEqual(policy.limiter.in_flight, 0)
+        self.assertGreater(policy.breaker.wait_time(), 0)
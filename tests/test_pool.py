@@ -0,0 +1,51 @@
+# tests/test_pool.py
+import threading
+import unittest
+from unittest.mock import MagicMock
+from modules.pool import DriverPool, run_pooled
+
+
+class TestDriverPool(unittest.TestCase):
+    def test_run_pooled_spreads_work_and_writes_from_one_thread(self):
+        """
+        Test that every task is scraped on a pooled fetcher and written by a single writer thread.
+        """
+        # Arrange
+        pool = DriverPool(3, factory=MagicMock)
+        tasks = [("State1", "District1", f"Block{i}", f"http://example.com/{i}") for i in range(20)]
+        used_fetchers = set()
+        writer_threads = set()
+        written = []
+
+        def work(fetcher, task):
+            used_fetchers.add(id(fetcher))
+            return task[2]
+
+        def write(task, result):
+            writer_threads.add(threading.current_thread().name)
+            written.append(result)
+
+        # Act
+        count = run_pooled(pool, tasks, work, write)
+        pool.close()
+
+        # Assert
+        self.assertEqual(count, 20)
+        self.assertEqual(sorted(written), sorted(task[2] for task in tasks))
+        self.assertEqual(writer_threads, {"db-writer"})
+        self.assertLessEqual(len(used_fetchers), 3)
+
+    def test_failed_task_is_skipped(self):
+        """
+        Test that an exception in one worker does not stop the remaining tasks.
+        """
+        pool = DriverPool(2, factory=MagicMock)
+        written = []
+
+        def work(fetcher, task):
+            if task == 1:
+                raise RuntimeError("boom")
+            return task
+
+        run_pooled(pool, [0, 1, 2], work, lambda task, result: written.append(result))
+        self.assertEqual(sorted(written), [0, 2])
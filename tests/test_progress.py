@@ -0,0 +1,65 @@
+# tests/test_progress.py
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine, text
+from modules import frontier, progress
+from modules.writer import BufferedWriter
+
+
+def _panchayats(block, names):
+    return pd.DataFrame({"States/UT's": "S1", "Block": block, "Panchayat": names, "URL": block.lower()})
+
+
+class TestCrawlProgress(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+        writer = BufferedWriter(self.engine)
+        writer.add("states", ("base",), pd.DataFrame({"States/UT's": ["S1"], "URL": ["s1"]}))
+        writer.add("districts", ("S1", "s1"), pd.DataFrame({"States/UT's": "S1", "District": ["D1"], "URL": ["d1"]}))
+        writer.add("blocks", ("S1", "D1", "d1"), pd.DataFrame({
+            "States/UT's": "S1", "District": "D1", "Block": ["B1", "B2"],
+            "No. of Well Covered": ["3", "4"], "URL": ["b1", "b2"],
+        }))
+        writer.close()
+
+    def _rows(self):
+        with self.engine.connect() as conn:
+            return pd.read_sql(text(
+                "SELECT b.\"Block\", r.expected_wells, r.scraped_wells "
+                "FROM crawl_progress r JOIN blocks b ON b.id = r.block_id ORDER BY b.\"Block\""
+            ), conn).set_index("Block")
+
+    def test_rollup_follows_every_batch(self):
+        """
+        Test that the rollup is updated with each batch, also when a re-crawl replaces a block's rows.
+        """
+        self.assertEqual(self._rows().loc["B1"].tolist(), [3, 0])
+
+        writer = BufferedWriter(self.engine)
+        writer.add("panchayats", ("S1", "D1", "B1", "b1"), _panchayats("B1", ["P1", "P2"]))
+        writer.add("panchayats", ("S1", "D1", "B2", "b2"), _panchayats("B2", ["P3"]))
+        writer.close()
+        self.assertEqual(self._rows()["scraped_wells"].tolist(), [2, 1])
+
+        writer = BufferedWriter(self.engine, incremental=True)
+        writer.add("panchayats", ("S1", "D1", "B1", "b1"), _panchayats("B1", ["P1", "P2", "P4"]))
+        writer.close()
+        self.assertEqual(self._rows()["scraped_wells"].tolist(), [3, 1])
+
+        with self.engine.connect() as conn:
+            totals = progress.state_totals(conn)
+        self.assertEqual(list(totals.values()), [{"expected_wells": 7, "scraped_wells": 4, "blocks": 2, "blocks_scraped": 2}])
+
+    def test_rebuild_recomputes_from_the_saved_rows(self):
+        """
+        Test that rebuild() restores a rollup that drifted from the tables.
+        """
+        writer = BufferedWriter(self.engine)
+        writer.add("panchayats", ("S1", "D1", "B1", "b1"), _panchayats("B1", ["P1"]))
+        writer.close()
+        with self.engine.begin() as conn:
+            conn.execute(text("UPDATE crawl_progress SET scraped_wells = 99"))
+
+        self.assertEqual(progress.rebuild(self.engine), 2)
+        self.assertEqual(self._rows()["scraped_wells"].tolist(), [1, 0])
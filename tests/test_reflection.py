@@ -0,0 +1,82 @@
+# tests/test_reflection.py
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import NoSuchTableError
+from sqlalchemy.orm import Session
+import pandas as pd
+import models
+from modules import frontier, reflection
+from modules.writer import BufferedWriter
+
+
+class TestSchemaSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot = Path(self.tmp.name) / "schema.json"
+        patcher = patch.object(reflection, "SCHEMA_SNAPSHOT", self.snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(reflection.metadata.clear)
+        reflection.metadata.clear()
+        self.engine = create_engine("sqlite://")
+        with self.engine.begin() as conn:
+            conn.execute(text('CREATE TABLE states (id INTEGER PRIMARY KEY, "States/UT\'s" TEXT, "URL" TEXT)'))
+
+    def test_missing_table_is_reflected_once_then_served_from_snapshot(self):
+        """
+        Test that a table absent from the snapshot is reflected alone and recorded for later runs.
+        """
+        table = reflection.get_table("states", self.engine)
+        self.assertEqual(list(table.c.keys()), ["id", "States/UT's", "URL"])
+        self.assertEqual(list(json.loads(self.snapshot.read_text())), ["states"])
+
+        # A fresh process loads the definition from the snapshot, without any engine
+        reflection.metadata.clear()
+        with patch.object(reflection, "_get_engine", side_effect=AssertionError("database used")):
+            table = reflection.get_table("states")
+        self.assertTrue(table.c.id.primary_key)
+
+    def test_unknown_table_raises(self):
+        """
+        Test that a table missing from the database raises instead of silently disappearing.
+        """
+        with self.assertRaises(NoSuchTableError):
+            reflection.get_table("panchayats", self.engine)
+        self.assertNotIn("panchayats", reflection.refresh_snapshot(self.engine))
+
+
+class TestModels(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.engine = create_engine("sqlite://")
+        for name, value in (("SCHEMA_SNAPSHOT", Path(self.tmp.name) / "schema.json"), ("_get_engine", lambda: self.engine)):
+            patcher = patch.object(reflection, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        reflection.metadata.clear()
+        self.addCleanup(reflection.metadata.clear)
+        self.addCleanup(models.Base.registry.dispose)
+        self.addCleanup(vars(models).pop, "State", None)
+        frontier.ensure_table(self.engine)
+
+    def test_states_of_every_season_are_mapped(self):
+        """
+        Test that State rows are identified by id, so a state listed in two seasons loads as two objects.
+        """
+        for season, wells in (("2023", 2), ("2024", 3)):
+            writer = BufferedWriter(self.engine, season=season)
+            writer.add("states", ("base",), pd.DataFrame({
+                "States/UT's": ["S1"], "No. of Well Covered": [str(wells)], "URL": ["s1"],
+            }))
+            writer.close()
+
+        with Session(self.engine) as session:
+            states = session.query(models.State).order_by(models.State.id).all()
+        self.assertEqual([(state.season, state.id) for state in states], [("2023", 1), ("2024", 2)])
+        self.assertEqual(repr(states[0]), "<State(state_ut='S1')>")
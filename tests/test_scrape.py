@@ -4,6 +4,9 @@ import unittest
 from unittest.mock import MagicMock, patch
 import pandas as pd
 from modules.scrape import Scraper
+from modules.fetch import Fetcher, HttpFetcher, SeleniumFetcher
+from modules.exceptions import FetchError, ParseError
+from modules.parse import parse_level_table, extract_hidden_fields, extract_table_rows_lxml, extract_table_rows_stdlib
 from config.settings import EXCEL_FILE, SHEET_NAMES
 from pandas.testing import assert_frame_equal
 
@@ -155,4 +158,131 @@ class TestScraperGetStates(unittest.TestCase):
         # Verify that if scraping succeeds, data is returned
         # For this test, we need to mock the scraping process as well
         # However, since it's beyond the scope, we assume it returns an empty DataFrame
-        self.assertIsInstance(result_df, pd.DataFrame)
\ No newline at end of file
+        self.assertIsInstance(result_df, pd.DataFrame)
+
+STATES_PAGE = f"""
+<html><body><form>
+<input type="hidden" name="__VIEWSTATE" value="abc" />
+<table id="{TABLE_ID}">
+  <tr class="header"><td>S.No.</td><td>States/UT's</td><td>No. of Well Covered</td></tr>
+  <tr><td>1</td><td><a href="District.aspx?state=01">State1</a></td><td>10</td></tr>
+  <tr><td>2</td><td><a href="District.aspx?state=02">State2</a></td><td>20</td></tr>
+</table>
+</form></body></html>
+"""
+
+
+class TestScraperFetchBackend(unittest.TestCase):
+    def test_get_states_from_fetched_html(self):
+        """
+        Test that get_states extracts states and absolute URLs from the HTML returned by a fetch backend.
+        """
+        # Arrange
+        mock_fetcher = MagicMock(spec=Fetcher)
+        mock_fetcher.cached.return_value = None
+        mock_fetcher.fetch.return_value = STATES_PAGE
+        scraper = Scraper(mock_fetcher, "http://example.com/Home.aspx")
+
+        # Act
+        result_df = scraper.get_states()
+
+        # Assert
+        mock_fetcher.fetch.assert_called_once_with("http://example.com/Home.aspx", 10)
+        expected_df = pd.DataFrame({
+            "States/UT's": ["State1", "State2"],
+            "URL": ["http://example.com/District.aspx?state=01", "http://example.com/District.aspx?state=02"],
+            "No. of Well Covered": ["10", "20"]
+        })
+        assert_frame_equal(result_df.reset_index(drop=True), expected_df)
+
+    def test_unparseable_page_raises_instead_of_returning_an_empty_table(self):
+        """
+        Test that a page whose table cannot be parsed fails its task with a ParseError, without fetching it again.
+        """
+        # Arrange: the table is there, but without its header row
+        mock_fetcher = MagicMock(spec=Fetcher)
+        mock_fetcher.cached.return_value = None
+        mock_fetcher.fetch.return_value = f'<html><table id="{TABLE_ID}"><tr><td>1</td></tr></table></html>'
+        scraper = Scraper(mock_fetcher, "http://example.com/Home.aspx", policy=None)
+
+        # Act / Assert
+        with self.assertRaises(ParseError):
+            scraper.get_panchayats("State1", "District1", "Block1", "http://example.com/Panchayat.aspx?b=1")
+        mock_fetcher.fetch.assert_called_once()
+
+    def test_bare_driver_is_wrapped_in_selenium_fetcher(self):
+        """
+        Test that passing a WebDriver keeps working by wrapping it in a SeleniumFetcher.
+        """
+        scraper = Scraper(MagicMock(), "http://example.com")
+        self.assertIsInstance(scraper.fetcher, SeleniumFetcher)
+
+    def test_http_fetcher_keeps_form_state_and_rejects_pages_without_table(self):
+        """
+        Test that the HTTP backend stores hidden ASP.NET fields and raises FetchError when the table is missing.
+        """
+        fetcher = HttpFetcher(pool_size=1)
+        response = MagicMock(text=STATES_PAGE)
+        with patch.object(fetcher.session, "get", return_value=response):
+            self.assertEqual(fetcher.fetch("http://example.com", 10), STATES_PAGE)
+        self.assertEqual(fetcher.form_state["http://example.com"]["__VIEWSTATE"], "abc")
+
+        response = MagicMock(text="<html><body>Server busy</body></html>")
+        with patch.object(fetcher.session, "get", return_value=response):
+            with self.assertRaises(FetchError):
+                fetcher.fetch("http://example.com/busy", 10)
+
+    def test_http_fetcher_parses_form_fields_only_for_postbacks(self):
+        """
+        Test that fetching doesn't parse the hidden fields, and a postback replays the form of its own page.
+        """
+        fetcher = HttpFetcher(pool_size=1)
+        with patch("modules.fetch.extract_hidden_fields", wraps=extract_hidden_fields) as extract:
+            with patch.object(fetcher.session, "get", return_value=MagicMock(text=STATES_PAGE)) as get:
+                fetcher.fetch("http://example.com", 10)
+                fetcher.fetch("http://example.com/other", 10)
+                extract.assert_not_called()
+                with patch.object(fetcher.session, "post", return_value=MagicMock(text=STATES_PAGE)) as post:
+                    fetcher.post_back("http://example.com", "ctl00$grid", "Page$2")
+        # The last page loaded was another one, so the postback's page is fetched again for its form
+        self.assertEqual(get.call_count, 3)
+        form = post.call_args.kwargs["data"]
+        self.assertEqual((form["__VIEWSTATE"], form["__EVENTTARGET"], form["__EVENTARGUMENT"]), ("abc", "ctl00$grid", "Page$2"))
+
+
+PANCHAYATS_PAGE = f"""
+<table id="{TABLE_ID}">
+  <tr class="header"><th>S.No.</th><th>State</th><th>Panchayat</th><th>Image</th><th>Pre Monsoon Water Level(In Feet)</th></tr>
+  <tr><td>1</td><td>State1</td><td>Panchayat A</td><td><img src="a.jpg"/></td><td>12.5</td></tr>
+  <tr><td>2</td><td>State1</td><td>Panchayat
+      B</td><td></td><td></td></tr>
+  <tr><td colspan="5">No more records</td></tr>
+</table>
+"""
+
+
+class TestParseLevelTable(unittest.TestCase):
+    def test_panchayat_columns_match_for_every_extraction_strategy(self):
+        """
+        Test that the lxml and stdlib extractors produce the same panchayat frame.
+        """
+        url = "http://example.com/Panchayat.aspx?block=1"
+        expected_df = pd.DataFrame({
+            "States/UT's": ["State1", "State1"],
+            "Panchayat": ["Panchayat A", "Panchayat B"],
+            "Pre Monsoon Water Level(In Feet)": ["12.5", ""],
+            "URL": [url, url]
+        })
+        for extractor in (extract_table_rows_lxml, extract_table_rows_stdlib):
+            with self.subTest(extractor=extractor.__name__):
+                result_df = parse_level_table(PANCHAYATS_PAGE, "panchayats", TABLE_ID, url, extractor=extractor)
+                assert_frame_equal(result_df.reset_index(drop=True), expected_df)
+
+    def test_blocks_get_parent_columns(self):
+        """
+        Test that parent names are prepended in hierarchy order.
+        """
+        html = STATES_PAGE.replace("States/UT's", "Block")
+        result_df = parse_level_table(html, "blocks", TABLE_ID, "http://example.com/x/Block.aspx", parents=("State1", "District1"))
+        self.assertEqual(list(result_df.columns), ["States/UT's", "District", "Block", "URL", "No. of Well Covered"])
+        self.assertEqual(result_df["URL"].iloc[0], "http://example.com/x/District.aspx?state=01")
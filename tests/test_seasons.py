@@ -0,0 +1,196 @@
+# tests/test_seasons.py
+import asyncio
+import threading
+import time
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine
+from modules import frontier
+from modules.counts import query_state_counts
+from modules.seasons import SharedPages, parse_seasons, run_seasons
+from modules.writer import BufferedWriter
+
+
+class TestSeasonList(unittest.TestCase):
+    def test_seasons_are_parsed_in_order(self):
+        """
+        Test that label=url items are split on the first '=', keeping URLs with query strings intact.
+        """
+        seasons = parse_seasons("2023-pre=http://a/Home.aspx?y=2023, 2024-pre=http://b/Home.aspx")
+        self.assertEqual(seasons, [("2023-pre", "http://a/Home.aspx?y=2023"), ("2024-pre", "http://b/Home.aspx")])
+        self.assertEqual(parse_seasons(""), [])
+        with self.assertRaises(ValueError):
+            parse_seasons("http://a/Home.aspx")
+        with self.assertRaises(ValueError):
+            parse_seasons(["2023=http://a", "2023=http://b"])
+
+    def test_errors_are_collected_per_season(self):
+        """
+        Test that a failing season doesn't stop the others and its error is returned.
+        """
+        crawled = []
+
+        def crawl(label, url):
+            if label == "bad":
+                raise RuntimeError("site down")
+            crawled.append(label)
+
+        errors = run_seasons([("a", "u1"), ("bad", "u2"), ("b", "u3")], crawl)
+        self.assertEqual(sorted(crawled), ["a", "b"])
+        self.assertIsNone(errors["a"])
+        self.assertIsInstance(errors["bad"], RuntimeError)
+
+
+class TestSharedPages(unittest.TestCase):
+    def test_concurrent_seasons_fetch_a_shared_page_once(self):
+        """
+        Test that seasons asking for a page another season is fetching wait for it instead of fetching it again.
+        """
+        pages = SharedPages(levels=["blocks"])
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return "<html>blocks</html>"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(pages.load("blocks", "http://x/Block.aspx?s=1", fetch)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(reused for _, reused in results), [False, True, True])
+        self.assertEqual(pages.hits, 2)
+
+    def test_async_seasons_wait_for_a_shared_page_without_blocking_their_loop(self):
+        """
+        Test that coroutines asking for a page another season is fetching await it while their event loop keeps running.
+        """
+        pages = SharedPages(levels=["blocks"])
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.2)
+            return "<html>blocks</html>"
+
+        loader = threading.Thread(target=pages.load, args=("blocks", "u", fetch))
+        loader.start()
+        started.wait()
+
+        async def fetch_again():
+            raise AssertionError("the page was fetched twice")
+
+        async def crawl():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.ensure_future(tick())
+            results = await asyncio.gather(*(pages.load_async("blocks", "u", fetch_again) for _ in range(2)))
+            ticker.cancel()
+            return results, ticks
+
+        results, ticks = asyncio.run(crawl())
+        loader.join()
+        self.assertEqual(results, [("<html>blocks</html>", True)] * 2)
+        self.assertGreater(ticks, 5)
+
+    def test_other_levels_and_failed_fetches_are_not_shared(self):
+        """
+        Test that pages of levels that aren't shared are always fetched, and a failed fetch isn't remembered.
+        """
+        pages = SharedPages(levels=["blocks"])
+        self.assertEqual(pages.load("panchayats", "u", lambda: "a"), ("a", False))
+        self.assertEqual(pages.load("panchayats", "u", lambda: "b"), ("b", False))
+
+        def fail():
+            raise TimeoutError("slow")
+
+        with self.assertRaises(TimeoutError):
+            pages.load("blocks", "u", fail)
+        self.assertEqual(pages.load("blocks", "u", lambda: "c"), ("c", False))
+        self.assertIsNone(pages.get("panchayats", "u"))
+
+
+class TestSeasonPartitions(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+
+    def _crawl(self, season, wells, panchayats, measurements=None):
+        writer = BufferedWriter(self.engine, season=season)
+        writer.add("states", ("base",), pd.DataFrame({
+            "States/UT's": ["S1"], "No. of Well Covered": [str(wells)], "URL": ["s1"],
+        }))
+        writer.add("districts", ("S1", "s1"), pd.DataFrame({"States/UT's": "S1", "District": ["D1"], "URL": ["d1"]}))
+        writer.add("blocks", ("S1", "D1", "d1"), pd.DataFrame({
+            "States/UT's": "S1", "District": "D1", "Block": ["B1"], "URL": ["b1"],
+        }))
+        writer.add("panchayats", ("S1", "D1", "B1", "b1"), pd.DataFrame({
+            "States/UT's": "S1", "Block": "B1", "Panchayat": panchayats, "URL": "b1", **(measurements or {}),
+        }))
+        writer.close()
+
+    def test_seasons_keep_their_own_rows_and_tasks(self):
+        """
+        Test that seasons listing the same states and URLs are stored and crawled independently.
+        """
+        self._crawl("2023", 2, ["P1", "P2"])
+        self._crawl("2024", 3, ["P1", "P2", "P3"])
+
+        with self.engine.connect() as conn:
+            self.assertEqual(query_state_counts(conn, season="2023").iloc[0].tolist(), ["S1", 2, 2])
+            self.assertEqual(query_state_counts(conn, season="2024").iloc[0].tolist(), ["S1", 3, 3])
+            flat = pd.read_sql("SELECT season, COUNT(*) AS n FROM panchayats_flat GROUP BY season ORDER BY season", conn)
+        self.assertEqual(flat["n"].tolist(), [2, 3])
+        counts = frontier.status_counts(self.engine)
+        self.assertEqual(counts["panchayats"], {"done": 2})
+        with self.engine.begin() as conn:
+            frontier.requeue(conn, "panchayats", ["b1"], season="2024")
+        self.assertEqual(frontier.outstanding(self.engine, "panchayats", season="2023"), 0)
+        self.assertEqual(frontier.claim(self.engine, "panchayats", season="2024"), [("S1", "D1", "B1", "b1")])
+
+    def test_seasons_with_different_headers_are_both_saved(self):
+        """
+        Test that a season whose pages bring a new column adds it to the table instead of failing every insert.
+        """
+        self._crawl("2023-pre", 2, ["P1", "P2"], {"Pre Monsoon Water Level(In Feet)": ["10.5", "12"]})
+        self._crawl("2023-post", 2, ["P1", "P2"], {"Post Monsoon Water Level(In Feet)": ["8", "9.5"]})
+
+        with self.engine.connect() as conn:
+            flat = pd.read_sql(
+                'SELECT season, "Pre Monsoon Water Level(In Feet)" AS pre, "Post Monsoon Water Level(In Feet)" AS post '
+                'FROM panchayats_flat ORDER BY season DESC, Panchayat', conn
+            )
+        self.assertEqual(flat["season"].tolist(), ["2023-pre", "2023-pre", "2023-post", "2023-post"])
+        self.assertEqual(flat["pre"].tolist()[:2], [10.5, 12])
+        self.assertEqual(flat["post"].tolist()[2:], [8, 9.5])
+        self.assertTrue(flat["pre"][2:].isna().all())
+        self.assertEqual(frontier.status_counts(self.engine)["panchayats"], {"done": 2})
+
+    def test_recrawling_a_season_updates_only_its_states(self):
+        """
+        Test that re-saving one season's states page updates that season's rows in place.
+        """
+        self._crawl("2023", 2, ["P1", "P2"])
+        self._crawl("2024", 3, ["P1", "P2", "P3"])
+        writer = BufferedWriter(self.engine, season="2023")
+        writer.add("states", ("base",), pd.DataFrame({"States/UT's": ["S1"], "No. of Well Covered": ["4"], "URL": ["s1"]}))
+        writer.close()
+        with self.engine.connect() as conn:
+            states = pd.read_sql("SELECT id, season, \"No. of Well Covered\" AS wells FROM states ORDER BY id", conn)
+        self.assertEqual(states.values.tolist(), [[1, "2023", 4], [2, "2024", 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/test_status.py
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from modules import frontier, metrics
+from modules.status import StatusReporter
+
+
+class TestStatusReporter(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+        with self.engine.begin() as conn:
+            frontier.enqueue(conn, "blocks", [("S1", "D1", "d1"), ("S1", "D2", "d2"), ("S1", "D3", "d3"), ("S1", "D4", "d4")])
+            frontier.complete(conn, "blocks", ["d1"])
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "status.json"
+
+    def test_snapshots_are_rate_limited_and_atomic(self):
+        """
+        Test that page() writes at most one snapshot per interval, as complete JSON, with per-level counts.
+        """
+        reporter = StatusReporter(self.engine, path=self.path, interval=3600)
+        self.assertTrue(reporter.report(force=True))
+        reporter.page("blocks", ("S1", "D2", "d2"))
+        snapshot = json.loads(self.path.read_text())
+        self.assertEqual(snapshot["levels"]["blocks"], {"done": 1, "failed": 0, "total": 4})
+        self.assertEqual(snapshot["current"], {})
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+        self.assertTrue(reporter.report("Stopped", "done", force=True))
+        snapshot = json.loads(self.path.read_text())
+        self.assertEqual(snapshot["status"], "Stopped")
+        self.assertEqual(snapshot["current"], {"level": "blocks", "parents": ["S1", "D2"]})
+
+    def test_throughput_and_eta_from_the_moving_average(self):
+        """
+        Test that the page rate is smoothed across snapshots and divides the outstanding pages into an ETA.
+        """
+        reporter = StatusReporter(self.engine, path=self.path, interval=0, smoothing=0.5)
+        with patch("modules.status.time.time", side_effect=[100.0, 160.0, 220.0]):
+            reporter.snapshot()
+            metrics.pages_total.inc(6, level="blocks", state="status-test", source="network")
+            first = reporter.snapshot()
+            metrics.pages_total.inc(2, level="blocks", state="status-test", source="network")
+            second = reporter.snapshot()
+
+        self.assertEqual(first["pages_per_minute"], 6.0)
+        # 0.5 * 2/min + 0.5 * 6/min
+        self.assertEqual(second["pages_per_minute"], 4.0)
+        self.assertEqual(second["eta_seconds"], 45)  # 3 outstanding pages at 4 per minute
@@ -0,0 +1,82 @@
+# tests/test_supervisor.py
+import unittest
+from selenium.common.exceptions import WebDriverException
+from modules.fetch import Fetcher
+from modules.supervisor import SupervisedFetcher
+
+
+class StubFetcher(Fetcher):
+    """Fetcher standing in for a browser; fails while `broken` is set."""
+
+    def __init__(self, number):
+        self.number = number
+        self.broken = None
+        self.closed = False
+
+    def fetch(self, url, timeout):
+        if self.broken:
+            raise WebDriverException(self.broken)
+        return f"<table>{self.number}</table>"
+
+    def close(self):
+        self.closed = True
+
+
+class TestSupervisedFetcher(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+
+    def factory(self):
+        fetcher = StubFetcher(len(self.created))
+        self.created.append(fetcher)
+        return fetcher
+
+    def test_recycles_after_max_pages_using_spare(self):
+        """
+        Test that the browser is swapped for the pre-warmed spare after max_pages pages.
+        """
+        supervised = SupervisedFetcher(self.factory, max_pages=2, max_rss_mb=0, spare=True)
+        pages = [supervised.fetch(f"http://example.com/{i}", 10) for i in range(3)]
+        supervised.close()
+
+        self.assertEqual(pages, ["<table>0</table>", "<table>0</table>", "<table>1</table>"])
+        self.assertEqual(supervised.restarts, 1)
+        self.assertEqual(len(self.created), 3)  # first browser, its spare and the next spare
+        self.assertTrue(all(fetcher.closed for fetcher in self.created))
+
+    def test_no_spare_browser_by_default(self):
+        """
+        Test that without a spare, only one browser runs and a restart starts the next one.
+        """
+        supervised = SupervisedFetcher(self.factory, max_pages=2, max_rss_mb=0)
+        self.assertEqual(len(self.created), 1)
+        pages = [supervised.fetch(f"http://example.com/{i}", 10) for i in range(3)]
+        supervised.close()
+
+        self.assertEqual(pages, ["<table>0</table>", "<table>0</table>", "<table>1</table>"])
+        self.assertEqual(len(self.created), 2)
+        self.assertTrue(all(fetcher.closed for fetcher in self.created))
+
+    def test_dead_session_is_replaced_before_retry(self):
+        """
+        Test that a lost session restarts the browser, so the retry hits a live one.
+        """
+        supervised = SupervisedFetcher(self.factory, spare=False)
+        supervised.current.broken = "invalid session id"
+        with self.assertRaises(WebDriverException):
+            supervised.fetch("http://example.com/", 10)
+        self.assertEqual(supervised.fetch("http://example.com/", 10), "<table>1</table>")
+        supervised.close()
+
+    def test_consecutive_failures_trigger_restart(self):
+        """
+        Test that max_failures consecutive errors restart the browser, but fewer don't.
+        """
+        supervised = SupervisedFetcher(self.factory, max_failures=2, spare=False)
+        supervised.current.broken = "timeout"
+        for _ in range(2):
+            with self.assertRaises(WebDriverException):
+                supervised.fetch("http://example.com/", 10)
+        self.assertEqual(supervised.restarts, 1)
+        self.assertEqual(supervised.current.number, 1)
+        supervised.close()
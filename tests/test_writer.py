@@ -0,0 +1,101 @@
+# tests/test_writer.py
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine, select
+from modules import frontier
+from modules.writer import BufferedWriter
+
+
+def _blocks(district, blocks):
+    return pd.DataFrame({
+        "States/UT's": "S1", "District": district, "Block": blocks,
+        "URL": [f"http://example.com/{district}/{block}" for block in blocks],
+    })
+
+
+class TestBufferedWriter(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        frontier.ensure_table(self.engine)
+        # Saving the parent rows enqueues the blocks pages of D1, D2 and D3
+        writer = BufferedWriter(self.engine)
+        writer.add("states", ("http://example.com",), pd.DataFrame({"States/UT's": ["S1"], "URL": ["s1"]}))
+        writer.add("districts", ("S1", "s1"), pd.DataFrame({
+            "States/UT's": "S1", "District": ["D1", "D2", "D3"], "URL": ["d1", "d2", "d3"],
+        }))
+        writer.close()
+        frontier.claim(self.engine, "blocks")
+
+    def _count(self, table):
+        with self.engine.connect() as conn:
+            return pd.read_sql(f"SELECT COUNT(*) AS n FROM {table}", conn)["n"].iloc[0]
+
+    def test_pages_are_buffered_until_the_row_threshold(self):
+        """
+        Test that rows are only written once enough are buffered, and that the flush settles the frontier.
+        """
+        writer = BufferedWriter(self.engine, flush_rows=4, flush_seconds=3600)
+
+        writer.add("blocks", ("S1", "D1", "d1"), _blocks("D1", ["B1", "B2"]))
+        self.assertEqual(frontier.outstanding(self.engine, "blocks"), 3)
+
+        writer.add("blocks", ("S1", "D2", "d2"), _blocks("D2", ["B3", "B4"]))
+        self.assertEqual(self._count("blocks"), 4)
+        self.assertEqual(frontier.outstanding(self.engine, "blocks"), 1)
+        self.assertEqual(frontier.outstanding(self.engine, "panchayats"), 4)
+
+    def test_close_flushes_remaining_pages_and_failures_are_recorded(self):
+        """
+        Test that close() writes what is left, and that a failed page goes back to the frontier.
+        """
+        writer = BufferedWriter(self.engine, flush_rows=100, flush_seconds=3600)
+        writer.add("blocks", ("S1", "D1", "d1"), _blocks("D1", ["B1"]))
+        writer.add("blocks", ("S1", "D2", "d2"), pd.DataFrame())
+        writer.add("blocks", ("S1", "D3", "d3"), TimeoutError("slow server"))
+        writer.close()
+
+        self.assertEqual(self._count("blocks"), 1)
+        self.assertEqual(frontier.claim(self.engine, "blocks"), [("S1", "D3", "d3")])
+
+    def test_rows_reference_parents_by_id_and_recrawls_update_in_place(self):
+        """
+        Test that stored rows carry the parent id instead of parent names, and that writing a page again updates it.
+        """
+        writer = BufferedWriter(self.engine, flush_rows=100, flush_seconds=3600)
+        writer.add("blocks", ("S1", "D2", "d2"), _blocks("D2", ["B1", "B2"]))
+        writer.flush()
+        renamed = _blocks("D2", ["B1", "B2", "B3"])
+        renamed["URL"] = ["p1", "p2", "p3"]
+        writer.add("blocks", ("S1", "D2", "d2"), renamed)
+        writer.close()
+
+        with self.engine.connect() as conn:
+            stored = pd.read_sql("SELECT * FROM blocks ORDER BY id", conn)
+            flat = pd.read_sql("SELECT * FROM blocks_flat ORDER BY id", conn)
+        self.assertEqual(list(stored.columns), ["id", "district_id", "Block", "URL"])
+        self.assertEqual(stored["id"].tolist(), [1, 2, 3])
+        self.assertEqual(stored["URL"].tolist(), ["p1", "p2", "p3"])
+        self.assertEqual(flat[["States/UT's", "District"]].drop_duplicates().values.tolist(), [["S1", "D2"]])
+
+    def test_page_without_a_saved_parent_fails_alone(self):
+        """
+        Test that a page whose parent row is missing fails its own task while the rest of the batch is saved.
+        """
+        with self.engine.begin() as conn:
+            frontier.enqueue(conn, "blocks", [("S1", "D9", "d9")])
+        frontier.claim(self.engine, "blocks")
+        writer = BufferedWriter(self.engine, flush_rows=100, flush_seconds=3600)
+        writer.add("blocks", ("S1", "D1", "d1"), _blocks("D1", ["B1", "B2"]))
+        writer.add("blocks", ("S1", "D9", "d9"), _blocks("D9", ["B3"]))
+        writer.close()
+
+        self.assertEqual(self._count("blocks"), 2)
+        self.assertEqual(frontier.outstanding(self.engine, "panchayats"), 2)
+        c = frontier.crawl_tasks.c
+        with self.engine.connect() as conn:
+            tasks = {url: (status, error) for url, status, error in conn.execute(
+                select(c.url, c.status, c.last_error).where(c.level == "blocks", c.url.in_(["d1", "d9"]))
+            )}
+        self.assertEqual(tasks["d1"], ("done", None))
+        self.assertEqual(tasks["d9"][0], "pending")
+        self.assertIn("not saved", tasks["d9"][1])